@@ -0,0 +1,289 @@
+# =================================================================
+#
+# Terms and Conditions of Use
+#
+# Unless otherwise noted, computer program source code of this
+# distribution # is covered under Crown Copyright, Government of
+# Canada, and is distributed under the MIT License.
+#
+# The Canada wordmark and related graphics associated with this
+# distribution are protected under trademark law and copyright law.
+# No permission is granted to use them outside the parameters of
+# the Government of Canada's corporate identity program. For
+# more information, see
+# http://www.tbs-sct.gc.ca/fip-pcim/index-eng.asp
+#
+# Copyright title to all 3rd party software distributed with this
+# software is held by the respective copyright holders as noted in
+# those files. Users are asked to read the 3rd Party Licenses
+# referenced with those assets.
+#
+# Copyright (c) 2026 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+from pathlib import Path
+import pickle
+import threading
+from typing import Any, Union
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_cache_dir() -> Path:
+    """
+    gets pygeometa cache directory
+
+    Set the `PYGEOMETA_CACHE_DIR` environment variable to override the
+    default (`$XDG_CACHE_HOME/pygeometa` or `~/.cache/pygeometa`).
+
+    :returns: `pathlib.Path` of cache directory
+    """
+
+    cache_dir = os.environ.get('PYGEOMETA_CACHE_DIR')
+
+    if cache_dir is None:
+        cache_home = os.environ.get('XDG_CACHE_HOME')
+        if cache_home is None:
+            cache_home = Path.home() / '.cache'
+        cache_dir = Path(cache_home) / 'pygeometa'
+
+    return Path(cache_dir)
+
+
+def get_cache_key(*parts: Union[str, bytes]) -> str:
+    """
+    derives a cache key from a hash of its parts
+
+    :param parts: `str` or `bytes` parts of key (e.g. operation, schemas,
+                  version and content)
+
+    :returns: `str` of cache key
+    """
+
+    hash_ = hashlib.sha256()
+
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        hash_.update(len(part).to_bytes(8, 'big'))
+        hash_.update(part)
+
+    return hash_.hexdigest()
+
+
+class BaseCache:
+    """generic result cache ABC"""
+
+    # values are stored pickled, so that each lookup returns a copy which
+    # callers can safely modify
+
+    def __init__(self):
+        """
+        Initialize object
+
+        :returns: `pygeometa.cache.BaseCache`
+        """
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any:
+        """
+        gets a cached value
+
+        :param key: `str` of cache key
+
+        :returns: cached value or `None` if not cached
+        """
+
+        value = self._get(key)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        return pickle.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        caches a value
+
+        :param key: `str` of cache key
+        :param value: value to cache (not `None`)
+
+        :returns: None
+        """
+
+        self._set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def clear(self) -> None:
+        """
+        clears cache
+
+        :returns: None
+        """
+
+        raise NotImplementedError()
+
+    def _get(self, key: str) -> Union[bytes, None]:
+        raise NotImplementedError()
+
+    def _set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError()
+
+
+class MemoryCache(BaseCache):
+    """in-memory least recently used (LRU) result cache"""
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize object
+
+        :param maxsize: maximum number of cached values
+
+        :returns: `pygeometa.cache.MemoryCache`
+        """
+
+        super().__init__()
+
+        self.maxsize = maxsize
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _get(self, key: str) -> Union[bytes, None]:
+        with self._lock:
+            try:
+                self._values.move_to_end(key)
+            except KeyError:
+                return None
+            return self._values[key]
+
+    def _set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def __len__(self):
+        return len(self._values)
+
+
+class FileCache(BaseCache):
+    """
+    on-disk result cache (one file per value)
+
+    As values are unpickled, the cache directory is created private to the
+    current user (mode 0o700), and not used at all if it is owned by
+    another user or writable by others.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = None):
+        """
+        Initialize object
+
+        :param cache_dir: cache directory (default is `results` in the
+                          pygeometa cache directory, see `get_cache_dir`)
+
+        :returns: `pygeometa.cache.FileCache`
+        """
+
+        super().__init__()
+
+        if cache_dir is None:
+            cache_dir = get_cache_dir() / 'results'
+
+        self.cache_dir = Path(cache_dir)
+        self._private = None
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob('*/*.pickle'):
+            path.unlink(missing_ok=True)
+
+    def _get_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f'{key}.pickle'
+
+    def _is_private(self) -> bool:
+        """
+        checks (once) that the cache directory is owned by the current user
+        and not writable by others, so that no one else can plant values
+
+        :returns: `bool` of whether the cache directory can be used
+        """
+
+        if self._private is None:
+            try:
+                stat = self.cache_dir.stat()
+            except FileNotFoundError:
+                return True  # created private on first write
+            except OSError as err:
+                LOGGER.warning(f'Cannot use cache directory '
+                               f'{self.cache_dir}: {err}')
+                self._private = False
+                return False
+
+            self._private = not (
+                (hasattr(os, 'getuid') and stat.st_uid != os.getuid()) or
+                stat.st_mode & 0o022)
+
+            if not self._private:
+                LOGGER.warning(f'Not using cache directory {self.cache_dir}: '
+                               'owned by another user or writable by others')
+
+        return self._private
+
+    def _get(self, key: str) -> Union[bytes, None]:
+        if not self._is_private():
+            return None
+
+        try:
+            return self._get_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _set(self, key: str, value: bytes) -> None:
+        path = self._get_path(key)
+
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if not self._is_private():
+                return
+            path.parent.mkdir(mode=0o700, exist_ok=True)
+            tmp_path = path.with_name(
+                f'{path.name}.{os.getpid()}.{threading.get_ident()}')
+            tmp_path.write_bytes(value)
+            os.replace(tmp_path, path)
+        except OSError as err:
+            LOGGER.warning(f'Cannot write cache file {path}: {err}')
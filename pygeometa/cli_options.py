@@ -50,7 +50,7 @@ import sys
 import click
 
 ARGUMENT_MCF = click.argument('mcf')
-ARGUMENT_METADATA_FILE = click.argument('metadata-file', type=click.File())
+ARGUMENT_METADATA_FILE = click.argument('metadata-file', type=click.File('rb'))
 
 OPTION_OUTPUT = click.option(
     '--output',
@@ -58,6 +58,12 @@ OPTION_OUTPUT = click.option(
     type=click.File('w', encoding='utf-8'),
     help='Name of output file')
 
+OPTION_COMPACT = click.option(
+    '--compact',
+    is_flag=True,
+    default=False,
+    help='Serialize JSON compactly (without indentation or whitespace)')
+
 
 def OPTION_VERBOSITY(f):
     logging_options = ['ERROR', 'WARNING', 'INFO', 'DEBUG']
@@ -74,6 +80,51 @@ def OPTION_VERBOSITY(f):
                         callback=callback)(f)
 
 
+class LazyChoice(click.Choice):
+    """
+    `click.Choice` whose choices are resolved on first use, so that
+    building the CLI does not have to enumerate schema plugins
+    """
+
+    def __init__(self, get_choices, case_sensitive: bool = True,
+                 **kwargs):
+        """
+        Initialize object
+
+        :param get_choices: callable returning the list of choices
+        :param case_sensitive: whether choices are case sensitive
+        :param kwargs: keyword arguments passed to `get_choices`
+
+        :returns: `pygeometa.cli_options.LazyChoice`
+        """
+
+        self._get_choices = get_choices
+        self._get_choices_kwargs = kwargs
+        self._choices = None
+        self.case_sensitive = case_sensitive
+
+    @property
+    def choices(self) -> tuple:
+        if self._choices is None:
+            self._choices = tuple(
+                self._get_choices(**self._get_choices_kwargs))
+
+        return self._choices
+
+
+class LazyChoices(LazyChoice):
+    """
+    `LazyChoice` accepting a comma-separated list of choices
+    """
+
+    def convert(self, value, param, ctx) -> list:
+        if isinstance(value, (list, tuple)):
+            return list(value)
+
+        return [super(LazyChoices, self).convert(v.strip(), param, ctx)
+                for v in value.split(',')]
+
+
 def cli_callbacks(f):
     f = OPTION_VERBOSITY(f)
     return f
@@ -45,6 +45,7 @@
 # =================================================================
 
 from collections.abc import Mapping
+from functools import lru_cache
 from importlib.metadata import version, PackageNotFoundError
 import datetime
 import json
@@ -52,19 +53,22 @@ import logging
 import os
 import pathlib
 import re
-from typing import IO, Union
-from xml.dom import minidom
+from typing import IO, Iterable, Iterator, TYPE_CHECKING, Union
 
 import click
-from jinja2 import Environment, FileSystemLoader
-from jinja2.exceptions import TemplateNotFound
-from jsonschema import validate as jsonschema_validate
-from jsonschema.exceptions import ValidationError
-import yaml
 
 from pygeometa import cli_options
-from pygeometa.helpers import json_dumps
-from pygeometa.schemas import get_supported_schemas, load_schema
+from pygeometa.cache import BaseCache, get_cache_key
+from pygeometa.helpers import (freeze, get_filename, get_json_encoder,
+                               get_metadata_input, json_dumps, MetadataInput,
+                               read_metadata_file)
+from pygeometa.schemas import (get_supported_schemas, load_schema, preload,
+                               rank_schemas, REGISTRY, sniff_content)
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+    from pygeometa.schemas.util import DerivedMCF
 
 LOGGER = logging.getLogger(__name__)
 
@@ -77,6 +81,22 @@ except PackageNotFoundError:
 
 VERSION = package_version
 
+SVN_DATE_YEAR = re.compile(r'\$Date: (?P<year>\d{4})')
+SVN_DATE_DATETIME = re.compile(
+    r'\$Date: (?P<date>\d{4}-\d{2}-\d{2}) (?P<time>\d{2}:\d{2}:\d{2})')
+SVN_DATE_EMBEDDED = re.compile(
+    r'(?P<start>.*)\$Date: (?P<year>\d{4}).*\$(?P<end>.*)')
+
+# XML markup (comments, processing instructions, CDATA sections,
+# declarations, end and start tags), to find the end of each document of a
+# stream of concatenated XML documents
+XML_TOKEN = re.compile(
+    rb'<!--.*?-->|<\?.*?\?>|<!\[CDATA\[.*?\]\]>|<!(?!--|\[CDATA\[)[^>]*>'
+    rb'|</[^>]*>|<(?![?!/])(?:[^>"\']|"[^"]*"|\'[^\']*\')*>', re.DOTALL)
+# first element of an XML document, and ISO records
+XML_ROOT_ELEMENT = re.compile(rb'<(?![?!/])(?:[\w.-]+:)?([\w.-]+)')
+XML_ISO_RECORD = re.compile(rb'<(?:[\w.-]+:)?(M[DI]_Metadata)[\s/>]')
+
 
 def get_charstring(option: Union[str, dict], language: str,
                    language_alternate: str = None) -> list:
@@ -100,6 +120,7 @@ def get_charstring(option: Union[str, dict], language: str,
         return [option.get(language), option.get(language_alternate)]
 
 
+@lru_cache(maxsize=256)
 def get_distribution_language(section: str) -> str:
     """
     derive language of a given distribution construct
@@ -115,21 +136,50 @@ def get_distribution_language(section: str) -> str:
         return 'en'
 
 
-def normalize_datestring(datestring: str, format_: str = 'default') -> str:
+def normalize_datestring(datestring: str, format_: str = 'default',
+                         now: datetime.datetime = None) -> str:
     """
     groks date string into ISO8601
 
     :param datestring: date in string representation
     :format_: datetring format ('year' or default [full])
+    :param now: reference datetime for magic keywords (default is
+                the current UTC time)
 
     :returns: string of properly formatted datestring
     """
 
-    today_and_now = datetime.datetime.now(datetime.timezone.utc)
+    if isinstance(datestring, str) and '$' in datestring:
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc)
 
-    re1 = r'\$Date: (?P<year>\d{4})'
-    re2 = r'\$Date: (?P<date>\d{4}-\d{2}-\d{2}) (?P<time>\d{2}:\d{2}:\d{2})'
-    re3 = r'(?P<start>.*)\$Date: (?P<year>\d{4}).*\$(?P<end>.*)'
+        if datestring == '$date$':  # $date$ magic keyword
+            return now.strftime('%Y-%m-%d')
+        elif datestring == '$datetime$':  # $datetime$ magic keyword
+            return now.strftime('%Y-%m-%dT%H:%M:%SZ')
+        elif datestring == '$year$':  # $year$ magic keyword
+            return now.strftime('%Y')
+        elif '$year$' in datestring:  # $year$ magic keyword embedded
+            return datestring.replace('$year$', now.strftime('%Y'))
+
+    try:
+        return _normalize_datestring(datestring, format_)
+    except TypeError:  # unhashable
+        raise RuntimeError(f'Invalid datestring: {datestring}')
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _normalize_datestring(datestring: str, format_: str) -> str:
+    """
+    groks a date string without magic keywords into ISO8601
+
+    Results are memoized given the conversion is pure.
+
+    :param datestring: date in string representation
+    :format_: datetring format ('year' or default [full])
+
+    :returns: string of properly formatted datestring
+    """
 
     try:
         if isinstance(datestring, datetime.date):
@@ -143,24 +193,16 @@ def normalize_datestring(datestring: str, format_: str = 'default') -> str:
             return datestring2
         elif isinstance(datestring, int) and len(str(datestring)) == 4:  # year
             return str(datestring)
-        if datestring == '$date$':  # $date$ magic keyword
-            return today_and_now.strftime('%Y-%m-%d')
-        elif datestring == '$datetime$':  # $datetime$ magic keyword
-            return today_and_now.strftime('%Y-%m-%dT%H:%M:%SZ')
-        elif datestring == '$year$':  # $year$ magic keyword
-            return today_and_now.strftime('%Y')
-        elif '$year$' in datestring:  # $year$ magic keyword embedded
-            return datestring.replace('$year$', today_and_now.strftime('%Y'))
         elif datestring.startswith('$Date'):  # svn Date keyword
             if format_ == 'year':
-                mo = re.match(re1, datestring)
+                mo = SVN_DATE_YEAR.match(datestring)
                 return mo.group('year')
             else:  # default
-                mo = re.match(re2, datestring)
+                mo = SVN_DATE_DATETIME.match(datestring)
                 return f"{mo.group('date')}T{mo.group('time')}"
         elif '$Date' in datestring:  # svn Date keyword embedded
             if format_ == 'year':
-                mo = re.match(re3, datestring)
+                mo = SVN_DATE_EMBEDDED.match(datestring)
                 return f"{mo.group('start')}{mo.group('year')}{mo.group('end')}"  # noqa
     except (AttributeError, TypeError):
         raise RuntimeError(f'Invalid datestring: {datestring}')
@@ -224,15 +266,21 @@ def prune_transfer_option(formats: dict, language: str) -> list:
     return unique_transfer
 
 
-def read_mcf(mcf: Union[dict, str]) -> dict:
+def read_mcf(mcf: Union[dict, str], cache: BaseCache = None) -> dict:
     """
     returns dict of YAML file from filepath, string or dict
 
     :param mcf: str, dict or filepath of MCF data
+    :param cache: optional `pygeometa.cache.BaseCache` of parsed `base_mcf`
+                  files, keyed by pygeometa version and content (with
+                  environment variables expanded), shared by MCFs
+                  extending the same files
 
     :returns: dict of MCF data
     """
 
+    import yaml
+
     mcf_dict = {}
     mcf_versions = ['2.0']
 
@@ -264,6 +312,26 @@ def read_mcf(mcf: Union[dict, str]) -> dict:
 
         return dict_
 
+    def __base_to_dict(base_mcf):
+        """normalize base mcf file into dict, parsing it once per cache"""
+
+        if cache is None:
+            return __to_dict(base_mcf)
+
+        with base_mcf.open(encoding='utf-8') as fh:
+            content = os.path.expandvars(fh.read())
+
+        cache_key = get_cache_key('base_mcf', VERSION, content)
+        dict_ = cache.get(cache_key)
+
+        if dict_ is None:
+            dict_ = __to_dict(base_mcf)
+            cache.set(cache_key, dict_)
+        else:
+            LOGGER.debug(f'Using cached {base_mcf}')
+
+        return dict_
+
     # from https://gist.github.com/angstwad/bf22d1822c38a92ec0a9
     def __dict_merge(dct, merge_dct):
         """
@@ -293,10 +361,11 @@ def read_mcf(mcf: Union[dict, str]) -> dict:
                 __parse_mcf_dict_recursive(v)
             else:
                 if k == 'base_mcf':
-                    base_mcf_dict = __to_dict(get_abspath(mcf, v))
+                    base_mcf_dict = __base_to_dict(get_abspath(mcf, v))
                     for k2, v2 in base_mcf_dict.copy().items():
                         if k2 == 'base_mcf':
-                            base_mcf_dict2 = __to_dict(get_abspath(mcf, v2))
+                            base_mcf_dict2 = __base_to_dict(
+                                get_abspath(mcf, v2))
                             __dict_merge(base_mcf_dict, base_mcf_dict2)
                             base_mcf_dict.pop(k2, None)
                     __dict_merge(dict2, base_mcf_dict)
@@ -329,77 +398,798 @@ def read_mcf(mcf: Union[dict, str]) -> dict:
     return mcf_dict
 
 
-def import_metadata(schema: str, metadata: str) -> dict:
+def import_metadata(schema: str, metadata: Union[str, MetadataInput],
+                    cache: BaseCache = None) -> dict:
     """
     Import metadata
 
     :param schema: schema / format
-    :metadata: metadata string
+    :metadata: metadata string (or `pygeometa.helpers.MetadataInput`)
+    :param cache: optional `pygeometa.cache.BaseCache` of import results,
+                  keyed by schema, pygeometa version and content hash
 
     :returns: MCF object
     """
 
+    content, error_message = _import_metadata(schema, metadata, cache)
+
+    if error_message is not None:
+        LOGGER.warning(error_message)
+
+    return content
+
+
+def _import_metadata(schema: str, metadata: Union[str, MetadataInput],
+                     cache: BaseCache = None) -> tuple:
+    """
+    Import metadata (see `import_metadata`)
+
+    :param schema: schema / format
+    :metadata: metadata string (or `pygeometa.helpers.MetadataInput`)
+    :param cache: optional `pygeometa.cache.BaseCache` of import results
+
+    :returns: `tuple` of MCF object (`None` if import failed) and error
+              message of the last schema which failed (if any)
+    """
+
+    # parse (lazily) once for all importers tried
+    metadata = get_metadata_input(metadata)
+
+    if cache is not None:
+        cache_key = get_cache_key('import', schema, VERSION, metadata.bytes)
+        content = cache.get(cache_key)
+        if content is not None:
+            LOGGER.debug('Using cached import result')
+            return content, None
+
     content = None
     error_message = None
+    content_format = None
 
     if schema == 'autodetect':
-        schemas = get_supported_schemas()
+        content_format, signature = sniff_content(metadata)
+        schemas = rank_schemas(signature)
+        LOGGER.debug(f'Detected {content_format} content; trying {schemas}')
     else:
         schemas = [schema]
 
-    try:
-        LOGGER.debug('Checking for MCF')
-        mcf = read_mcf(metadata)
-        _ = mcf['mcf']
-        LOGGER.debug('Already an MCF; skipping')
-        return mcf
-    except Exception as err:
-        LOGGER.debug(f'Not an MCF: {err}')
-        LOGGER.debug('Continuing')
+    # MCF is YAML (XML or JSON content is never an MCF)
+    if content_format not in ['xml', 'json']:
+        try:
+            LOGGER.debug('Checking for MCF')
+            if not metadata.contains('metadata:'):
+                raise ValueError('No metadata section')
+            mcf = read_mcf(metadata.text)
+            _ = mcf['mcf']
+            LOGGER.debug('Already an MCF; skipping')
+            return mcf, None
+        except Exception as err:
+            LOGGER.debug(f'Not an MCF: {err}')
+            LOGGER.debug('Continuing')
 
     for s in schemas:
         LOGGER.debug(f'Attempting to import into {s}')
         schema_object = load_schema(s)
 
         try:
-            content = schema_object.import_(metadata)
+            if schema_object.reads_metadata_input:
+                content = schema_object.import_(metadata)
+            else:
+                content = schema_object.import_(metadata.text)
+            if cache is not None:
+                cache.set(cache_key, content)
             break
         except NotImplementedError:
             error_message = f'Import not supported for {s}'
         except Exception as err:
             error_message = f'Import failed: {err}'
 
-    if error_message is not None:
-        LOGGER.warning(error_message)
-
-    return content
+    return content, error_message
 
 
 def transform_metadata(input_schema: str, output_schema: str,
-                       metadata: str) -> str:
+                       metadata: Union[str, MetadataInput],
+                       cache: BaseCache = None,
+                       compact: bool = False) -> str:
     """
     Transform metadata
 
     :param input_schema: input schema / format
     :param output_schema: output schema / format
-    :metadata: metadata string
+    :metadata: metadata string (or `pygeometa.helpers.MetadataInput`)
+    :param cache: optional `pygeometa.cache.BaseCache` of import and
+                  transform results, keyed by schemas, JSON encoder,
+                  pygeometa version and content hash
+    :param compact: whether to serialize JSON compactly (without
+                    indentation or whitespace)
 
     :returns: transformed metadata or `None`
     """
 
+    if cache is not None:
+        metadata = get_metadata_input(metadata)
+        cache_key = get_cache_key('transform', input_schema, output_schema,
+                                  VERSION, str(compact), get_json_encoder(),
+                                  metadata.bytes)
+        content = cache.get(cache_key)
+        if content is not None:
+            LOGGER.debug('Using cached transform result')
+            return content
+
     try:
-        content = import_metadata(input_schema, metadata)
+        content = import_metadata(input_schema, metadata, cache)
 
         LOGGER.info(f'Processing into {output_schema}')
         schema_object_output = load_schema(output_schema)
-        content = schema_object_output.write(content)
+        if compact:
+            content = schema_object_output.write(content, compact=True)
+        else:
+            content = schema_object_output.write(content)
     except Exception as err:
         LOGGER.debug(err)
         return None
 
+    if cache is not None and content is not None:
+        cache.set(cache_key, content)
+
     return content
 
 
+def iter_metadata_records(source: Union[str, IO],
+                          chunk_size: int = 1048576) -> Iterator[tuple]:
+    """
+    Iterate over the metadata records of a directory (of files, one record
+    each), a tarball (of such files) or a stream of concatenated records:
+    XML documents or JSON lines.  The ISO records of multi-record XML
+    documents (e.g. CSW GetRecords or OAI-PMH ListRecords responses) are
+    records of their own.  Records are read one at a time, so that inputs
+    never have to fit in memory
+
+    :param source: path to directory, tarball or file, or binary
+                   file-like object (e.g. standard input) of a stream
+    :param chunk_size: number of bytes to read from streams at a time
+
+    :returns: generator of `tuple` of record name (path relative to
+              directory, tarball member name or stream position, followed
+              by `#<position>` for records of multi-record documents) and
+              `bytes` of record
+    """
+
+    import tarfile
+
+    if isinstance(source, (str, pathlib.PurePath)):
+        if os.path.isdir(source):
+            for filepath in sorted(pathlib.Path(source).rglob('*')):
+                name = filepath.relative_to(source).as_posix()
+                if filepath.is_file() and not name.startswith('.') and \
+                        '/.' not in name:
+                    yield from _iter_xml_records(name, filepath.read_bytes())
+            return
+
+        if tarfile.is_tarfile(source):
+            with tarfile.open(source, mode='r|*') as tar:
+                for member in tar:
+                    if member.isfile():
+                        yield from _iter_xml_records(
+                            member.name, tar.extractfile(member).read())
+            return
+
+        with open(source, 'rb') as fh:
+            yield from iter_metadata_records(fh, chunk_size)
+        return
+
+    for count, record in enumerate(_iter_stream(source, chunk_size)):
+        yield from _iter_xml_records(str(count), record)
+
+
+def _iter_stream(source: IO, chunk_size: int = 1048576) -> Iterator[bytes]:
+    """
+    Split a stream of concatenated XML documents (at the end of each root
+    element) or JSON lines (see `iter_metadata_records`)
+
+    :param source: binary file-like object
+    :param chunk_size: number of bytes to read at a time
+
+    :returns: generator of `bytes` of documents / lines
+    """
+
+    buffer = b''
+    xml = None
+    pos = 0  # position up to which XML markup is scanned
+    depth = 0  # depth of XML elements at pos
+
+    while True:
+        chunk = source.read(chunk_size)
+        buffer += chunk
+        if xml is None and (buffer.strip() or not chunk):
+            xml = buffer.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'<')
+
+        records = []
+
+        if xml:
+            while True:
+                start = buffer.find(b'<', pos)
+                # markup may continue in the next chunk
+                if start == -1 or (chunk and len(buffer) - start < 9):
+                    break
+                token = XML_TOKEN.match(buffer, start)
+                if token is None:
+                    break
+                pos = token.end()
+                if buffer[start + 1] in b'!?':
+                    continue
+                if buffer[start + 1] == ord('/'):
+                    depth -= 1
+                elif buffer[pos - 2] != ord('/'):
+                    depth += 1
+                if depth <= 0:  # end of document
+                    records.append(buffer[:pos])
+                    buffer = buffer[pos:]
+                    pos = depth = 0
+            if not chunk:
+                records.append(buffer)
+        else:
+            records = buffer.split(b'\n')
+            buffer = records.pop() if chunk else b''
+
+        for record in records:
+            record = record.strip()
+            if record:
+                yield record
+
+        if not chunk:
+            break
+
+
+def _iter_xml_records(name: str, record: bytes) -> Iterator[tuple]:
+    """
+    Iterate over the ISO records of a multi-record XML document (whose root
+    element is not an ISO record, such as a CSW GetRecords response), or
+    else the record itself (see `iter_metadata_records`)
+
+    :param name: `str` of record name
+    :param record: `bytes` of record
+
+    :returns: generator of `tuple` of record name and `bytes` of record
+    """
+
+    root = None
+    start = record.find(b'<')
+    if record.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'<'):
+        # skip declaration, comments and processing instructions
+        while start != -1 and record[start + 1:start + 2] in [b'!', b'?']:
+            token = XML_TOKEN.match(record, start)
+            if token is None:
+                break
+            start = record.find(b'<', token.end())
+        root = XML_ROOT_ELEMENT.match(record, max(start, 0))
+
+    if root is None or root.group(1) in [b'MD_Metadata', b'MI_Metadata'] \
+            or XML_ISO_RECORD.search(record, root.end()) is None:
+        yield name, record
+        return
+
+    import io
+
+    from lxml import etree
+
+    from pygeometa.schemas.iso19139.importer import iter_records
+
+    LOGGER.debug(f'Iterating over records of {name}')
+    count = 0
+    try:
+        for element in iter_records(io.BytesIO(record)):
+            yield f'{name}#{count}', etree.tostring(element, with_tail=False)
+            count += 1
+    except etree.XMLSyntaxError as err:
+        if count == 0:  # e.g. not XML after all
+            yield name, record
+        else:
+            LOGGER.warning(f'Records of {name} after {count} failed: {err}')
+
+
+def transform_batch(records: Iterable, input_schema: str,
+                    output_schema: str, workers: int = 1,
+                    compact: bool = False) -> Iterator[tuple]:
+    """
+    Transform many metadata records (e.g. from `iter_metadata_records`),
+    in a pool of processes.  Records which fail are reported (and do not
+    stop the batch).  Results are yielded in the order of records, and
+    only a bounded number of records are in flight at a time
+
+    :param records: iterable of `tuple` of record name and content
+    :param input_schema: input schema / format
+    :param output_schema: output schema / format
+    :param workers: number of processes to transform records with
+    :param compact: whether to serialize JSON compactly (without
+                    indentation or whitespace)
+
+    :returns: generator of `tuple` of record name, transformed metadata
+              (`None` if failed) and error message (`None` if transformed)
+    """
+
+    if workers <= 1:
+        for name, record in records:
+            yield (name, *_transform_record(record, input_schema,
+                                            output_schema, compact))
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    schemas = [output_schema]
+    if input_schema != 'autodetect':
+        schemas.append(input_schema)
+
+    LOGGER.info(f'Transforming records with {workers} processes')
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_batch_worker,
+                             initargs=(schemas,)) as executor:
+        pending = deque()
+        for name, record in records:
+            pending.append((name, executor.submit(
+                _transform_record, record, input_schema, output_schema,
+                compact)))
+            if len(pending) >= workers * 16:
+                name, future = pending.popleft()
+                yield (name, *future.result())
+
+        while pending:
+            name, future = pending.popleft()
+            yield (name, *future.result())
+
+
+def _transform_record(record: bytes, input_schema: str,
+                      output_schema: str, compact: bool = False) -> tuple:
+    """
+    Transform a metadata record (see `transform_batch`)
+
+    :param record: `bytes` of metadata record
+    :param input_schema: input schema / format
+    :param output_schema: output schema / format
+    :param compact: whether to serialize JSON compactly
+
+    :returns: `tuple` of transformed metadata (`None` if failed) and error
+              message (`None` if transformed)
+    """
+
+    try:
+        content, error = _import_metadata(input_schema,
+                                          MetadataInput(record))
+        if content is None:
+            return None, error or 'No supported input schema detected/found'
+
+        schema_object = load_schema(output_schema)
+        if compact:
+            return schema_object.write(content, compact=True), None
+        return schema_object.write(content), None
+    except Exception as err:
+        return None, str(err)
+
+
+def write_transform_results(results: Iterable, output_schema: str,
+                            fh: IO = None, output_dir: str = None) -> dict:
+    """
+    Write the results of `transform_batch`, one at a time, as
+    newline-delimited JSON (an entry per record: `{"source": <name>,
+    "record": <metadata>}`, or `{"source": <name>, "error": <message>}`
+    if failed) or to files of an output directory, mirroring record names
+    (e.g. `path/to/record.xml` to `path/to/record.json`)
+
+    :param results: iterable of `tuple` of record name, transformed metadata
+                    and error message (see `transform_batch`)
+    :param output_schema: output schema / format
+    :param fh: text file-like object to write newline-delimited JSON to
+    :param output_dir: directory to write metadata to (if no `fh`)
+
+    :returns: `dict` of names and error messages of failed records
+    """
+
+    outputformat = load_schema(output_schema).outputformat
+    failed = {}
+
+    for name, content, error in results:
+        if error is not None:
+            LOGGER.warning(f'Transforming {name} failed: {error}')
+            failed[name] = error
+            if fh is not None:
+                fh.write(json.dumps({'source': name, 'error': error},
+                                    ensure_ascii=False,
+                                    separators=(',', ':')))
+                fh.write('\n')
+            continue
+
+        if fh is not None:
+            if outputformat == 'json':
+                if '\n' in content:
+                    content = json_dumps(json.loads(content), True)
+            else:
+                content = json.dumps(content, ensure_ascii=False)
+            fh.write(f'{{"source":{json.dumps(name, ensure_ascii=False)},'
+                     f'"record":{content}}}\n')
+            continue
+
+        parts = [get_filename(part) for part in
+                 pathlib.PurePosixPath(name).parts
+                 if part not in ['/', '.', '..']]
+        filepath = pathlib.Path(output_dir, *parts).with_suffix(
+            f'.{outputformat}')
+        LOGGER.info(f'Writing {filepath}')
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(content, encoding='utf-8')
+
+    return failed
+
+
+def generate_many(mcf: Union[dict, str], schemas: list,
+                  workers: int = 1, compact: bool = False,
+                  strict: bool = False) -> dict:
+    """
+    Generate metadata in several schemas from a single MCF
+
+    The MCF is read (and resolved) once and shared by all schemas, as
+    writers never modify it, as are the values derived from it (see
+    `pygeometa.schemas.util.share_derived`).  Schemas building on the
+    same base record (OARec profiles such as WCMP2) share it instead of
+    generating it again.
+
+    :param mcf: `dict` of MCF or path to MCF file/string
+    :param schemas: `list` of schema names
+    :param workers: number of threads to write outputs with
+                    (default 1: write sequentially)
+    :param compact: whether to serialize JSON compactly (without
+                    indentation or whitespace)
+    :param strict: whether to share a read-only (frozen) copy of the MCF,
+                   so that writers modifying it fail (e.g. to check
+                   custom writers), at the cost of copying it
+
+    :returns: `dict` of schema names and their metadata
+    """
+
+    from pygeometa.schemas.util import share_derived
+
+    mcf = read_mcf(mcf)
+
+    if strict:
+        mcf = freeze(mcf)
+
+    with share_derived(mcf):
+        return _generate_many(mcf, schemas, workers, compact)
+
+
+def _generate_many(mcf: dict, schemas: list, workers: int,
+                   compact: bool) -> dict:
+    """
+    Generate metadata in several schemas from a single, read MCF (see
+    `generate_many`)
+
+    :param mcf: `dict` of MCF
+    :param schemas: `list` of schema names
+    :param workers: number of threads to write outputs with
+    :param compact: whether to serialize JSON compactly
+
+    :returns: `dict` of schema names and their metadata
+    """
+
+    schema_objects = {schema: load_schema(schema) for schema in schemas}
+
+    records = {}
+    for schema, schema_object in schema_objects.items():
+        generate_record = getattr(type(schema_object), 'generate_record', None)
+        if generate_record is not None and generate_record not in records:
+            LOGGER.debug(f'Generating base record for {schema}')
+            records[generate_record] = schema_object.generate_record(mcf)
+
+    def write(schema: str) -> str:
+        LOGGER.info(f'Processing into {schema}')
+        schema_object = schema_objects[schema]
+        kwargs = {}
+        if compact:
+            kwargs['compact'] = True
+        generate_record = getattr(type(schema_object), 'generate_record', None)
+        if generate_record is not None:
+            kwargs['record'] = records[generate_record]
+
+        return schema_object.write(mcf, **kwargs)
+
+    if workers > 1 and len(schema_objects) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(schema_objects,
+                            executor.map(write, schema_objects)))
+
+    return {schema: write(schema) for schema in schema_objects}
+
+
+def get_mcf_files(paths: list) -> list:
+    """
+    Resolve MCF files of paths: MCF files, directories (of *.yml and
+    *.yaml files) or glob patterns
+
+    :param paths: `list` of paths
+
+    :returns: `list` of (unique) MCF files
+    """
+
+    mcf_files = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            mcf_files.extend(sorted(
+                str(p) for pattern in ['*.yml', '*.yaml']
+                for p in pathlib.Path(path).glob(pattern)))
+        elif any(c in path for c in '*?['):
+            import glob
+
+            mcf_files.extend(sorted(glob.glob(path, recursive=True)))
+        else:
+            mcf_files.append(path)
+
+    return list(dict.fromkeys(mcf_files))
+
+
+def generate_batch(mcfs: list, schemas: list, output_dir: str,
+                   workers: int = 1, name_by: str = 'source',
+                   compact: bool = False, incremental: bool = False,
+                   template_dir: str = None) -> dict:
+    """
+    Generate metadata in one or more schemas from many MCFs, to files of
+    an output directory named `<name>.<schema>.<format>` (or, for a local
+    schema, `<name>.<template directory name>.xml`).  MCFs which fail
+    are reported (and do not stop the batch)
+
+    MCFs whose outputs would have the same name (e.g. files of the same
+    name in different directories, or MCFs of the same `identifier`) fail,
+    rather than overwrite each other's outputs.
+
+    Incremental batches record the inputs of each output in a manifest of
+    the output directory (see `pygeometa.manifest.Manifest`), and
+    regenerate only outputs whose inputs changed since.
+
+    :param mcfs: `list` of paths to MCF files (see `get_mcf_files`)
+    :param schemas: `list` of schema names
+    :param output_dir: directory to write metadata to
+    :param workers: number of processes to generate MCFs with (or, for
+                    a single MCF, threads to write its schemas with)
+    :param name_by: name outputs by MCF file name (`source`, without
+                    `.yml` / `.yaml` / `.mcf.yml`) or by MCF `identifier`
+    :param compact: whether to serialize JSON compactly (without
+                    indentation or whitespace)
+    :param incremental: whether to regenerate only outputs whose inputs
+                        changed (MCFs which are up to date are skipped)
+    :param template_dir: directory of a locally defined schema to generate
+                         metadata in too
+
+    :returns: `dict` of MCFs and error messages (`None` if generated or
+              up to date)
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = dict.fromkeys(mcfs)
+    current = []
+
+    targets = list(schemas)
+    if template_dir is not None:
+        targets.append(template_dir)
+
+    if incremental:
+        from pygeometa.manifest import Manifest
+
+        manifest = Manifest(output_dir, {
+            'compact': compact,
+            'name_by': name_by,
+            'json_encoder': get_json_encoder()
+        })
+        current = [mcf for mcf in mcfs if manifest.is_current(mcf, targets)]
+        mcfs = [mcf for mcf in mcfs if mcf not in set(current)]
+        LOGGER.info(f'{len(current)} of {len(results)} MCFs up to date')
+
+    pool = workers > 1 and len(mcfs) > 1
+
+    if pool:
+        from concurrent.futures import ProcessPoolExecutor
+
+        LOGGER.info(f'Generating {len(mcfs)} MCFs with {workers} processes')
+        executor = ProcessPoolExecutor(max_workers=workers,
+                                       initializer=_init_batch_worker,
+                                       initargs=(schemas,))
+        chunksize = max(1, len(mcfs) // (workers * 4))
+
+    try:
+        # name all outputs ahead, so that MCFs whose outputs would
+        # overwrite each other fail rather than generate
+        if pool and name_by == 'identifier':
+            names = dict(zip(mcfs, executor.map(
+                _get_mcf_name, mcfs, [name_by] * len(mcfs),
+                chunksize=chunksize)))
+        else:
+            names = {mcf: _get_mcf_name(mcf, name_by) for mcf in mcfs}
+
+        owners = {}
+        for mcf in current:
+            for schema, output in manifest.get_outputs(mcf).items():
+                name = output.removesuffix(_get_output_filename('', schema))
+                owners.setdefault(name, {})[mcf] = None
+        for mcf, (name, error) in names.items():
+            if error is None:
+                owners.setdefault(name, {})[mcf] = None
+
+        for mcf, (name, error) in names.items():
+            if error is None and len(owners[name]) > 1:
+                others = ', '.join(str(m) for m in owners[name] if m != mcf)
+                error = f'Output name {name} is also used by {others}'
+                LOGGER.warning(f'Generating {mcf} failed: {error}')
+            results[mcf] = error
+
+        mcfs = [mcf for mcf in mcfs if results[mcf] is None]
+
+        if pool:
+            generated = dict(zip(mcfs, executor.map(
+                _generate_file, mcfs, [schemas] * len(mcfs),
+                [output_dir] * len(mcfs), [name_by] * len(mcfs),
+                [compact] * len(mcfs), [1] * len(mcfs),
+                [template_dir] * len(mcfs), [None] * len(mcfs),
+                [names[mcf][0] for mcf in mcfs], chunksize=chunksize)))
+        else:
+            generated = {mcf: _generate_file(mcf, schemas, output_dir,
+                                             name_by, compact, workers,
+                                             template_dir,
+                                             name=names[mcf][0])
+                         for mcf in mcfs}
+    finally:
+        if pool:
+            executor.shutdown()
+
+    for mcf, (error, outputs) in generated.items():
+        results[mcf] = error
+        if incremental and error is None:
+            manifest.update(mcf, outputs)
+
+    if incremental and generated:
+        manifest.save()
+
+    return results
+
+
+def _init_batch_worker(schemas: list) -> None:
+    """
+    Warm up a batch worker process, loading schema plugins and compiling
+    their templates once, for all MCFs it generates
+
+    :param schemas: `list` of schema names
+
+    :returns: None
+    """
+
+    from jinja2.exceptions import TemplateNotFound
+
+    env = get_template_environment()
+
+    for schema_object in preload(schemas):
+        try:
+            schema_path = pathlib.Path(
+                schema_object.template_dir).resolve().relative_to(SCHEMAS)
+            env.get_template(f'{schema_path.as_posix()}/main.j2')
+        except (TypeError, ValueError, TemplateNotFound):
+            pass
+
+
+def _generate_file(mcf: str, schemas: list, output_dir: str,
+                   name_by: str = 'source', compact: bool = False,
+                   workers: int = 1, template_dir: str = None,
+                   cache: BaseCache = None, name: str = None) -> tuple:
+    """
+    Generate metadata in one or more schemas from an MCF file, to files
+    of an output directory (see `generate_batch`)
+
+    :param mcf: path to MCF file
+    :param schemas: `list` of schema names
+    :param output_dir: directory to write metadata to
+    :param name_by: name outputs by MCF file name or `identifier`
+    :param compact: whether to serialize JSON compactly
+    :param workers: number of threads to write schemas with
+    :param template_dir: directory of a locally defined schema
+    :param cache: optional `pygeometa.cache.BaseCache` of parsed
+                  `base_mcf` files (see `read_mcf`)
+    :param name: name of outputs (default is to derive it by `name_by`)
+
+    :returns: `tuple` of error message (`None` if generated) and `dict`
+              of schema names (or template directory) and output file
+              names
+    """
+
+    from pygeometa.schemas.util import share_derived
+
+    try:
+        mcf_dict = read_mcf(mcf, cache=cache)
+        contents = {}
+        # schemas and the local schema share the values derived from the MCF
+        with share_derived(mcf_dict):
+            if schemas:
+                contents = generate_many(mcf_dict, schemas, workers, compact)
+            if template_dir is not None:
+                contents[template_dir] = render_j2_template(
+                    mcf_dict, template_dir=template_dir)
+        if name is None:
+            name = _get_output_name(mcf, mcf_dict, name_by)
+    except Exception as err:
+        LOGGER.warning(f'Generating {mcf} failed: {err}')
+        return str(err), {}
+
+    outputs = {}
+    for schema, content in contents.items():
+        filename = _get_output_filename(name, schema)
+        LOGGER.info(f'Writing {filename}')
+        with open(os.path.join(output_dir, filename), 'w',
+                  encoding='utf-8') as fh:
+            fh.write(content)
+        outputs[schema] = filename
+
+    return None, outputs
+
+
+def _get_mcf_name(mcf: str, name_by: str = 'source') -> tuple:
+    """
+    Derive the name of the outputs of an MCF file, reading the MCF if
+    named by `identifier`
+
+    :param mcf: path to MCF file
+    :param name_by: name outputs by MCF file name or `identifier`
+
+    :returns: `tuple` of output name (`None` if failed) and error message
+              (`None` if named)
+    """
+
+    try:
+        mcf_dict = read_mcf(mcf) if name_by == 'identifier' else None
+        return _get_output_name(mcf, mcf_dict, name_by), None
+    except Exception as err:
+        LOGGER.warning(f'Naming outputs of {mcf} failed: {err}')
+        return None, str(err)
+
+
+def _get_output_name(mcf: str, mcf_dict: dict = None,
+                     name_by: str = 'source') -> str:
+    """
+    Derive the name of the outputs of an MCF file
+
+    :param mcf: path to MCF file
+    :param mcf_dict: `dict` of MCF (required to name by `identifier`)
+    :param name_by: name outputs by MCF file name (without `.yml` /
+                    `.yaml` / `.mcf.yml`) or `identifier`
+
+    :returns: `str` of output name
+    """
+
+    if name_by == 'identifier':
+        return get_filename(mcf_dict['metadata']['identifier'])
+
+    name = pathlib.Path(mcf).name
+    for suffix in ['.yml', '.yaml', '.mcf']:
+        name = name.removesuffix(suffix)
+
+    return name
+
+
+def _get_output_filename(name: str, schema: str) -> str:
+    """
+    Derive the file name of an output
+
+    :param name: `str` of output name (see `_get_output_name`)
+    :param schema: `str` of schema name, or directory of a locally defined
+                   schema (rendering XML)
+
+    :returns: `str` of file name
+    """
+
+    if schema in REGISTRY.schemas:
+        return f'{name}.{schema}.{load_schema(schema).outputformat}'
+
+    return f'{name}.{pathlib.Path(schema).name}.xml'
+
+
 def pretty_print(xml: str) -> str:
     """
     clean up indentation and spacing
@@ -409,6 +1199,8 @@ def pretty_print(xml: str) -> str:
     :returns: str of pretty-printed XML data
     """
 
+    from xml.dom import minidom
+
     LOGGER.debug('pretty-printing XML')
     val = minidom.parseString(xml)
     return '\n'.join([val for val in val.toprettyxml(indent=' '*2).split('\n') if val.strip()])  # noqa
@@ -425,41 +1217,111 @@ def render_j2_template(mcf: dict, template_dir: str = None) -> str:
     :returns: str of metadata output
     """
 
+    from jinja2.exceptions import TemplateNotFound
+
+    from pygeometa.schemas.util import get_derived
+
     LOGGER.debug('Evaluating template directory')
     if template_dir is None:
         msg = 'template_dir or schema_local required'
         LOGGER.error(msg)
         raise RuntimeError(msg)
 
-    LOGGER.debug(f'Setting up template environment {template_dir}')
-    env = Environment(loader=FileSystemLoader([template_dir, SCHEMAS]))
+    template_dir = pathlib.Path(template_dir).resolve()
 
-    LOGGER.debug('Adding template filters')
-    env.filters['normalize_datestring'] = normalize_datestring
-    env.filters['get_distribution_language'] = get_distribution_language
-    env.filters['get_charstring'] = get_charstring
-    env.filters['prune_distribution_formats'] = prune_distribution_formats
-    env.filters['prune_transfer_option'] = prune_transfer_option
-    env.globals.update(zip=zip)
-    env.globals.update(get_charstring=get_charstring)
-    env.globals.update(normalize_datestring=normalize_datestring)
-    env.globals.update(prune_distribution_formats=prune_distribution_formats)
-    env.globals.update(prune_transfer_option=prune_transfer_option)
+    try:
+        # built-in schemas share one environment (and template cache)
+        # rooted at the schemas directory, so that common base templates
+        # are compiled once for all profiles extending them
+        schema_path = f'{template_dir.relative_to(SCHEMAS).as_posix()}/'
+        env = get_template_environment()
+    except ValueError:
+        schema_path = ''
+        env = get_template_environment(str(template_dir))
 
     try:
         LOGGER.debug('Loading template')
-        template = env.get_template('main.j2')
+        template = env.get_template(f'{schema_path}main.j2')
     except TemplateNotFound:
         msg = 'Missing metadata template'
         LOGGER.error(msg)
         raise RuntimeError(msg)
 
     LOGGER.debug('Processing template')
-    xml = template.render(record=mcf,
-                          pygeometa_version=VERSION).encode('utf-8')
+    xml = template.render(record=mcf, derived=get_derived(mcf),
+                          pygeometa_version=VERSION,
+                          schema_path=schema_path,
+                          render_datetime=datetime.datetime.now(
+                              datetime.timezone.utc)).encode('utf-8')
     return pretty_print(xml)
 
 
+@lru_cache(maxsize=16)
+def get_template_environment(template_dir: str = None) -> 'Environment':
+    """
+    get (cached) Jinja2 environment for rendering metadata templates
+
+    :param template_dir: directory of local schema templates (default is
+                         the built-in schemas directory)
+
+    :returns: `jinja2.Environment` object
+    """
+
+    from jinja2 import Environment, FileSystemLoader, pass_context
+
+    if template_dir is None:
+        search_path = [SCHEMAS]
+    else:
+        search_path = [template_dir, SCHEMAS]
+
+    LOGGER.debug(f'Setting up template environment {search_path}')
+    env = Environment(loader=FileSystemLoader(search_path), cache_size=-1)
+
+    LOGGER.debug('Adding template filters')
+    env.filters.update(TEMPLATE_FILTERS)
+    normalize_datestring_j2 = pass_context(_normalize_datestring_j2)
+    env.filters['normalize_datestring'] = normalize_datestring_j2
+    env.globals.update(zip=zip)
+    env.globals.update(TEMPLATE_GLOBALS)
+    env.globals.update(normalize_datestring=normalize_datestring_j2)
+    env.globals.update(get_derived=_get_derived_j2)
+
+    return env
+
+
+def _normalize_datestring_j2(context, datestring: str,
+                             format_: str = 'default') -> str:
+    """
+    template filter/function wrapper of `normalize_datestring` which
+    resolves magic keywords against a single clock snapshot per render
+
+    :param context: Jinja2 template context
+    :param datestring: date in string representation
+    :format_: datetring format ('year' or default [full])
+
+    :returns: string of properly formatted datestring
+    """
+
+    return normalize_datestring(datestring, format_,
+                                now=context.get('render_datetime'))
+
+
+def _get_derived_j2(mcf: dict) -> 'DerivedMCF':
+    """
+    template function wrapper of `pygeometa.schemas.util.get_derived`, for
+    templates rendered without a `derived` variable (i.e. other than by
+    `render_j2_template`)
+
+    :param mcf: dict of MCF content model
+
+    :returns: `pygeometa.schemas.util.DerivedMCF`
+    """
+
+    from pygeometa.schemas.util import get_derived
+
+    return get_derived(mcf)
+
+
 def validate_mcf(instance_dict: dict) -> bool:
     """
     Validate an MCF document against the MCF schema
@@ -469,6 +1331,9 @@ def validate_mcf(instance_dict: dict) -> bool:
     :returns: `bool` of validation
     """
 
+    from jsonschema import validate as jsonschema_validate
+    from jsonschema.exceptions import ValidationError
+
     schema_file = SCHEMAS / 'mcf' / 'core.yaml'
 
     with schema_file.open() as fh2:
@@ -519,6 +1384,8 @@ def yaml_load(obj: Union[IO, str]) -> dict:
     :returns: `dict` representation of YAML
     """
 
+    import yaml
+
     # support environment variables in config
     # https://stackoverflow.com/a/55301129
     path_matcher = re.compile(r'.*\$\{([^}^{]+)\}.*')
@@ -539,6 +1406,22 @@ def yaml_load(obj: Union[IO, str]) -> dict:
     return yaml.load(obj, Loader=EnvVarLoader)
 
 
+TEMPLATE_FILTERS = {
+    'normalize_datestring': normalize_datestring,
+    'get_distribution_language': get_distribution_language,
+    'get_charstring': get_charstring,
+    'prune_distribution_formats': prune_distribution_formats,
+    'prune_transfer_option': prune_transfer_option
+}
+
+TEMPLATE_GLOBALS = {
+    'get_charstring': get_charstring,
+    'normalize_datestring': normalize_datestring,
+    'prune_distribution_formats': prune_distribution_formats,
+    'prune_transfer_option': prune_transfer_option
+}
+
+
 class MCFReadError(Exception):
     """Exception stub for format reading errors"""
     pass
@@ -555,14 +1438,33 @@ class MCFValidationError(Exception):
 @cli_options.OPTION_OUTPUT
 @cli_options.OPTION_VERBOSITY
 @click.option('-s', '--schema', required=True,
-              type=click.Choice(get_supported_schemas(include_autodetect=True)),  # noqa
+              type=cli_options.LazyChoice(get_supported_schemas, include_autodetect=True),  # noqa
               default='autodetect',
               help='Metadata schema')
-def import_(ctx, metadata_file, schema, output, verbosity):
+@click.option('--records', is_flag=True, default=False,
+              help='Stream the records of a multi-record ISO 19139 document '
+                   '(e.g. CSW GetRecords, OAI-PMH ListRecords responses) '
+                   'into a multi-document YAML stream')
+def import_(ctx, metadata_file, schema, output, verbosity, records):
     """import metadata"""
 
+    import yaml
+
+    if records:
+        if schema not in ['autodetect', 'iso19139']:
+            raise click.UsageError('--records requires ISO 19139 metadata')
+
+        schema_object = load_schema('iso19139')
+        content = schema_object.import_records(metadata_file)
+        if output is None:
+            yaml.dump_all(content, click.get_text_stream('stdout'))
+        else:
+            yaml.dump_all(content, output, indent=4)
+        return
+
     try:
-        content = import_metadata(schema, metadata_file.read())
+        with read_metadata_file(metadata_file) as metadata:
+            content = import_metadata(schema, metadata)
         if output is None:
             click.echo(yaml.dump(content))
         else:
@@ -574,37 +1476,106 @@ def import_(ctx, metadata_file, schema, output, verbosity):
 
 @click.command()
 @click.pass_context
-@cli_options.ARGUMENT_MCF
+@click.argument('mcf', nargs=-1, required=True)
 @cli_options.OPTION_OUTPUT
 @click.option('--schema',
-              type=click.Choice(get_supported_schemas()),
-              help='Metadata schema')
+              type=cli_options.LazyChoices(get_supported_schemas),
+              help='Metadata schema (or comma-separated list of schemas)')
 @click.option('--schema_local',
               type=click.Path(exists=True, resolve_path=True,
                               dir_okay=True, file_okay=False),
               help='Locally defined metadata schema')
+@click.option('--output-dir',
+              type=click.Path(resolve_path=True, dir_okay=True,
+                              file_okay=False),
+              help='Directory to write metadata of each MCF and schema to')
+@click.option('--name-by', type=click.Choice(['source', 'identifier']),
+              default='source',
+              help='Name files of output-dir by MCF file name (default) or '
+                   'identifier')
+@click.option('--workers', type=click.IntRange(min=1), default=1,
+              help='Number of processes to generate MCFs with (or threads '
+                   'to write the schemas of a single MCF with)')
+@click.option('--incremental', is_flag=True, default=False,
+              help='Regenerate only files of output-dir whose inputs '
+                   'changed (recorded in a manifest of output-dir)')
+@click.option('--watch', is_flag=True, default=False,
+              help='Keep watching MCFs, their base_mcf files and templates, '
+                   'regenerating files of output-dir when they change')
+@cli_options.OPTION_COMPACT
 @cli_options.OPTION_VERBOSITY
-def generate(ctx, mcf, schema, schema_local, output, verbosity):
-    """generate metadata"""
+def generate(ctx, mcf, schema, schema_local, output, output_dir, name_by,
+             workers, incremental, watch, compact, verbosity):
+    """generate metadata of MCF files, directories or glob patterns"""
 
     if schema is None and schema_local is None:
         raise click.UsageError('Missing arguments')
     elif None not in [schema, schema_local]:
         raise click.UsageError('schema / schema_local are mutually exclusive')
+    elif None not in [output, output_dir]:
+        raise click.UsageError('output / output-dir are mutually exclusive')
 
-    mcf_dict = read_mcf(mcf)
+    mcfs = get_mcf_files(mcf)
 
-    if schema is not None:
-        LOGGER.info(f'Processing {mcf} into {schema}')
-        schema_object = load_schema(schema)
-        content = schema_object.write(mcf_dict)
-    else:
-        content = render_j2_template(mcf_dict, template_dir=schema_local)
+    if output_dir is None and len(mcfs) != 1:
+        raise click.UsageError('Multiple MCFs require output-dir')
+    elif output_dir is None and incremental:
+        raise click.UsageError('incremental requires output-dir')
+    elif output_dir is None and watch:
+        raise click.UsageError('watch requires output-dir')
 
-    if output is None:
-        click.echo(content)
-    else:
-        output.write(content)
+    if watch:
+        from pygeometa.watch import Watcher
+
+        def report(results: dict) -> None:
+            for mcf_, error in results.items():
+                if error is None:
+                    click.echo(f'{mcf_}: generated')
+                else:
+                    click.echo(f'{mcf_}: {error}', err=True)
+
+        watcher = Watcher(mcf, output_dir, schema, schema_local, name_by,
+                          compact)
+        try:
+            watcher.run(callback=report)
+        except KeyboardInterrupt:
+            LOGGER.info('Stopped watching')
+        return
+
+    if schema is None and output_dir is None:
+        content = render_j2_template(read_mcf(mcfs[0]),
+                                     template_dir=schema_local)
+        if output is None:
+            click.echo(content)
+        else:
+            output.write(content)
+        return
+
+    if output_dir is not None:
+        LOGGER.info(f'Processing {len(mcfs)} MCFs')
+        errors = generate_batch(mcfs, schema or [], output_dir, workers,
+                                name_by, compact, incremental, schema_local)
+
+        failed = {k: v for k, v in errors.items() if v is not None}
+        for mcf_, error in failed.items():
+            click.echo(f'{mcf_}: {error}', err=True)
+
+        if failed:
+            raise click.ClickException(
+                f'{len(failed)} of {len(mcfs)} MCFs failed')
+        return
+
+    if len(schema) > 1 and output is not None:
+        raise click.UsageError('Multiple schemas require output-dir')
+
+    LOGGER.info(f"Processing {mcfs[0]} into {', '.join(schema)}")
+    contents = generate_many(mcfs[0], schema, workers, compact)
+
+    for content in contents.values():
+        if output is None:
+            click.echo(content)
+        else:
+            output.write(content)
 
 
 @click.command()
@@ -657,22 +1628,67 @@ def validate(ctx, mcf, verbosity):
 
 @click.command()
 @click.pass_context
-@cli_options.ARGUMENT_METADATA_FILE
+@click.argument('metadata-file',
+                type=click.Path(exists=True, allow_dash=True, dir_okay=True))
 @cli_options.OPTION_OUTPUT
 @cli_options.OPTION_VERBOSITY
 @click.option('--input-schema', required=True,
-              type=click.Choice(get_supported_schemas(include_autodetect=True)),  # noqa
+              type=cli_options.LazyChoice(get_supported_schemas, include_autodetect=True),  # noqa
               default='autodetect',
               help='Metadata schema of input file')
 @click.option('--output-schema', required=True,
-              type=click.Choice(get_supported_schemas()),
+              type=cli_options.LazyChoice(get_supported_schemas),
               help='Metadata schema of input file')
+@click.option('--ndjson', is_flag=True, default=False,
+              help='Transform each record of a directory, tarball or stream '
+                   'of concatenated records to a line of newline-delimited '
+                   'JSON (failed records to error entries)')
+@click.option('--output-dir',
+              type=click.Path(resolve_path=True, dir_okay=True,
+                              file_okay=False),
+              help='Transform each record of a directory, tarball or stream '
+                   'of concatenated records to a file of output-dir')
+@click.option('--workers', type=click.IntRange(min=1), default=1,
+              help='Number of processes to transform records with')
+@cli_options.OPTION_COMPACT
 def transform(ctx, metadata_file, input_schema, output_schema, output,
-              verbosity):
-    """transform metadata"""
-
-    content = transform_metadata(input_schema, output_schema,
-                                 metadata_file.read())
+              verbosity, ndjson, output_dir, workers, compact):
+    """transform metadata (or records of directories, tarballs or streams)"""
+
+    if ndjson and output_dir is not None:
+        raise click.UsageError('ndjson / output-dir are mutually exclusive')
+    elif None not in [output, output_dir]:
+        raise click.UsageError('output / output-dir are mutually exclusive')
+
+    if ndjson or output_dir is not None:
+        if metadata_file == '-':
+            metadata_file = click.get_binary_stream('stdin')
+
+        results = transform_batch(iter_metadata_records(metadata_file),
+                                  input_schema, output_schema, workers,
+                                  compact or ndjson)
+
+        if ndjson:
+            failed = write_transform_results(
+                results, output_schema,
+                fh=output or click.get_text_stream('stdout'))
+        else:
+            failed = write_transform_results(results, output_schema,
+                                             output_dir=output_dir)
+            for name, error in failed.items():
+                click.echo(f'{name}: {error}', err=True)
+
+        if failed:
+            raise click.ClickException(f'{len(failed)} records failed')
+        return
+
+    if os.path.isdir(metadata_file):
+        raise click.UsageError('Directories require ndjson or output-dir')
+
+    with click.open_file(metadata_file, 'rb') as fh, \
+            read_metadata_file(fh) as metadata:
+        content = transform_metadata(input_schema, output_schema, metadata,
+                                     compact=compact)
 
     if content is None:
         raise click.ClickException('No supported input schema detected/found')
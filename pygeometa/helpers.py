@@ -48,26 +48,109 @@ from datetime import date, datetime, time
 from decimal import Decimal
 import json
 import logging
+import mmap
+import os
 from pathlib import Path
-from typing import Any
+import re
+from typing import Any, Callable, IO, Union
 
 LOGGER = logging.getLogger(__name__)
 
 THISDIR = Path(__file__).resolve().parent
 
+# size (bytes) from which metadata files are memory mapped rather than read
+MMAP_THRESHOLD = 1048576
 
-def json_dumps(obj) -> str:
+
+# JSON encoder of json_dumps (see set_json_encoder); None for the standard
+# library encoder
+_JSON_ENCODER = None
+
+
+def json_dumps(obj, compact: bool = False) -> str:
     """
     Helper function to dump dict to JSON string
 
     :param obj: `dict` of JSON
+    :param compact: whether to serialize compactly (without indentation
+                    or whitespace)
 
     :returns: `str` of JSON
     """
 
+    if _JSON_ENCODER is not None:
+        return _JSON_ENCODER(obj, compact)
+
+    if compact:
+        return json.dumps(obj, default=json_serial, ensure_ascii=False,
+                          separators=(',', ':'))
+
     return json.dumps(obj, default=json_serial, indent=4, ensure_ascii=False)
 
 
+def set_json_encoder(encoder: Union[str, Callable, None] = None) -> None:
+    """
+    Helper function to set the JSON encoder used by all JSON schemas
+
+    :param encoder: `None` or `'json'` (standard library, default),
+                    `'orjson'` (requires the orjson package; pretty printed
+                    output is indented by 2 spaces) or a callable
+                    `encoder(obj, compact) -> str`
+
+    :returns: None
+    """
+
+    global _JSON_ENCODER
+
+    if encoder in [None, 'json']:
+        _JSON_ENCODER = None
+    elif encoder == 'orjson':
+        import orjson  # noqa: F401 (fail early if not installed)
+        _JSON_ENCODER = _orjson_dumps
+    elif callable(encoder):
+        _JSON_ENCODER = encoder
+    else:
+        raise ValueError(f'Unknown JSON encoder: {encoder}')
+
+
+def get_json_encoder() -> str:
+    """
+    Helper function to get the name of the JSON encoder used by all JSON
+    schemas (see `set_json_encoder`), e.g. to key results by it
+
+    :returns: `str` of encoder name (`json`, `orjson`, or the qualified
+              name of a custom callable)
+    """
+
+    if _JSON_ENCODER is None:
+        return 'json'
+    elif _JSON_ENCODER is _orjson_dumps:
+        return 'orjson'
+
+    return (f"{getattr(_JSON_ENCODER, '__module__', '')}."
+            f"{getattr(_JSON_ENCODER, '__qualname__', repr(_JSON_ENCODER))}")
+
+
+def _orjson_dumps(obj, compact: bool = False) -> str:
+    """
+    Helper function to dump dict to JSON string with orjson
+
+    :param obj: `dict` of JSON
+    :param compact: whether to serialize compactly (without indentation
+                    or whitespace)
+
+    :returns: `str` of JSON
+    """
+
+    import orjson
+
+    option = orjson.OPT_NON_STR_KEYS
+    if not compact:
+        option |= orjson.OPT_INDENT_2
+
+    return orjson.dumps(obj, default=json_serial, option=option).decode()
+
+
 def json_serial(obj) -> Any:
     """
     Helper function to convert to JSON non-default
@@ -95,6 +178,123 @@ def json_serial(obj) -> Any:
     raise TypeError(msg)
 
 
+def get_hashable(obj: Any) -> Any:
+    """
+    Helper function to derive a hashable equivalent of a (nested) object,
+    which is equal for equal objects (dicts compare regardless of key order)
+
+    :param obj: `object` (`dict`, `list` or scalar) to be evaluated
+
+    :returns: hashable equivalent of object
+    """
+
+    if isinstance(obj, dict):
+        return frozenset((k, get_hashable(v)) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        return tuple(get_hashable(v) for v in obj)
+    elif isinstance(obj, set):
+        return frozenset(get_hashable(v) for v in obj)
+
+    return obj
+
+
+class FrozenDict(dict):
+    """
+    Read-only `dict` (see `freeze`), raising `TypeError` on mutation.
+    Copies (`copy.copy`, `copy.deepcopy`) are mutable
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('MCF is read-only')
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return thaw(self)
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+
+class FrozenList(list):
+    """
+    Read-only `list` (see `freeze`), raising `TypeError` on mutation.
+    Copies (`copy.copy`, `copy.deepcopy`) are mutable
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('MCF is read-only')
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = \
+        _readonly
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return thaw(self)
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+
+def freeze(obj: Any) -> Any:
+    """
+    Helper function to derive a read-only view of a (nested) object, such
+    as an MCF, so that it can be shared between writers (e.g. in threads)
+    without copying, and so that writers modifying it fail loudly
+
+    :param obj: `object` (`dict`, `list` or scalar) to be frozen
+
+    :returns: `FrozenDict`, `FrozenList` or scalar
+    """
+
+    if isinstance(obj, FrozenDict) or isinstance(obj, FrozenList):
+        return obj
+    elif isinstance(obj, dict):
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    elif isinstance(obj, list):
+        return FrozenList(freeze(v) for v in obj)
+
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """
+    Helper function to derive a mutable (deep) copy of a frozen object
+
+    :param obj: `object` (`dict`, `list` or scalar) to be thawed
+
+    :returns: `dict`, `list` or scalar
+    """
+
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [thaw(v) for v in obj]
+
+    return obj
+
+
+def get_filename(name: Any) -> str:
+    """
+    Helper function to derive a safe file name from a value (such as an
+    MCF identifier), replacing characters other than letters, digits,
+    `.`, `-` and `_`
+
+    :param name: value to derive file name from
+
+    :returns: `str` of file name
+    """
+
+    return re.sub(r'[^\w.-]', '_', str(name))
+
+
 def generate_datetime(date_value: str) -> str:
     """
     Helper function to derive RFC3339 date from MCF date type
@@ -142,3 +342,220 @@ def generate_datetime(date_value: str) -> str:
         raise RuntimeError(msg)
 
     return value
+
+
+class MetadataInput:
+    """
+    Metadata content to import, parsed lazily and at most once per
+    representation (text, XML tree, JSON or YAML object) so that parses
+    are shared between importers (e.g. during schema autodetection).
+
+    Bytes-like content (`bytes`, `mmap.mmap`) is handed to the parsers
+    as is, and only decoded to text when an importer asks for it (see
+    `text`).  Parsed representations are shared and must not be modified.
+
+    Used as a context manager, memory mapped content is closed on exit.
+    """
+
+    def __init__(self, metadata: Union[str, bytes, mmap.mmap]):
+        """
+        Initialize object
+
+        :param metadata: `str` or bytes-like (`bytes`, `mmap.mmap`) of
+                         metadata content
+
+        :returns: `pygeometa.helpers.MetadataInput`
+        """
+
+        if isinstance(metadata, str):
+            self._text = metadata
+            self._bytes = None
+        else:
+            self._text = None
+            self._bytes = metadata
+
+        self._parsed = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __reduce__(self):
+        # parsed representations are not picklable (nor worth sending)
+        if self._bytes is not None:
+            return self.__class__, (bytes(self._bytes),)
+        return self.__class__, (self._text,)
+
+    def __str__(self):
+        return self.text
+
+    def close(self) -> None:
+        """
+        closes memory mapped content (parsed representations remain
+        available)
+
+        :returns: `None`
+        """
+
+        if isinstance(self._bytes, mmap.mmap):
+            self._bytes.close()
+
+    @property
+    def bytes(self) -> Union[bytes, mmap.mmap]:
+        """metadata content as (original or UTF-8 encoded) bytes-like"""
+
+        if self._bytes is None:
+            self._bytes = self._text.encode('utf-8')
+
+        return self._bytes
+
+    @property
+    def text(self) -> str:
+        """metadata content as (original or UTF-8 decoded) `str`"""
+
+        if self._text is None:
+            LOGGER.debug('Decoding metadata')
+            self._text = str(self._bytes, 'utf-8', 'replace')
+
+        return self._text
+
+    def head(self, size: int) -> str:
+        """
+        decodes the start of metadata content only (e.g. to sniff it)
+
+        :param size: number of characters (or bytes, if not yet decoded)
+
+        :returns: `str` of start of metadata content
+        """
+
+        if self._text is not None:
+            return self._text[:size]
+
+        return str(self._bytes[:size], 'utf-8', 'replace')
+
+    def contains(self, token: str) -> bool:
+        """
+        checks for a token without decoding metadata content
+
+        :param token: `str` to look for
+
+        :returns: `bool` of whether the content contains the token
+        """
+
+        if self._text is not None:
+            return token in self._text
+
+        return self._bytes.find(token.encode('utf-8')) != -1
+
+    def _parser_input(self) -> Union[str, bytes]:
+        """
+        returns content in the form parsers read without copying it: the
+        original `str` or `bytes`, else (e.g. memory mapped) text
+
+        :returns: `str` or `bytes` of metadata content
+        """
+
+        if isinstance(self._bytes, bytes):
+            return self._bytes
+
+        return self.text
+
+    @property
+    def xml(self) -> Any:
+        """metadata content parsed as an XML (`lxml.etree`) root element"""
+
+        def parse_xml():
+            from lxml import etree
+
+            if self._bytes is not None:
+                return etree.fromstring(self._bytes)
+            try:
+                return etree.fromstring(self._text)
+            except ValueError:  # str with an XML encoding declaration
+                return etree.fromstring(self.bytes)
+
+        return self._parse('xml', parse_xml)
+
+    @property
+    def json(self) -> Any:
+        """metadata content parsed as JSON"""
+
+        return self._parse('json', lambda: json.loads(self._parser_input()))
+
+    @property
+    def yaml(self) -> Any:
+        """metadata content parsed as (safe) YAML"""
+
+        def parse_yaml():
+            import yaml
+
+            return yaml.load(self._parser_input(), Loader=getattr(
+                yaml, 'CSafeLoader', yaml.SafeLoader))
+
+        return self._parse('yaml', parse_yaml)
+
+    def _parse(self, representation: str, parser: Callable) -> Any:
+        """
+        parses content once per representation, remembering the result or
+        the parsing error
+
+        :param representation: name of representation
+        :param parser: function parsing the content
+
+        :returns: parsed content
+        """
+
+        if representation not in self._parsed:
+            LOGGER.debug(f'Parsing metadata as {representation}')
+            try:
+                self._parsed[representation] = (parser(), None)
+            except Exception as err:
+                self._parsed[representation] = (None, err)
+
+        value, error = self._parsed[representation]
+
+        if error is not None:
+            raise error
+
+        return value
+
+
+def get_metadata_input(metadata: Union[str, bytes]) -> MetadataInput:
+    """
+    Helper function to wrap metadata content as a `MetadataInput`
+
+    :param metadata: `str`, `bytes` or `MetadataInput` of metadata content
+
+    :returns: `MetadataInput` of metadata content
+    """
+
+    if isinstance(metadata, MetadataInput):
+        return metadata
+
+    return MetadataInput(metadata)
+
+
+def read_metadata_file(fh: IO) -> MetadataInput:
+    """
+    Helper function to read metadata content from a binary file, memory
+    mapping large regular files (so that parsers read the file's pages
+    directly instead of a copy of its content).  Use the result as a
+    context manager to close the mapping
+
+    :param fh: binary file-like object
+
+    :returns: `MetadataInput` of metadata content
+    """
+
+    try:
+        size = os.fstat(fh.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            LOGGER.debug(f'Memory mapping {size} bytes of metadata')
+            return MetadataInput(
+                mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+    except (AttributeError, OSError, ValueError) as err:  # pipes, buffers
+        LOGGER.debug(f'Cannot memory map metadata: {err}')
+
+    return MetadataInput(fh.read())
@@ -0,0 +1,320 @@
+# =================================================================
+#
+# Terms and Conditions of Use
+#
+# Unless otherwise noted, computer program source code of this
+# distribution # is covered under Crown Copyright, Government of
+# Canada, and is distributed under the MIT License.
+#
+# The Canada wordmark and related graphics associated with this
+# distribution are protected under trademark law and copyright law.
+# No permission is granted to use them outside the parameters of
+# the Government of Canada's corporate identity program. For
+# more information, see
+# http://www.tbs-sct.gc.ca/fip-pcim/index-eng.asp
+#
+# Copyright title to all 3rd party software distributed with this
+# software is held by the respective copyright holders as noted in
+# those files. Users are asked to read the 3rd Party Licenses
+# referenced with those assets.
+#
+# Copyright (c) 2026 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import re
+from typing import Union
+
+from pygeometa.core import SCHEMAS, VERSION, get_abspath
+from pygeometa.schemas import load_schema, REGISTRY
+
+LOGGER = logging.getLogger(__name__)
+
+MANIFEST_FILE = '.pygeometa-manifest.json'
+
+BASE_MCF_MATCHER = re.compile(r'^\s*base_mcf:\s*(.+?)\s*(?:#.*)?$',
+                              re.MULTILINE)
+ENV_VAR_MATCHER = re.compile(r'\$\{([^}^{]+)\}')
+
+
+def get_file_hash(filepath: Union[Path, str]) -> Union[str, None]:
+    """
+    gets hash of a file's content
+
+    :param filepath: path to file
+
+    :returns: `str` of SHA-256 hex digest, or `None` if file does not exist
+    """
+
+    try:
+        with open(filepath, 'rb') as fh:
+            return hashlib.sha256(fh.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def get_mcf_dependencies(mcf: str) -> tuple:
+    """
+    gets files and environment variables an MCF file depends on: the MCF,
+    its `base_mcf` ancestors and the environment variables they use
+
+    Files are scanned rather than parsed, so that this stays cheap; any
+    `base_mcf` line found is followed (resolved against the MCF, like
+    `pygeometa.core.read_mcf`), which may yield more (but never fewer)
+    dependencies than reading the MCF.
+
+    :param mcf: path to MCF file
+
+    :returns: `tuple` of `list` of file paths and `list` of environment
+              variable names
+    """
+
+    files = [str(Path(mcf).resolve())]
+    env_vars = []
+
+    for filepath in files:
+        try:
+            with open(filepath, encoding='utf-8') as fh:
+                content = fh.read()
+        except FileNotFoundError:
+            continue
+
+        env_vars.extend(ENV_VAR_MATCHER.findall(content))
+
+        for base_mcf in BASE_MCF_MATCHER.findall(content):
+            base_mcf = os.path.expandvars(base_mcf.strip('\'"'))
+            base_mcf = str(get_abspath(mcf, base_mcf).resolve())
+            if base_mcf not in files:
+                files.append(base_mcf)
+
+    return files, list(dict.fromkeys(env_vars))
+
+
+def get_template_files(schema: str) -> list:
+    """
+    gets the template files a schema renders metadata with
+
+    All templates of the schema's template directory (and, for schemas
+    shipped with pygeometa, of its `common` templates) are included.
+    Schemas implemented in Python depend on the pygeometa version only.
+
+    :param schema: `str` of schema name, or directory of a locally defined
+                   schema
+
+    :returns: `list` of template file paths
+    """
+
+    if schema not in REGISTRY.schemas:
+        return [str(f) for f in sorted(Path(schema).resolve().rglob('*.j2'))]
+
+    template_dir = load_schema(schema).template_dir
+
+    if template_dir is None:
+        return []
+
+    template_dir = Path(template_dir).resolve()
+
+    if not (template_dir / 'main.j2').exists():
+        return []
+
+    files = sorted(template_dir.glob('*.j2'))
+    if template_dir.is_relative_to(SCHEMAS):
+        files.extend(sorted((SCHEMAS / 'common').glob('*.j2')))
+
+    return [str(f) for f in files]
+
+
+class Manifest:
+    """
+    Manifest of the outputs of a directory and the hashes of the inputs
+    they were generated from (MCF, `base_mcf` ancestors, environment
+    variables, templates and pygeometa version), along with the options
+    they were generated with
+    """
+
+    def __init__(self, output_dir: str, options: dict = None):
+        """
+        Initialize object, loading the manifest of an output directory
+        (if any)
+
+        :param output_dir: directory of outputs
+        :param options: `dict` of options outputs are generated with (e.g.
+                        `compact`, `name_by`, `json_encoder`); outputs
+                        generated with other options are out of date
+
+        :returns: `pygeometa.manifest.Manifest`
+        """
+
+        self.output_dir = output_dir
+        self.options = options or {}
+        self.filename = os.path.join(output_dir, MANIFEST_FILE)
+        self.outputs = {}
+        self._hashes = {}
+        self._template_files = {}
+
+        try:
+            with open(self.filename, encoding='utf-8') as fh:
+                manifest = json.load(fh)
+            if manifest.get('version') == VERSION:
+                self.outputs = manifest['outputs']
+            else:
+                LOGGER.info('pygeometa version changed; ignoring manifest')
+        except FileNotFoundError:
+            LOGGER.debug(f'No manifest {self.filename}')
+        except (KeyError, ValueError) as err:
+            LOGGER.warning(f'Invalid manifest {self.filename}: {err}')
+
+        self._sources = {}
+        for output, entry in self.outputs.items():
+            self._sources.setdefault(entry['source'], {})[
+                entry['schema']] = output
+
+    def _hash(self, dependency: str) -> Union[str, None]:
+        """
+        gets (once per manifest) the hash of a dependency: a file path or
+        an environment variable (`env:<name>`)
+
+        :param dependency: `str` of dependency
+
+        :returns: `str` of hash (`None` if the file / variable is missing)
+        """
+
+        if dependency not in self._hashes:
+            if dependency.startswith('env:'):
+                value = os.environ.get(dependency[4:])
+                if value is not None:
+                    value = hashlib.sha256(value.encode('utf-8')).hexdigest()
+                self._hashes[dependency] = value
+            else:
+                self._hashes[dependency] = get_file_hash(dependency)
+
+        return self._hashes[dependency]
+
+    def get_dependencies(self, mcf: str, schema: str) -> dict:
+        """
+        gets the current hashes of the inputs of an MCF in a schema
+
+        :param mcf: path to MCF file
+        :param schema: `str` of schema name (or local schema directory)
+
+        :returns: `dict` of dependencies and their hashes
+        """
+
+        files, env_vars = get_mcf_dependencies(mcf)
+
+        if schema not in self._template_files:
+            self._template_files[schema] = get_template_files(schema)
+
+        dependencies = files + self._template_files[schema]
+        dependencies.extend(f'env:{env_var}' for env_var in env_vars)
+
+        return {d: self._hash(d) for d in dependencies}
+
+    def is_current(self, mcf: str, schemas: list) -> bool:
+        """
+        checks whether the outputs of an MCF in all schemas exist and
+        none of their inputs changed since they were generated
+
+        Only the inputs recorded in the manifest are hashed again: as long
+        as none of them changed, neither did the set of inputs.
+
+        :param mcf: path to MCF file
+        :param schemas: `list` of schema names (or local schema directories)
+
+        :returns: `bool` of whether MCF is up to date
+        """
+
+        source = str(Path(mcf).resolve())
+        outputs = self._sources.get(source, {})
+
+        for schema in schemas:
+            output = outputs.get(schema)
+            if output is None or self.outputs[output]['source'] != source:
+                return False
+            if self.outputs[output].get('options') != self.options:
+                LOGGER.debug(f'{output}: options changed')
+                return False
+            if not os.path.exists(os.path.join(self.output_dir, output)):
+                return False
+            dependencies = self.outputs[output]['dependencies']
+            for dependency, hash_ in dependencies.items():
+                if self._hash(dependency) != hash_:
+                    LOGGER.debug(f'{output}: {dependency} changed')
+                    return False
+
+        return True
+
+    def get_outputs(self, mcf: str) -> dict:
+        """
+        gets the outputs recorded for an MCF
+
+        :param mcf: path to MCF file
+
+        :returns: `dict` of schema names and output file names
+        """
+
+        return dict(self._sources.get(str(Path(mcf).resolve()), {}))
+
+    def update(self, mcf: str, outputs: dict) -> None:
+        """
+        records the outputs generated from an MCF
+
+        :param mcf: path to MCF file
+        :param outputs: `dict` of schema names and output file names
+
+        :returns: None
+        """
+
+        source = str(Path(mcf).resolve())
+
+        for output in self._sources.pop(source, {}).values():
+            self.outputs.pop(output, None)
+
+        for schema, output in outputs.items():
+            self.outputs[output] = {
+                'source': source,
+                'schema': schema,
+                'options': self.options,
+                'dependencies': self.get_dependencies(mcf, schema)
+            }
+
+        self._sources[source] = dict(outputs)
+
+    def save(self) -> None:
+        """
+        writes the manifest to the output directory
+
+        :returns: None
+        """
+
+        LOGGER.debug(f'Writing manifest {self.filename}')
+
+        with open(self.filename, 'w', encoding='utf-8') as fh:
+            json.dump({'version': VERSION, 'outputs': self.outputs}, fh,
+                      indent=2)
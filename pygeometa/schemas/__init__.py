@@ -43,10 +43,19 @@
 #
 # =================================================================
 
+import hashlib
 import importlib
+import json
 import logging
 import os
+from pathlib import Path
+import re
+import sys
+import threading
+from typing import Callable
 
+from pygeometa.cache import get_cache_dir
+from pygeometa.helpers import get_metadata_input
 from pygeometa.schemas.base import BaseOutputSchema
 
 LOGGER = logging.getLogger(__name__)
@@ -69,6 +78,20 @@ SCHEMAS = {
     'wmo-wigos': 'pygeometa.schemas.wmo_wigos.WMOWIGOSOutputSchema'
 }
 
+# entry point group of third-party schema plugins
+ENTRY_POINT_GROUP = 'pygeometa.schemas'
+
+# number of leading characters inspected when sniffing XML or YAML content
+SNIFF_SIZE = 8192
+
+XML_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+XML_ROOT_ELEMENT = re.compile(
+    r'<(?:(?P<prefix>[A-Za-z_][\w.-]*):)?(?P<name>[A-Za-z_][\w.-]*)'
+    r'(?P<attributes>(?:\s[^>]*)?)>')
+XML_NAMESPACE = re.compile(
+    r'xmlns(?::(?P<prefix>[\w.-]+))?\s*=\s*(["\'])(?P<uri>.*?)\2')
+YAML_KEY = re.compile(r'^(?P<key>[^\s#\'"-][^\n]*?):(?:[ \t]|$)', re.MULTILINE)
+
 
 def get_supported_schemas(details: bool = False,
                           include_autodetect: bool = False) -> list:
@@ -81,40 +104,29 @@ def get_supported_schemas(details: bool = False,
     :returns: list of supported schemas
     """
 
-    def has_mode(plugin: BaseOutputSchema, mode: str) -> bool:
-        enabled = False
-
-        try:
-            _ = getattr(plugin, mode)('test')
-        except NotImplementedError:
-            pass
-        except Exception:
-            enabled = True
-
-        return enabled
-
     schema_matrix = []
 
     LOGGER.debug('Generating list of supported schemas')
 
+    schemas = REGISTRY.schemas
+
     if not details:
         if include_autodetect:
-            schemas_keys = list(SCHEMAS.keys())
+            schemas_keys = list(schemas.keys())
             schemas_keys.append('autodetect')
             return schemas_keys
         else:
-            return sorted(SCHEMAS.keys())
+            return sorted(schemas.keys())
 
-    for key in SCHEMAS.keys():
+    for key in schemas.keys():
         schema = load_schema(key)
-        can_read = has_mode(schema, 'import_')
-        can_write = has_mode(schema, 'write')
 
         schema_matrix.append({
             'id': key,
             'description': schema.description,
-            'read': can_read,
-            'write': can_write
+            'read': schema.can_read,
+            'write': schema.can_write,
+            'media_type': schema.media_type
         })
 
     if include_autodetect:
@@ -122,44 +134,406 @@ def get_supported_schemas(details: bool = False,
             'id': 'autodetect',
             'description': 'Auto schema detection',
             'read': True,
-            'write': False
+            'write': False,
+            'media_type': None
         })
 
     return sorted(schema_matrix, key=lambda x: x['id'])
 
 
+def sniff_content(metadata: str) -> tuple:
+    """
+    inspects metadata content cheaply (without fully parsing XML or YAML)
+    to derive its format and signature: the XML root element and namespace
+    in Clark notation, or the top-level JSON/YAML keys
+
+    :param metadata: `str` or `pygeometa.helpers.MetadataInput` of metadata
+                     content (the latter shares the JSON parse with
+                     importers)
+
+    :returns: `tuple` of format (`xml`, `json` or `text`) and `set` of
+              signature tokens
+    """
+
+    metadata = get_metadata_input(metadata)
+    head = metadata.head(SNIFF_SIZE).lstrip('\ufeff \t\r\n')
+    signature = set()
+
+    if head.startswith('<'):
+        match = XML_ROOT_ELEMENT.search(XML_COMMENT.sub('', head))
+        if match is not None:
+            namespaces = {
+                ns.group('prefix'): ns.group('uri')
+                for ns in XML_NAMESPACE.finditer(match.group('attributes'))
+            }
+            namespace = namespaces.get(match.group('prefix'))
+            if namespace is not None:
+                signature.add(f'{{{namespace}}}')
+                signature.add(f'{{{namespace}}}{match.group("name")}')
+            else:
+                signature.add(match.group('name'))
+
+        return 'xml', signature
+
+    if head.startswith(('{', '[')):
+        try:
+            content = metadata.json
+        except ValueError:
+            content = None
+
+        if isinstance(content, dict):
+            signature.update(content.keys())
+
+        return 'json', signature
+
+    signature.update(key.group('key') for key in YAML_KEY.finditer(head))
+
+    return 'text', signature
+
+
+def rank_schemas(signature: set) -> list:
+    """
+    ranks readable schemas by how well their autodetection hints match a
+    content signature (see `sniff_content`).  Schemas without hints follow
+    the matching schemas.  If no schema matches, all readable schemas are
+    returned
+
+    :param signature: `set` of signature tokens
+
+    :returns: `list` of schema shortnames, most likely first
+    """
+
+    readers = []
+    ranked = []
+    unhinted = []
+
+    for schema_name in sorted(REGISTRY.schemas.keys()):
+        class_ = REGISTRY.get_class(schema_name)
+
+        if not class_.can_read:
+            continue
+
+        readers.append(schema_name)
+
+        if not class_.autodetect_hints:
+            unhinted.append(schema_name)
+            continue
+
+        score = len(signature.intersection(class_.autodetect_hints))
+        if score > 0:
+            ranked.append((score, schema_name))
+
+    if not ranked:
+        LOGGER.debug('No schema matches content signature')
+        return readers
+
+    ranked.sort(key=lambda x: -x[0])
+
+    return [schema_name for _, schema_name in ranked] + unhinted
+
+
 def load_schema(schema_name: str) -> BaseOutputSchema:
     """
     loads schema plugin by name
 
+    Plugins are instantiated once per process and shared between callers
+    (see `SchemaRegistry`).
+
     :param schema_name: shortname of schema
 
     :returns: plugin object
     """
 
-    LOGGER.debug(f'Schemas: {SCHEMAS.keys()}')
+    return REGISTRY.get(schema_name)
+
 
-    if schema_name not in SCHEMAS.keys():
-        msg = f'Schema {schema_name} not found'
-        LOGGER.exception(msg)
-        raise InvalidSchemaError(msg)
+def preload(schema_names: list = None) -> list:
+    """
+    loads schema plugins ahead of use (e.g. at startup of long-running
+    services)
 
-    name = SCHEMAS[schema_name]
+    :param schema_names: list of schema shortnames (default is all
+                         supported schemas)
 
-    if '.' in name:  # dotted path
-        packagename, classname = name.rsplit('.', 1)
-    else:
-        raise InvalidSchemaError(f'Schema path {name} not found')
+    :returns: list of plugin objects
+    """
 
-    LOGGER.debug(f'package name: {packagename}')
-    LOGGER.debug(f'class name: {classname}')
+    return REGISTRY.preload(schema_names)
 
-    module = importlib.import_module(packagename)
-    class_ = getattr(module, classname)
 
-    return class_()
+def get_plugin_index_file() -> Path:
+    """
+    gets location of the schema plugin index file (in the pygeometa cache
+    directory, see `pygeometa.cache.get_cache_dir`)
+
+    :returns: `pathlib.Path` of index file
+    """
+
+    return get_cache_dir() / 'schema-plugins.json'
+
+
+def get_plugin_index(refresh: bool = False) -> dict:
+    """
+    gets third-party schema plugins registered via the `pygeometa.schemas`
+    entry point group, e.g. in a plugin's pyproject.toml:
+
+    [project.entry-points."pygeometa.schemas"]
+    my-schema = "my_package.my_schema:MyOutputSchema"
+
+    Results are cached in an index file keyed by the installed
+    distributions (and their versions), so that entry points are only
+    scanned when packages are installed, upgraded or removed.  The index
+    is only an optimization: if it cannot be read or written (e.g. in a
+    read-only home directory), entry points are scanned on every call.
+
+    :param refresh: whether to force scanning entry points
+
+    :returns: `dict` of schema shortnames to dotted class paths
+    """
+
+    index_file = get_plugin_index_file()
+    key = _get_distributions_key()
+
+    if not refresh:
+        try:
+            with index_file.open(encoding='utf-8') as fh:
+                index = json.load(fh)
+            if index.get('key') == key:
+                LOGGER.debug(f'Using schema plugin index {index_file}')
+                return index['schemas']
+            LOGGER.debug('Installed distributions changed; rebuilding index')
+        except FileNotFoundError:
+            LOGGER.debug('No schema plugin index found')
+        except (AttributeError, OSError, ValueError, KeyError) as err:
+            LOGGER.debug(f'Ignoring schema plugin index {index_file}: {err}')
+
+    schemas = discover_schemas()
+
+    try:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = index_file.with_name(f'{index_file.name}.{os.getpid()}')
+        with tmp_file.open('w', encoding='utf-8') as fh:
+            json.dump({'key': key, 'schemas': schemas}, fh)
+        os.replace(tmp_file, index_file)
+    except OSError as err:
+        LOGGER.debug(f'Cannot write schema plugin index {index_file}: {err}; '
+                     'scanning entry points on every run')
+
+    return schemas
+
+
+def discover_schemas() -> dict:
+    """
+    scans entry points for third-party schema plugins
+
+    :returns: `dict` of schema shortnames to dotted class paths
+    """
+
+    from importlib.metadata import entry_points
+
+    LOGGER.debug(f'Scanning {ENTRY_POINT_GROUP} entry points')
+
+    schemas = {}
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name in schemas:
+            LOGGER.warning(f'Duplicate schema plugin {entry_point.name}')
+            continue
+        if not entry_point.attr:
+            LOGGER.warning(f'Invalid schema plugin {entry_point.name}: '
+                           f'{entry_point.value}')
+            continue
+        schemas[entry_point.name] = f'{entry_point.module}.{entry_point.attr}'
+
+    return schemas
+
+
+def _get_distributions_key() -> str:
+    """
+    derives a key of the installed distributions from the metadata
+    directory names (which include distribution versions) on `sys.path`,
+    without reading distribution metadata
+
+    :returns: `str` of key
+    """
+
+    distributions = []
+
+    for path in sys.path:
+        try:
+            with os.scandir(path or '.') as entries:
+                for entry in entries:
+                    if entry.name.endswith('.dist-info'):
+                        distributions.append(entry.name)
+                    elif entry.name.endswith('.egg-info'):
+                        # development installs do not carry a version
+                        mtime = entry.stat().st_mtime_ns
+                        distributions.append(f'{entry.name}:{mtime}')
+        except OSError:
+            continue
+
+    distributions.sort()
+
+    return hashlib.sha256('\n'.join(distributions).encode()).hexdigest()
+
+
+class SchemaRegistry:
+    """Thread-safe registry of schema plugin classes and instances"""
+
+    def __init__(self, schemas: dict, plugins: Callable = None):
+        """
+        Initialize object
+
+        :param schemas: `dict` of schema shortnames to dotted class paths
+        :param plugins: optional function returning `dict` of additional
+                        (third-party) schemas, called on first use
+
+        :returns: `pygeometa.schemas.SchemaRegistry`
+        """
+
+        self._builtin_schemas = schemas
+        self._plugins = plugins
+        self._schemas = None
+        self._classes = {}
+        self._instances = {}
+        self._lock = threading.RLock()
+
+    @property
+    def schemas(self) -> dict:
+        """
+        schema shortnames to dotted class paths, including discovered
+        plugins (built-in schemas take precedence)
+        """
+
+        if self._schemas is not None:
+            return self._schemas
+
+        with self._lock:
+            if self._schemas is None:
+                schemas = dict(self._builtin_schemas)
+
+                if self._plugins is not None:
+                    for name, path in self._plugins().items():
+                        if name in schemas:
+                            LOGGER.warning(f'Schema plugin {name} ({path}) '
+                                           'conflicts with built-in schema')
+                            continue
+                        schemas[name] = path
+
+                self._schemas = schemas
+
+            return self._schemas
+
+    def get_class(self, schema_name: str) -> type:
+        """
+        resolves (and caches) schema plugin class by name
+
+        :param schema_name: shortname of schema
+
+        :returns: plugin class
+        """
+
+        try:
+            return self._classes[schema_name]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if schema_name not in self._classes:
+                self._classes[schema_name] = self._import_class(schema_name)
+
+            return self._classes[schema_name]
+
+    def get(self, schema_name: str) -> BaseOutputSchema:
+        """
+        gets (cached) schema plugin object by name
+
+        :param schema_name: shortname of schema
+
+        :returns: plugin object
+        """
+
+        try:
+            return self._instances[schema_name]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if schema_name not in self._instances:
+                class_ = self.get_class(schema_name)
+                self._instances[schema_name] = class_()
+
+            return self._instances[schema_name]
+
+    def preload(self, schema_names: list = None) -> list:
+        """
+        loads schema plugins ahead of use
+
+        :param schema_names: list of schema shortnames (default is all
+                             registered schemas)
+
+        :returns: list of plugin objects
+        """
+
+        if schema_names is None:
+            schema_names = list(self.schemas.keys())
+
+        LOGGER.debug(f'Preloading schemas: {schema_names}')
+
+        return [self.get(schema_name) for schema_name in schema_names]
+
+    def clear(self) -> None:
+        """
+        clears cached schemas, schema plugin classes and objects
+
+        :returns: None
+        """
+
+        with self._lock:
+            self._schemas = None
+            self._classes.clear()
+            self._instances.clear()
+
+    def _import_class(self, schema_name: str) -> type:
+        """
+        imports schema plugin class by name
+
+        :param schema_name: shortname of schema
+
+        :returns: plugin class
+        """
+
+        # built-in schemas do not require plugin discovery
+        if schema_name in self._builtin_schemas:
+            schemas = self._builtin_schemas
+        else:
+            schemas = self.schemas
+
+        LOGGER.debug(f'Schemas: {schemas.keys()}')
+
+        if schema_name not in schemas.keys():
+            msg = f'Schema {schema_name} not found'
+            LOGGER.exception(msg)
+            raise InvalidSchemaError(msg)
+
+        name = schemas[schema_name]
+
+        if '.' in name:  # dotted path
+            packagename, classname = name.rsplit('.', 1)
+        else:
+            raise InvalidSchemaError(f'Schema path {name} not found')
+
+        LOGGER.debug(f'package name: {packagename}')
+        LOGGER.debug(f'class name: {classname}')
+
+        module = importlib.import_module(packagename)
+
+        return getattr(module, classname)
 
 
 class InvalidSchemaError(Exception):
     """Invalid plugin"""
     pass
+
+
+REGISTRY = SchemaRegistry(SCHEMAS, get_plugin_index)
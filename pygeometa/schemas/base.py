@@ -43,17 +43,33 @@
 #
 # =================================================================
 
+import logging
 import os
-from typing import Union
+from typing import Iterable, Iterator, Union
 
 from pygeometa import core
 
+LOGGER = logging.getLogger(__name__)
+
 TEMPLATES = os.path.dirname(os.path.realpath(__file__))
 
 
 class BaseOutputSchema:
     """generic OutputSchema ABC"""
 
+    # capabilities, declared statically by each plugin so that they can be
+    # inspected without instantiating or executing it
+    can_read = False  # implements import_()
+    can_write = True  # implements write()
+    media_type = None  # media type of the schema encoding
+    # import_() accepts a pygeometa.helpers.MetadataInput (sharing parses
+    # between importers) instead of a str
+    reads_metadata_input = False
+    # content sniffing hints for import autodetection: XML root elements or
+    # namespaces in Clark notation ({namespace}name, {namespace}), or
+    # top-level JSON/YAML keys
+    autodetect_hints = ()
+
     def __init__(self, name: str = None, description: str = None,
                  outputformat: str = None, template_dir: str = None):
         """
@@ -71,13 +87,16 @@ class BaseOutputSchema:
         self.outputformat = outputformat
         self.template_dir = template_dir
 
-    def write(self, mcf: dict, stringify: str = True) -> Union[dict, str]:
+    def write(self, mcf: dict, stringify: str = True,
+              compact: bool = False) -> Union[dict, str]:
         """
         Write outputschema to string buffer
 
         :param mcf: dict of MCF content model
         :param stringify: whether to return a string representation (default)
                           else native (dict, etree)
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace; JSON encodings only)
 
         :returns: `dict` or `str` of metadata in outputschema representation
         """
@@ -87,11 +106,33 @@ class BaseOutputSchema:
 
         return mcf
 
+    def write_records(self, mcfs: Iterable) -> Iterator:
+        """
+        Write the records of MCFs one at a time, in native representation
+        (as with `stringify=False`).  MCFs which fail to write are logged
+        and skipped
+
+        :param mcfs: iterable of MCFs (`dict`s, as from `read_mcf`, or paths
+                     to MCF files/strings)
+
+        :returns: generator of records in outputschema representation
+        """
+
+        for count, mcf in enumerate(mcfs):
+            try:
+                if not isinstance(mcf, dict):
+                    mcf = core.read_mcf(mcf)
+                yield self.write(mcf, stringify=False)
+            except Exception as err:
+                LOGGER.warning(f'Writing record {count} failed: {err}')
+
     def import_(self, metadata: str) -> dict:
         """
         Import metadata into MCF
 
-        :param metadata: `str` of metadata content
+        :param metadata: `str` of metadata content (or
+                         `pygeometa.helpers.MetadataInput`, if
+                         `reads_metadata_input`)
 
         :returns: `dict` of MCF content
         """
@@ -48,9 +48,10 @@ import csv
 from io import StringIO
 from typing import Union
 
-from pygeometa.core import get_charstring, get_typed_value
+from pygeometa.core import get_typed_value
 from pygeometa.helpers import json_dumps
 from pygeometa.schemas.base import BaseOutputSchema
+from pygeometa.schemas.util import get_derived
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
 
@@ -58,6 +59,9 @@ THISDIR = os.path.dirname(os.path.realpath(__file__))
 class CSVWOutputSchema(BaseOutputSchema):
     """CSVS output schema"""
 
+    can_read = True
+    media_type = 'application/csvm+json'
+
     def __init__(self):
         """
         Initialize object
@@ -69,30 +73,28 @@ class CSVWOutputSchema(BaseOutputSchema):
 
         super().__init__('csvw', description, 'json', THISDIR)
 
-    def write(self, mcf: dict, stringify: str = True) -> Union[dict, str]:
+    def write(self, mcf: dict, stringify: str = True,
+              compact: bool = False) -> Union[dict, str]:
         """
         Write MCF attributes to CSVW
 
         :param mcf: dict of MCF content model
         :param stringify: whether to return a string representation (default)
                           else native (dict, etree)
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace)
 
         :returns: `dict` or `str` of MCF as a CSVW
         """
 
-        lang1 = mcf['metadata'].get('language')
-        lang2 = mcf['metadata'].get('language_alternate')
-
         csvw = {
             '@context': 'http://www.w3.org/ns/csvw',
             'tableSchema': {'columns': []}
         }
 
-        title = get_charstring(mcf['identification'].get('title'),
-                               lang1, lang2)
-
-        description = get_charstring(mcf['identification'].get('abstract'),
-                                     lang1, lang2)
+        derived = get_derived(mcf)
+        title = derived.charstring('identification', 'title')
+        description = derived.charstring('identification', 'abstract')
 
         csvw['dc:title'] = title[0]
         csvw['dc:description'] = description[0]
@@ -108,7 +110,7 @@ class CSVWOutputSchema(BaseOutputSchema):
             csvw['tableSchema']['columns'].append(column)
 
         if stringify:
-            return json_dumps(csvw)
+            return json_dumps(csvw, compact)
 
         return csvw
 
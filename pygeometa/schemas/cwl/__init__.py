@@ -48,8 +48,7 @@ import logging
 import os
 from typing import Union
 
-import yaml
-
+from pygeometa.helpers import get_metadata_input
 from pygeometa.schemas.base import BaseOutputSchema
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
@@ -60,6 +59,12 @@ LOGGER = logging.getLogger(__name__)
 class CWLOutputSchema(BaseOutputSchema):
     """Common Workflow Language v1.2 schema"""
 
+    can_read = True
+    reads_metadata_input = True
+    can_write = False
+    media_type = 'application/cwl+yaml'
+    autodetect_hints = ('cwlVersion', '$graph', '$namespaces')
+
     def __init__(self):
         """
         Initialize object
@@ -73,7 +78,7 @@ class CWLOutputSchema(BaseOutputSchema):
 
     def import_(self, metadata: str) -> dict:
 
-        metadata = yaml.safe_load(metadata)
+        metadata = get_metadata_input(metadata).yaml
 
         mcf = {
             'mcf': {
@@ -81,7 +86,8 @@ class CWLOutputSchema(BaseOutputSchema):
             },
             'metadata': {
                 'language': 'eng',
-                'charset': 'utf8'
+                'charset': 'utf8',
+                'dates': {}
             },
             'spatial': {
                 'datatype': 'grid',
@@ -207,5 +213,6 @@ class CWLOutputSchema(BaseOutputSchema):
 
         return mcf
 
-    def write(self, mcf: dict, stringify: str = True) -> Union[dict, str]:
+    def write(self, mcf: dict, stringify: str = True,
+              compact: bool = False) -> Union[dict, str]:
         raise NotImplementedError()
@@ -55,6 +55,8 @@ THISDIR = os.path.dirname(os.path.realpath(__file__))
 class DCATOutputSchema(BaseOutputSchema):
     """dcat output schema"""
 
+    media_type = 'application/ld+json'
+
     def __init__(self):
         """
         Initialize object
@@ -65,13 +67,16 @@ class DCATOutputSchema(BaseOutputSchema):
         description = 'DCAT'
         super().__init__('dcat', description, 'json', THISDIR)
 
-    def write(self, mcf: dict, stringify: str = True) -> Union[dict, str]:
+    def write(self, mcf: dict, stringify: str = True,
+              compact: bool = False) -> Union[dict, str]:
         """
         Write MCF to DCAT
 
         :param mcf: dict of MCF content model
         :param stringify: whether to return a string representation (default)
                           else native (dict, etree)
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace)
 
         :returns: `dict` or `str` of MCF as a DCAT representation
         """
@@ -163,14 +168,14 @@ class DCATOutputSchema(BaseOutputSchema):
                             if (k1 == 'spatial'):
                                 dcat["spatial"] = []
                                 for k2 in v1:
-                                    k2['@type'] = 'dct:Location'
-                                    dcat["spatial"].append(k2)
+                                    dcat["spatial"].append(
+                                        {**k2, '@type': 'dct:Location'})
                             # assign dct:PeriodOftime type
                             elif (k1 == 'temporal'):
                                 dcat['temporal'] = []
                                 for k3 in v1:
-                                    k3['@type'] = 'dct:PeriodOfTime'
-                                    dcat["temporal"].append(k3)
+                                    dcat["temporal"].append(
+                                        {**k3, '@type': 'dct:PeriodOfTime'})
                     # unnest keywords
                     elif (k == 'keywords'):
                         for k4, v4 in v.items():
@@ -193,6 +198,8 @@ class DCATOutputSchema(BaseOutputSchema):
             # transform set of keys to array
             elif (key in ['distributor', 'contact']):
                 for k, v in value.items():
+                    # copy, leaving the (read-only) MCF unchanged
+                    v = dict(v)
                     # add id (if url exists)
                     if (not isinstance(v, str) and v['url']):
                         v['@id'] = v['url']
@@ -207,6 +214,6 @@ class DCATOutputSchema(BaseOutputSchema):
                 dcat[key] = value
 
         if stringify:
-            return json_dumps(dcat)
+            return json_dumps(dcat, compact)
 
         return dcat
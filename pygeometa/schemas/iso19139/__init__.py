@@ -46,12 +46,14 @@
 import ast
 import logging
 import os
+from typing import IO, Iterator, TYPE_CHECKING, Union
 
-from lxml import etree
-from owslib.iso import CI_OnlineResource, CI_ResponsibleParty, MD_Metadata
-
+from pygeometa.helpers import get_metadata_input
 from pygeometa.schemas.base import BaseOutputSchema
 
+if TYPE_CHECKING:
+    from owslib.iso import CI_OnlineResource, CI_ResponsibleParty
+
 LOGGER = logging.getLogger(__name__)
 THISDIR = os.path.dirname(os.path.realpath(__file__))
 
@@ -59,6 +61,16 @@ THISDIR = os.path.dirname(os.path.realpath(__file__))
 class ISO19139OutputSchema(BaseOutputSchema):
     """ISO 19139 output schema"""
 
+    can_read = True
+    reads_metadata_input = True
+    media_type = 'application/xml'
+    autodetect_hints = (
+        '{http://www.isotc211.org/2005/gmd}MD_Metadata',
+        '{http://www.isotc211.org/2005/gmi}MI_Metadata',
+        '{http://www.isotc211.org/2005/gmd}',
+        '{http://www.isotc211.org/2005/gmi}'
+    )
+
     def __init__(self):
         """
         Initialize object
@@ -70,15 +82,75 @@ class ISO19139OutputSchema(BaseOutputSchema):
 
         super().__init__('iso19139', description, 'xml', THISDIR)
 
-    def import_(self, metadata: str) -> dict:
+    def import_(self, metadata: str, owslib: bool = False) -> dict:
         """
         Import metadata into MCF
 
+        By default, metadata is read with precompiled XPath expressions
+        (see `pygeometa.schemas.iso19139.importer`).  Documents with
+        service identification (srv:SV_ServiceIdentification), or when
+        `owslib` is set, are read with OWSLib's `MD_Metadata`, which
+        produces identical results at a higher cost.
+
         :param metadata: string of metadata content
+        :param owslib: whether to read metadata with OWSLib
 
         :returns: `dict` of MCF content
         """
 
+        return self._import_root(get_metadata_input(metadata).xml, owslib)
+
+    def import_records(self, source: Union[IO, str],
+                       owslib: bool = False) -> Iterator[dict]:
+        """
+        Import the records of a multi-record document (e.g. a CSW
+        GetRecords or OAI-PMH ListRecords response) into MCF.  The
+        document is streamed, so that it never has to fit in memory.
+        Records which fail to import are logged and skipped
+
+        :param source: filename or binary file-like object
+        :param owslib: whether to read metadata with OWSLib
+
+        :returns: generator of `dict` of MCF content
+        """
+
+        from pygeometa.schemas.iso19139 import importer
+
+        for count, record in enumerate(importer.iter_records(source)):
+            try:
+                yield self._import_root(record, owslib)
+            except Exception as err:
+                LOGGER.warning(f'Import of record {count} failed: {err}')
+
+    def _import_root(self, root, owslib: bool = False) -> dict:
+        """
+        Import metadata into MCF from a parsed document
+
+        :param root: `lxml.etree._Element` of document root
+        :param owslib: whether to read metadata with OWSLib
+
+        :returns: `dict` of MCF content
+        """
+
+        from pygeometa.schemas.iso19139 import importer
+
+        if not owslib and importer.is_supported(root):
+            LOGGER.debug('Parsing ISO metadata with XPath')
+            return importer.import_(root)
+
+        return self._import_owslib(root)
+
+    def _import_owslib(self, root) -> dict:
+        """
+        Import metadata into MCF using OWSLib
+
+        :param root: `lxml.etree._Element` of document root
+
+        :returns: `dict` of MCF content
+        """
+
+        from owslib.iso import MD_Metadata
+
         mcf = {
             'mcf': {
                 'version': '2.0',
@@ -93,10 +165,7 @@ class ISO19139OutputSchema(BaseOutputSchema):
         }
 
         LOGGER.debug('Parsing ISO metadata')
-        try:
-            m = MD_Metadata(etree.fromstring(metadata))
-        except ValueError:
-            m = MD_Metadata(etree.fromstring(bytes(metadata, 'utf-8')))
+        m = MD_Metadata(root)
 
         LOGGER.debug('Setting metadata')
         mcf['metadata']['identifier'] = m.identifier
@@ -203,7 +272,7 @@ class ISO19139OutputSchema(BaseOutputSchema):
         return mcf
 
 
-def get_contact(contact: CI_ResponsibleParty) -> dict:
+def get_contact(contact: 'CI_ResponsibleParty') -> dict:
     """
     Generates an MCF contact from an OWSLib contact
 
@@ -238,7 +307,7 @@ def get_contact(contact: CI_ResponsibleParty) -> dict:
     return mcf_contact
 
 
-def get_link(link: CI_OnlineResource) -> dict:
+def get_link(link: 'CI_OnlineResource') -> dict:
     """
     Generates an MCF link from an OWSLib distribution URL
 
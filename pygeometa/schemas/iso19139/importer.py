@@ -0,0 +1,618 @@
+# =================================================================
+#
+# Terms and Conditions of Use
+#
+# Unless otherwise noted, computer program source code of this
+# distribution # is covered under Crown Copyright, Government of
+# Canada, and is distributed under the MIT License.
+#
+# The Canada wordmark and related graphics associated with this
+# distribution are protected under trademark law and copyright law.
+# No permission is granted to use them outside the parameters of
+# the Government of Canada's corporate identity program. For
+# more information, see
+# http://www.tbs-sct.gc.ca/fip-pcim/index-eng.asp
+#
+# Copyright title to all 3rd party software distributed with this
+# software is held by the respective copyright holders as noted in
+# those files. Users are asked to read the 3rd Party Licenses
+# referenced with those assets.
+#
+# Copyright (c) 2026 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+# ISO 19139 importer using precompiled XPath expressions, filling only the
+# MCF fields (instead of building OWSLib's full MD_Metadata object model).
+# Results are identical to the OWSLib based importer (see
+# ISO19139OutputSchema.import_), which is used for parity testing and for
+# documents this importer does not model (srv:SV_ServiceIdentification).
+
+import logging
+import math
+from typing import IO, Iterator, Union
+
+from lxml import etree
+
+LOGGER = logging.getLogger(__name__)
+
+NAMESPACES = {
+    'gco': 'http://www.isotc211.org/2005/gco',
+    'gmd': 'http://www.isotc211.org/2005/gmd',
+    'gml': 'http://www.opengis.net/gml',
+    'gml32': 'http://www.opengis.net/gml/3.2',
+    'gmx': 'http://www.isotc211.org/2005/gmx',
+    'srv': 'http://www.isotc211.org/2005/srv'
+}
+
+XLINK_HREF = '{http://www.w3.org/1999/xlink}href'
+
+# root elements of records in multi-record documents
+RECORD_TAGS = [
+    '{http://www.isotc211.org/2005/gmd}MD_Metadata',
+    '{http://www.isotc211.org/2005/gmi}MI_Metadata'
+]
+
+
+def _xpath(path: str) -> etree.XPath:
+    return etree.XPath(path, namespaces=NAMESPACES)
+
+
+# gmd:MD_Metadata
+FILE_IDENTIFIER = _xpath('gmd:fileIdentifier/gco:CharacterString')
+HIERARCHY_LEVEL = _xpath('gmd:hierarchyLevel/gmd:MD_ScopeCode')
+DATESTAMP_DATE = _xpath('gmd:dateStamp/gco:Date')
+DATESTAMP_DATETIME = _xpath('gmd:dateStamp/gco:DateTime')
+LANGUAGE = _xpath('gmd:language/gco:CharacterString')
+LANGUAGE_CODE = _xpath('gmd:language/gmd:LanguageCode')
+IDENTIFICATION = _xpath('gmd:identificationInfo/*[1]')
+ONLINE_RESOURCE = _xpath(
+    '(gmd:distributionInfo/gmd:MD_Distribution)[1]/gmd:transferOptions/'
+    'gmd:MD_DigitalTransferOptions/gmd:onLine/gmd:CI_OnlineResource')
+
+# gmd:MD_DataIdentification
+TITLE = _xpath('gmd:citation/gmd:CI_Citation/gmd:title/gco:CharacterString')
+ABSTRACT = _xpath('gmd:abstract/gco:CharacterString')
+ABSTRACT_ANCHOR = _xpath('gmd:abstract/gmx:Anchor')
+CITATION_DATE = _xpath('gmd:citation/gmd:CI_Citation/gmd:date/gmd:CI_Date')
+DESCRIPTIVE_KEYWORDS = _xpath('gmd:descriptiveKeywords/gmd:MD_Keywords')
+BROWSE_GRAPHIC = _xpath('gmd:graphicOverview/gmd:MD_BrowseGraphic/'
+                        'gmd:fileName/gco:CharacterString')
+TOPIC_CATEGORY = _xpath('gmd:topicCategory/gmd:MD_TopicCategoryCode')
+EXTENT = _xpath('gmd:extent')
+SRV_EXTENT = _xpath('srv:extent')
+DENOMINATOR = _xpath(
+    'gmd:spatialResolution/gmd:MD_Resolution/gmd:equivalentScale/'
+    'gmd:MD_RepresentativeFraction/gmd:denominator/gco:Integer')
+DISTANCE = _xpath(
+    'gmd:spatialResolution/gmd:MD_Resolution/gmd:distance/gco:Distance')
+SPATIAL_REPRESENTATION_TYPE = _xpath(
+    'gmd:spatialRepresentationType/gmd:MD_SpatialRepresentationTypeCode')
+ACCESS_CONSTRAINTS = _xpath(
+    'gmd:resourceConstraints/gmd:MD_LegalConstraints/'
+    'gmd:accessConstraints/gmd:MD_RestrictionCode')
+STATUS = _xpath('gmd:status/gmd:MD_ProgressCode')
+POINT_OF_CONTACT = _xpath('gmd:pointOfContact/gmd:CI_ResponsibleParty')
+
+# gmd:CI_Date
+DATE_DATE = _xpath('gmd:date/gco:Date')
+DATE_DATETIME = _xpath('gmd:date/gco:DateTime')
+DATE_TYPE = _xpath('gmd:dateType/gmd:CI_DateTypeCode')
+
+# gmd:MD_Keywords
+KEYWORD = _xpath('gmd:keyword/gco:CharacterString')
+KEYWORD_ANCHOR = _xpath('gmd:keyword/gmx:Anchor')
+KEYWORD_TYPE = _xpath('gmd:type/gmd:MD_KeywordTypeCode')
+THESAURUS = _xpath('gmd:thesaurusName/gmd:CI_Citation')
+THESAURUS_TITLE = _xpath('gmd:title/gco:CharacterString')
+THESAURUS_TITLE_ANCHOR = _xpath('gmd:title/gmx:Anchor')
+
+# gmd:extent
+GEOGRAPHIC_ELEMENT = _xpath(
+    'gmd:EX_Extent/gmd:geographicElement'
+    '[gmd:EX_GeographicBoundingBox or gmd:EX_BoundingPolygon]')
+BOUNDING_BOX = _xpath('gmd:EX_GeographicBoundingBox')
+BBOX_COORDINATES = [
+    _xpath('gmd:westBoundLongitude/gco:Decimal'),
+    _xpath('gmd:southBoundLatitude/gco:Decimal'),
+    _xpath('gmd:eastBoundLongitude/gco:Decimal'),
+    _xpath('gmd:northBoundLatitude/gco:Decimal')
+]
+TIME_PERIOD = ('gmd:EX_Extent/gmd:temporalElement/gmd:EX_TemporalExtent/'
+               'gmd:extent/{gml}:TimePeriod/{gml}:{position}')
+BEGIN_POSITION = [
+    _xpath(TIME_PERIOD.format(gml=gml, position='beginPosition'))
+    for gml in ['gml', 'gml32']
+]
+END_POSITION = [
+    _xpath(TIME_PERIOD.format(gml=gml, position='endPosition'))
+    for gml in ['gml', 'gml32']
+]
+
+# gmd:CI_ResponsibleParty
+CONTACT = 'gmd:contactInfo/gmd:CI_Contact/'
+ADDRESS = f'{CONTACT}gmd:address/gmd:CI_Address/'
+INDIVIDUAL_NAME = _xpath('gmd:individualName/gco:CharacterString')
+INDIVIDUAL_NAME_ANCHOR = _xpath('gmd:individualName/gmx:Anchor')
+ORGANISATION_NAME = _xpath('gmd:organisationName/gco:CharacterString')
+ORGANISATION_NAME_ANCHOR = _xpath('gmd:organisationName/gmx:Anchor')
+CONTACT_FIELDS = [
+    ('positionname', _xpath('gmd:positionName/gco:CharacterString')),
+    ('phone', _xpath(f'{CONTACT}gmd:phone/gmd:CI_Telephone/gmd:voice/'
+                     'gco:CharacterString')),
+    ('fax', _xpath(f'{CONTACT}gmd:phone/gmd:CI_Telephone/gmd:facsimile/'
+                   'gco:CharacterString')),
+    ('address', _xpath(f'{ADDRESS}gmd:deliveryPoint/gco:CharacterString')),
+    ('city', _xpath(f'{ADDRESS}gmd:city/gco:CharacterString')),
+    ('administrativearea', _xpath(
+        f'{ADDRESS}gmd:administrativeArea/gco:CharacterString')),
+    ('postalcode', _xpath(f'{ADDRESS}gmd:postalCode/gco:CharacterString')),
+    ('country', _xpath(f'{ADDRESS}gmd:country/gco:CharacterString')),
+    ('email', _xpath(
+        f'{ADDRESS}gmd:electronicMailAddress/gco:CharacterString'))
+]
+CONTACT_ONLINE_RESOURCE = _xpath(
+    f'{CONTACT}gmd:onlineResource/gmd:CI_OnlineResource')
+ROLE = _xpath('gmd:role/gmd:CI_RoleCode')
+
+# gmd:CI_OnlineResource
+LINKAGE = _xpath('gmd:linkage/gmd:URL')
+PROTOCOL = _xpath('gmd:protocol/gco:CharacterString')
+PROTOCOL_ANCHOR = _xpath('gmd:protocol/gmx:Anchor')
+NAME = _xpath('gmd:name/gco:CharacterString')
+NAME_ANCHOR = _xpath('gmd:name/gmx:Anchor')
+DESCRIPTION = _xpath('gmd:description/gco:CharacterString')
+FUNCTION = _xpath('gmd:function/gmd:CI_OnLineFunctionCode')
+
+IDENTIFICATION_TYPES = ['MD_DataIdentification', 'MD_ServiceIdentification']
+
+
+def iter_records(source: Union[IO, str]) -> Iterator[etree._Element]:
+    """
+    Stream the records (gmd:MD_Metadata or gmi:MI_Metadata elements) of a
+    multi-record document (e.g. a CSW GetRecords response or an OAI-PMH
+    ListRecords response).  Each record is cleared once the consumer
+    resumes iteration, and processed records (and their siblings, such as
+    OAI-PMH headers) are removed from the tree, so that memory use does not
+    grow with the size of the document
+
+    :param source: filename or binary file-like object
+
+    :returns: generator of `lxml.etree._Element` of records
+    """
+
+    context = etree.iterparse(source, events=('end',), tag=RECORD_TAGS)
+
+    for _, record in context:
+        yield record
+
+        record.clear(keep_tail=True)
+        for element in [record, *record.iterancestors()]:
+            parent = element.getparent()
+            if parent is None:  # document root
+                break
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+def is_supported(root: etree._Element) -> bool:
+    """
+    whether the XPath importer models a document (documents with
+    service identification (srv:SV_ServiceIdentification) are not modelled)
+
+    :param root: `lxml.etree._Element` of document root
+
+    :returns: `bool` of whether document is supported
+    """
+
+    for identification in IDENTIFICATION(root):
+        if _localname(identification) == 'SV_ServiceIdentification':
+            return False
+
+    return True
+
+
+def import_(root: etree._Element) -> dict:
+    """
+    Import ISO 19139 metadata into MCF
+
+    :param root: `lxml.etree._Element` of document root
+
+    :returns: `dict` of MCF content
+    """
+
+    mcf = {
+        'mcf': {
+            'version': '2.0',
+        },
+        'metadata': {
+            'dates': {}
+        },
+        'spatial': {},
+        'identification': {},
+        'contact': {},
+        'distribution': {}
+    }
+
+    identifications = [
+        i for i in IDENTIFICATION(root)
+        if _localname(i) in IDENTIFICATION_TYPES
+    ]
+
+    if not identifications:
+        raise ValueError('No identification information found')
+
+    identification = identifications[0]
+
+    LOGGER.debug('Setting metadata')
+    mcf['metadata']['identifier'] = _text(FILE_IDENTIFIER(root))
+    mcf['metadata']['hierarchylevel'] = _codelist(HIERARCHY_LEVEL(root))
+    mcf['metadata']['dates']['creation'] = (
+        _text(DATESTAMP_DATE(root)) or _text(DATESTAMP_DATETIME(root)))
+
+    LOGGER.debug('Setting language')
+    language = _text(LANGUAGE(root))
+    if language:
+        mcf['metadata']['language'] = language
+    else:
+        language_code = LANGUAGE_CODE(root)
+        if language_code and language_code[0].get('codeListValue'):
+            mcf['metadata']['language'] = language_code[0].get(
+                'codeListValue')
+
+    LOGGER.debug('Setting identification')
+    mcf['identification']['title'] = _text(TITLE(identification))
+    mcf['identification']['abstract'] = _text(ABSTRACT(identification))
+    abstract_anchor = ABSTRACT_ANCHOR(identification)
+    if abstract_anchor:
+        mcf['identification']['abstract'] = _text(abstract_anchor)
+
+    dates = CITATION_DATE(identification)
+    if dates:
+        mcf['identification']['dates'] = {}
+        for date_ in dates:
+            if DATE_DATE(date_):
+                value = _text(DATE_DATE(date_))
+            else:
+                value = _text(DATE_DATETIME(date_))
+            mcf['identification']['dates'][_codelist(DATE_TYPE(date_))] = value
+
+    keywords_sets = DESCRIPTIVE_KEYWORDS(identification)
+    if keywords_sets:
+        mcf['identification']['keywords'] = {}
+        for count, keywords in enumerate(keywords_sets):
+            key = f'keywords-{count}'
+            values = KEYWORD(keywords) or KEYWORD_ANCHOR(keywords)
+            keyword_type = KEYWORD_TYPE(keywords)
+            mcf['identification']['keywords'][key] = {
+                'keywords_type': (keyword_type[0].get('codeListValue')
+                                  if keyword_type else None),
+                'keywords': [_value(k) for k in values]
+            }
+            thesaurus = THESAURUS(keywords)
+            if thesaurus:
+                name = _text(THESAURUS_TITLE(thesaurus[0]))
+                url = None
+                if name is None:
+                    anchor = THESAURUS_TITLE_ANCHOR(thesaurus[0])
+                    if anchor:
+                        name = _value(anchor[0])
+                        url = anchor[0].get(XLINK_HREF)
+                mcf['identification']['keywords'][key]['vocabulary'] = {
+                    'name': name,
+                    'url': url
+                }
+
+    mcf['identification']['browsegraphic'] = next(
+        _values(BROWSE_GRAPHIC(identification)), None)
+    mcf['identification']['topiccategory'] = list(
+        _values(TOPIC_CATEGORY(identification)))
+
+    mcf['identification']['extents'] = {
+        'spatial': [{
+            'bbox': []
+        }],
+        'temporal': []
+    }
+
+    extents = EXTENT(identification) + SRV_EXTENT(identification)
+
+    geographic_element = _first(GEOGRAPHIC_ELEMENT, extents)
+    bbox = None
+    if geographic_element is not None:
+        bbox = next(iter(BOUNDING_BOX(geographic_element)), None)
+    if bbox is not None:
+        try:
+            mcf['identification']['extents']['spatial'][0]['bbox'] = [
+                _number(_text(coordinate(bbox)))
+                for coordinate in BBOX_COORDINATES
+            ]
+        except ValueError as err:
+            LOGGER.info(f'boundingBox empty: {err}')
+    else:
+        LOGGER.info('boundingBox missing')
+
+    begin = _first_of(BEGIN_POSITION, extents)
+    end = _first_of(END_POSITION, extents)
+    mcf['identification']['extents']['temporal'].append({
+        'begin': _value(begin) if begin is not None else None,
+        'end': _value(end) if end is not None else None
+    })
+
+    mcf['spatial']['denominators'] = list(
+        _values(DENOMINATOR(identification)))
+
+    mcf['spatial']['resolution'] = []
+    distances = DISTANCE(identification)
+    uoms = [d.get('uom') for d in distances]
+    for k, value in enumerate(_values(distances)):
+        mcf['spatial']['resolution'].append({
+            'distance': value,
+            'uom': uoms[k] if len(uoms) > k else ''
+        })
+
+    for value in SPATIAL_REPRESENTATION_TYPE(identification):
+        if value.get('codeListValue'):
+            mcf['spatial']['datatype'] = value.get('codeListValue')
+            break
+
+    mcf['identification']['accessconstraints'] = next(
+        (c for c in map(_codelist_value, ACCESS_CONSTRAINTS(identification))
+         if c is not None), '')
+
+    mcf['identification']['status'] = _codelist(STATUS(identification))
+
+    LOGGER.debug('Setting contacts')
+    for identification_ in identifications:
+        for contact in POINT_OF_CONTACT(identification_):
+            mcf['contact'].update(get_contact(contact))
+
+    LOGGER.debug('Setting distribution')
+    for count, link in enumerate(ONLINE_RESOURCE(root)):
+        mcf['distribution'][f'link-{count}'] = get_link(link)
+
+    return mcf
+
+
+def get_contact(contact: etree._Element) -> dict:
+    """
+    Generates an MCF contact from a gmd:CI_ResponsibleParty
+
+    :param contact: `lxml.etree._Element` of gmd:CI_ResponsibleParty
+
+    :returns: dict of MCF contact
+    """
+
+    role = _codelist(ROLE(contact))
+    mcf_contact = {}
+
+    name = _char_or_anchor(INDIVIDUAL_NAME(contact),
+                           INDIVIDUAL_NAME_ANCHOR(contact))
+    if name is not None:
+        mcf_contact['name'] = name
+
+    organization = _char_or_anchor(ORGANISATION_NAME(contact),
+                                   ORGANISATION_NAME_ANCHOR(contact))
+    if organization is not None:
+        mcf_contact['organization'] = organization
+
+    for key, xpath in CONTACT_FIELDS:
+        value = _text(xpath(contact))
+        if value is not None:
+            mcf_contact[key] = value
+
+    online_resource = CONTACT_ONLINE_RESOURCE(contact)
+    if online_resource:
+        mcf_contact['url'] = _text(LINKAGE(online_resource[0]))
+
+    return {role: mcf_contact}
+
+
+def get_link(link: etree._Element) -> dict:
+    """
+    Generates an MCF link from a gmd:CI_OnlineResource
+
+    :param link: `lxml.etree._Element` of gmd:CI_OnlineResource
+
+    :returns: dict of MCF link
+    """
+
+    return {
+        'url': _text(LINKAGE(link)),
+        'type': _char_or_anchor(PROTOCOL(link), PROTOCOL_ANCHOR(link)),
+        'name': _char_or_anchor(NAME(link), NAME_ANCHOR(link)),
+        'description': _text(DESCRIPTION(link)),
+        'function': _codelist(FUNCTION(link))
+    }
+
+
+def _localname(element: etree._Element) -> Union[str, None]:
+    """
+    Helper function to get the local name of an element
+
+    :param element: `lxml.etree._Element`
+
+    :returns: `str` of local name
+    """
+
+    if not isinstance(element.tag, str):  # comment, processing instruction
+        return None
+
+    return etree.QName(element).localname
+
+
+def _value(element: etree._Element) -> Union[str, None]:
+    """
+    Helper function to get the (stripped) text of an element
+
+    :param element: `lxml.etree._Element`
+
+    :returns: `str` of text or `None` if empty
+    """
+
+    if element.text:
+        return element.text.strip()
+
+    return None
+
+
+def _text(elements: list) -> Union[str, None]:
+    """
+    Helper function to get the (stripped) text of the first element
+
+    :param elements: `list` of `lxml.etree._Element`
+
+    :returns: `str` of text or `None` if missing or empty
+    """
+
+    if elements:
+        return _value(elements[0])
+
+    return None
+
+
+def _values(elements: list):
+    """
+    Helper function to iterate over non-empty texts of elements
+
+    :param elements: `list` of `lxml.etree._Element`
+
+    :returns: generator of `str` of texts
+    """
+
+    for element in elements:
+        value = _value(element)
+        if value is not None:
+            yield value
+
+
+def _codelist_value(element: etree._Element) -> Union[str, None]:
+    """
+    Helper function to get a codelist value (@codeListValue, else text)
+
+    :param element: `lxml.etree._Element` of codelist element
+
+    :returns: `str` of codelist value
+    """
+
+    value = element.get('codeListValue')
+    if value is not None:
+        return value.strip()
+
+    return _value(element)
+
+
+def _codelist(elements: list) -> Union[str, None]:
+    """
+    Helper function to get the codelist value of the first element
+
+    :param elements: `list` of `lxml.etree._Element`
+
+    :returns: `str` of codelist value
+    """
+
+    if elements:
+        return _codelist_value(elements[0])
+
+    return None
+
+
+def _char_or_anchor(charstrings: list, anchors: list) -> Union[str, None]:
+    """
+    Helper function to get the text of the first gco:CharacterString,
+    falling back to the first gmx:Anchor
+
+    :param charstrings: `list` of gco:CharacterString elements
+    :param anchors: `list` of gmx:Anchor elements
+
+    :returns: `str` of text
+    """
+
+    value = _text(charstrings)
+
+    if value in [None, ''] and anchors:
+        value = _value(anchors[0])
+
+    return value
+
+
+def _first(xpath: etree.XPath, nodes: list) -> Union[etree._Element, None]:
+    """
+    Helper function to get the first match of an XPath over nodes
+
+    :param xpath: `lxml.etree.XPath` to evaluate
+    :param nodes: `list` of `lxml.etree._Element` context nodes
+
+    :returns: first matching `lxml.etree._Element` or `None`
+    """
+
+    for node in nodes:
+        result = xpath(node)
+        if result:
+            return result[0]
+
+    return None
+
+
+def _first_of(xpaths: list, nodes: list) -> Union[etree._Element, None]:
+    """
+    Helper function to get the first match of alternative XPaths over
+    nodes (trying each alternative per node)
+
+    :param xpaths: `list` of `lxml.etree.XPath` to evaluate
+    :param nodes: `list` of `lxml.etree._Element` context nodes
+
+    :returns: first matching `lxml.etree._Element` or `None`
+    """
+
+    for node in nodes:
+        for xpath in xpaths:
+            result = xpath(node)
+            if result:
+                return result[0]
+
+    return None
+
+
+def _number(value: Union[str, None]) -> Union[int, float]:
+    """
+    Helper function to parse a coordinate as an `int` or `float`
+
+    :param value: `str` of number
+
+    :returns: `int` or `float` of number
+    """
+
+    if value is None:
+        raise ValueError('missing value')
+
+    try:
+        return int(value)
+    except ValueError:
+        number = float(value)
+
+    if not math.isfinite(number):
+        raise ValueError(f'invalid number {value}')
+
+    return number
@@ -53,6 +53,8 @@ THISDIR = os.path.dirname(os.path.realpath(__file__))
 class ISO19139HNAPOutputSchema(BaseOutputSchema):
     """ISO 19139 HNAP output schema"""
 
+    media_type = 'application/xml'
+
     def __init__(self):
         """
         Initialize object
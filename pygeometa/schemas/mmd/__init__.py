@@ -43,11 +43,11 @@
 #
 # =================================================================
 
-import json
 import logging
 import os
 from typing import Union
 
+from pygeometa.helpers import get_metadata_input
 from pygeometa.schemas.base import BaseOutputSchema
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
@@ -69,6 +69,12 @@ KEYWORD_SCHEMES = {
 class MMDOutputSchema(BaseOutputSchema):
     """MMD: record schema"""
 
+    can_read = True
+    reads_metadata_input = True
+    can_write = False
+    media_type = 'application/xml'
+    autodetect_hints = ('mmd:mmd',)
+
     def __init__(self):
         """
         Initialize object
@@ -107,7 +113,7 @@ class MMDOutputSchema(BaseOutputSchema):
             'distribution': {}
         }
 
-        mmd = json.loads(metadata)
+        mmd = get_metadata_input(metadata).json
 
         if mmd is None:
             raise ValueError('No MMD metadata')
@@ -173,13 +179,16 @@ class MMDOutputSchema(BaseOutputSchema):
 
         return mcf
 
-    def write(self, mcf: dict, stringify: str = True) -> Union[dict, str]:
+    def write(self, mcf: dict, stringify: str = True,
+              compact: bool = False) -> Union[dict, str]:
         """
         Write outputschema to JSON string buffer
 
         :param mcf: dict of MCF content model
         :param stringify: whether to return a string representation (default)
                           else native (dict, etree)
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace)
 
         :returns: `dict` or `str` of MCF as MMD
         """
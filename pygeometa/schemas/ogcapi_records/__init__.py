@@ -45,13 +45,15 @@
 
 import logging
 import os
-from typing import Union
+from typing import IO, Iterable, Union
 
 from pygeometa import __version__
 from pygeometa.core import get_charstring
-from pygeometa.helpers import generate_datetime, json_dumps
+from pygeometa.helpers import json_dumps
 from pygeometa.schemas.base import BaseOutputSchema
-from pygeometa.schemas.util import generate_geojson_geometry
+from pygeometa.schemas.util import (deduplicate_contacts,
+                                    generate_geojson_geometry, get_derived,
+                                    write_features)
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
 
@@ -61,6 +63,15 @@ LOGGER = logging.getLogger(__name__)
 class OGCAPIRecordOutputSchema(BaseOutputSchema):
     """OGC API - Records - Part 1: Core record schema"""
 
+    media_type = 'application/geo+json'
+
+    # profile transforms: names of methods, applied in order, which patch a
+    # base OARec record (see generate_record) into the profile's record, as
+    # transform(record, mcf).  Transforms may add or replace top-level and
+    # properties values, but must not modify other values in place, so that
+    # a base record can be shared between profiles
+    transforms = []
+
     def __init__(self):
         """
         Initialize object
@@ -72,29 +83,75 @@ class OGCAPIRecordOutputSchema(BaseOutputSchema):
 
         super().__init__('oarec-record', description, 'json', THISDIR)
 
-    def write(self, mcf: dict, stringify: str = True) -> Union[dict, str]:
+    def write(self, mcf: dict, stringify: str = True,
+              compact: bool = False, record: dict = None) -> Union[dict, str]:
         """
         Write outputschema to JSON string buffer
 
         :param mcf: dict of MCF content model
         :param stringify: whether to return a string representation (default)
                           else native (dict, etree)
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace)
+        :param record: base OARec record of the MCF (from `generate_record`),
+                       to share between profiles (e.g. when writing both
+                       OARec and WCMP2) instead of generating it again
 
 
         :returns: `dict` or `str` of MCF as an OARec record representation
         """
 
-        self.lang1 = mcf['metadata'].get('language')
-        self.lang2 = mcf['metadata'].get('language_alternate')
+        if record is None:
+            record = self.generate_record(mcf)
+        else:
+            record = {**record, 'properties': {**record['properties']}}
+
+        for transform in self.transforms:
+            LOGGER.debug(f'Applying profile transform {transform}')
+            getattr(self, transform)(record, mcf)
+
+        if stringify:
+            return json_dumps(record, compact)
+
+        return record
+
+    def write_collection(self, mcfs: Iterable, fh: IO,
+                         ndjson: bool = False, compact: bool = False) -> int:
+        """
+        Write records of MCFs as a GeoJSON FeatureCollection, or as
+        newline-delimited JSON (one record per line), e.g. to load
+        pygeoapi or pycsw backends.  Records are written one at a time,
+        so that the collection never has to fit in memory (see
+        `write_records`)
+
+        :param mcfs: iterable of MCFs (`dict`s, as from `read_mcf`, or paths
+                     to MCF files/strings)
+        :param fh: text file-like object to write to
+        :param ndjson: whether to write newline-delimited JSON (always
+                       compact) instead of a FeatureCollection
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace)
+
+        :returns: `int` of number of records written
+        """
+
+        return write_features(self.write_records(mcfs), fh, ndjson, compact)
+
+    def generate_record(self, mcf: dict) -> dict:
+        """
+        Generates the base OARec record of an MCF (before profile transforms)
+
+        :param mcf: dict of MCF content model
 
-        geometry = generate_geojson_geometry(
-            mcf['identification']['extents']['spatial'])
+        :returns: `dict` of OARec record
+        """
 
-        title = get_charstring(mcf['identification'].get('title'),
-                               self.lang1, self.lang2)
+        derived = get_derived(mcf)
+        lang1 = derived.lang1
+        lang2 = derived.lang2
 
-        description = get_charstring(mcf['identification'].get('abstract'),
-                                     self.lang1, self.lang2)
+        title = derived.charstring('identification', 'title')
+        description = derived.charstring('identification', 'abstract')
 
         LOGGER.debug('Generating baseline record')
         record = {
@@ -103,7 +160,7 @@ class OGCAPIRecordOutputSchema(BaseOutputSchema):
                 'http://www.opengis.net/spec/ogcapi-records-1/1.0/conf/record-core',  # noqa
             ],
             'type': 'Feature',
-            'geometry': geometry,
+            'geometry': derived.geometry,
             'properties': {
                 'title': title[0],
                 'description': description[0],
@@ -127,9 +184,9 @@ class OGCAPIRecordOutputSchema(BaseOutputSchema):
 
                 record['properties']['externalIds'].append(ai_dict)
 
-        if self.lang1 is not None:
+        if lang1 is not None:
             record['properties']['language'] = {
-                'code': self.lang1
+                'code': lang1
             }
 
         LOGGER.debug('Checking for temporal')
@@ -164,21 +221,20 @@ class OGCAPIRecordOutputSchema(BaseOutputSchema):
 
         LOGGER.debug('Checking for dates')
 
-        for key, value in mcf['metadata']['dates'].items():
+        for key in mcf['metadata']['dates']:
             if key == 'creation':
-                record['properties']['created'] = generate_datetime(value)
+                record['properties']['created'] = derived.date(key)
             elif key == 'revision':
-                record['properties']['updated'] = generate_datetime(value)
+                record['properties']['updated'] = derived.date(key)
 
-        rights = get_charstring(mcf['identification'].get('rights'),
-                                self.lang1, self.lang2)
+        rights = derived.charstring('identification', 'rights')
 
         if rights != [None, None]:
             record['properties']['rights'] = rights[0]
 
         formats = []
         for v in mcf['distribution'].values():
-            format_ = get_charstring(v.get('format'), self.lang1, self.lang2)
+            format_ = get_charstring(v.get('format'), lang1, lang2)
             if format_[0] is not None:
                 formats.append(format_[0])
 
@@ -188,8 +244,9 @@ class OGCAPIRecordOutputSchema(BaseOutputSchema):
             record['properties']['formats'] = [{'name': f} for f in formats2]
 
         LOGGER.debug('Checking for contacts')
-        record['properties']['contacts'] = self.generate_contacts(
-            mcf['contact'])
+        record['properties']['contacts'] = [
+            self.generate_party(c['contact'], lang1, lang2, c['roles'])
+            for c in derived.contacts]
 
         all_keywords = []
 
@@ -198,8 +255,7 @@ class OGCAPIRecordOutputSchema(BaseOutputSchema):
             theme = {'concepts': []}
             scheme = None
 
-            keywords = get_charstring(value.get('keywords'), self.lang1,
-                                      self.lang2)
+            keywords = derived.keywords[key]
 
             if 'vocabulary' in value:
                 if 'url' in value['vocabulary']:
@@ -238,63 +294,77 @@ class OGCAPIRecordOutputSchema(BaseOutputSchema):
                     'title': license.get('name', 'license for this resource'),
                     'url': license['url']
                 }
-                record['links'].append(self.generate_link(license_link))
+                record['links'].append(
+                    self.generate_link(license_link, lang1, lang2))
             else:
                 LOGGER.debug('Encoding license as property')
                 record['properties']['license'] = license['name']
 
         LOGGER.debug('Checking for distribution')
         for value in mcf['distribution'].values():
-            record['links'].append(self.generate_link(value))
+            record['links'].append(self.generate_link(value, lang1, lang2))
 
         record['generated_by'] = f'pygeometa {__version__}'
 
-        if stringify:
-            return json_dumps(record)
-
         return record
 
+    def set_envelope_geometry(self, record: dict, mcf: dict) -> None:
+        """
+        Sets the geometry to the envelope of all spatial extents (a Polygon
+        instead of a MultiPolygon), e.g. for profiles of records with many
+        extents, such as station networks
+
+        :param record: `dict` of OARec record
+        :param mcf: dict of MCF content model
+
+        :returns: None
+        """
+
+        LOGGER.debug('Setting geometry to envelope')
+        record['geometry'] = generate_geojson_geometry(
+            mcf['identification']['extents']['spatial'], envelope=True)
+
     def generate_party(self, contact: dict,
                        lang1: str, lang2: str, roles: list) -> dict:
         """
         generate party construct from MCF contact
 
         :param contact: dict of MCF contact
-        :param self.lang1: primary language
-        :param self.lang2: alternate language
+        :param lang1: primary language
+        :param lang2: alternate language
         :param roles: roles of contact
 
         :returns: MCF contact as a party representation
         """
 
         organization_name = get_charstring(contact.get('organization'),
-                                           self.lang1, self.lang2)
+                                           lang1, lang2)
 
         individual_name = get_charstring(contact.get('individualname'),
-                                         self.lang1, self.lang2)
+                                         lang1, lang2)
 
         position_name = get_charstring(contact.get('positionname'),
-                                       self.lang1, self.lang2)
+                                       lang1, lang2)
 
         hours_of_service = get_charstring(contact.get('hoursofservice'),
-                                          self.lang1, self.lang2)
+                                          lang1, lang2)
 
         contact_instructions = get_charstring(
-            contact.get('contactinstructions'), self.lang1, self.lang2)
+            contact.get('contactinstructions'), lang1, lang2)
 
         address = get_charstring(contact.get('address'),
-                                 self.lang1, self.lang2)
+                                 lang1, lang2)
 
-        city = get_charstring(contact.get('city'), self.lang1, self.lang2)
+        city = get_charstring(contact.get('city'), lang1, lang2)
 
         administrative_area = get_charstring(contact.get('administrativearea'),
-                                             self.lang1, self.lang2)
+                                             lang1, lang2)
 
         postalcode = get_charstring(contact.get('postalcode'),
-                                    self.lang1, self.lang2)
+                                    lang1, lang2)
 
         country = get_charstring(contact.get('country'),
-                                 self.lang1, self.lang2)
+                                 lang1, lang2)
 
         rp = {
             'addresses': [{}],
@@ -337,7 +407,7 @@ class OGCAPIRecordOutputSchema(BaseOutputSchema):
         if rp['addresses'][0] == {}:
             rp.pop('addresses')
 
-        for r in set(roles):
+        for r in dict.fromkeys(roles):  # unique, in order
             rp['roles'].append(r)
 
         if 'url' in contact:
@@ -349,57 +419,38 @@ class OGCAPIRecordOutputSchema(BaseOutputSchema):
 
         return rp
 
-    def generate_contacts(self, contact: dict) -> list:
+    def generate_contacts(self, contact: dict, lang1: str = None,
+                          lang2: str = None) -> list:
         """
         Generates 1..n contacts, streamlining identical
         contacts with multiple roles
 
         :param contact: `dict` of contacts
+        :param lang1: primary language
+        :param lang2: alternate language
 
         :returns: `list` of contacts
         """
 
-        contacts = []
-        contacts2 = []
-
-        for key, value in contact.items():
-            if contacts:
-                for c in contacts:
-                    if value == c['contact']:
-                        LOGGER.debug('Found matching contact; adding role')
-                        c['roles'].append(key)
-                    else:
-                        LOGGER.debug('Adding contact')
-                        contacts.append({
-                            'contact': value,
-                            'roles': [key]
-                        })
-            else:
-                contacts.append({
-                    'contact': value,
-                    'roles': [key]
-                })
-
-        LOGGER.debug(f'Contacts: {contacts}')
-        for c in contacts:
-            contacts2.append(self.generate_party(c['contact'], self.lang1,
-                             self.lang2, c['roles']))
-
-        return contacts2
+        return [self.generate_party(c['contact'], lang1, lang2, c['roles'])
+                for c in deduplicate_contacts(contact)]
 
-    def generate_link(self, distribution: dict) -> dict:
+    def generate_link(self, distribution: dict, lang1: str = None,
+                      lang2: str = None) -> dict:
         """
         Generates OARec link object from MCF distribution object
 
         :param distribution: `dict` of MCF distribution
+        :param lang1: primary language
+        :param lang2: alternate language
 
         :returns: OARec link object
         """
 
         title = get_charstring(distribution.get('title'),
-                               self.lang1, self.lang2)
+                               lang1, lang2)
 
-        name = get_charstring(distribution.get('name'), self.lang1, self.lang2)
+        name = get_charstring(distribution.get('name'), lang1, lang2)
 
         link = {
             'href': distribution['url']
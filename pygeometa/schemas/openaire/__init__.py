@@ -45,12 +45,12 @@
 #
 # =================================================================
 
-import json
 import logging
 import os
 import uuid
 from typing import Union
 
+from pygeometa.helpers import get_metadata_input
 from pygeometa.schemas.base import BaseOutputSchema
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
@@ -61,6 +61,13 @@ LOGGER = logging.getLogger(__name__)
 class OpenAIREOutputSchema(BaseOutputSchema):
     """OpenAIRE: record schema"""
 
+    can_read = True
+    reads_metadata_input = True
+    can_write = False
+    media_type = 'application/json'
+    autodetect_hints = ('header', 'results', 'mainTitle', 'originalIds',
+                        'pids', 'instances')
+
     def __init__(self):
         """
         Initialize object
@@ -93,7 +100,7 @@ class OpenAIREOutputSchema(BaseOutputSchema):
             'contact': {}
         }
 
-        md = json.loads(metadata)
+        md = get_metadata_input(metadata).json
 
         if md is None:
             raise ValueError('No openaire metadata')
@@ -226,13 +233,16 @@ class OpenAIREOutputSchema(BaseOutputSchema):
 
         return mcf
 
-    def write(self, mcf: dict, stringify: str = True) -> Union[dict, str]:
+    def write(self, mcf: dict, stringify: str = True,
+              compact: bool = False) -> Union[dict, str]:
         """
         Write outputschema to JSON string buffer
 
         :param mcf: dict of MCF content model
         :param stringify: whether to return a string representation (default)
                           else native (dict, etree)
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace)
 
         :returns: `dict` or `str` of MCF as Schema.org
         """
@@ -43,14 +43,14 @@
 #
 # =================================================================
 
-import json
 import logging
 import os
 from typing import Union
 
 from pygeometa.core import get_charstring
-from pygeometa.helpers import generate_datetime, json_dumps
+from pygeometa.helpers import get_metadata_input, json_dumps
 from pygeometa.schemas.base import BaseOutputSchema
+from pygeometa.schemas.util import get_derived
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
 
@@ -85,6 +85,11 @@ TYPES = {
 class SchemaOrgOutputSchema(BaseOutputSchema):
     """Schema.org schema"""
 
+    can_read = True
+    reads_metadata_input = True
+    media_type = 'application/ld+json'
+    autodetect_hints = ('@context', '@graph', '@type')
+
     def __init__(self):
         """
         Initialize object
@@ -105,7 +110,7 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
         :returns: `dict` of MCF content
         """
 
-        md = json.loads(metadata)
+        md = get_metadata_input(metadata).json
 
         mcf = {
             'mcf': {
@@ -212,9 +217,10 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
             }
 
         if 'distribution' in md:
-            if isinstance(md['distribution'], dict):
-                md['distribution'] = [md['distribution']]
-            for dist in md['distribution']:
+            distributions = md['distribution']
+            if isinstance(distributions, dict):
+                distributions = [distributions]
+            for dist in distributions:
                 if 'contentUrl' in dist:
                     mcf['distribution'][f"{dist['contentUrl']}#{dist.get('name', '')}"] = {  # noqa
                         'name': dist.get('name'),
@@ -264,28 +270,29 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
 
         return mcf
 
-    def write(self, mcf: dict, stringify: str = True) -> Union[dict, str]:
+    def write(self, mcf: dict, stringify: str = True,
+              compact: bool = False) -> Union[dict, str]:
         """
         Write outputschema to JSON string buffer
 
         :param mcf: dict of MCF content model
         :param stringify: whether to return a string representation (default)
                           else native (dict, etree)
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace)
 
         :returns: `dict` or `str` of MCF as Schema.org
         """
 
-        self.lang1 = mcf['metadata'].get('language')
-        self.lang2 = mcf['metadata'].get('language_alternate')
+        derived = get_derived(mcf)
+        lang1 = derived.lang1
+        lang2 = derived.lang2
 
         minx, miny, maxx, maxy = (mcf['identification']['extents']
                                   ['spatial'][0]['bbox'])
 
-        title = get_charstring(mcf['identification'].get('title'),
-                               self.lang1, self.lang2)
-
-        description = get_charstring(mcf['identification'].get('abstract'),
-                                     self.lang1, self.lang2)
+        title = derived.charstring('identification', 'title')
+        description = derived.charstring('identification', 'abstract')
 
         LOGGER.debug('Generating baseline record')
         record = {
@@ -304,8 +311,8 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
             'distribution': []
         }
 
-        if self.lang1 is not None:
-            record['inLanguage'] = self.lang1
+        if lang1 is not None:
+            record['inLanguage'] = lang1
 
         LOGGER.debug('Checking for temporal')
         try:
@@ -338,18 +345,19 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
 
         LOGGER.debug('Checking for dates')
 
-        for key, value in mcf['metadata']['dates'].items():
+        for key in mcf['metadata']['dates']:
             if key == 'creation':
-                record['dateCreated'] = generate_datetime(value)
+                record['dateCreated'] = derived.date(key)
             elif key == 'revision':
-                record['dateModified'] = generate_datetime(value)
+                record['dateModified'] = derived.date(key)
             elif key == 'publication':
-                record['datePublished'] = generate_datetime(value)
+                record['datePublished'] = derived.date(key)
 
         LOGGER.debug('Checking for contacts')
 
         for ct in CONTACTS:
-            contacts = self.generate_contacts(mcf['contact'], ct)
+            contacts = self.generate_contacts(mcf['contact'], ct, lang1,
+                                              lang2)
             if contacts and len(contacts) > 0:
                 record[ct] = contacts
 
@@ -360,8 +368,7 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
             theme = {'concepts': []}
             scheme = None
 
-            keywords = get_charstring(value.get('keywords'), self.lang1,
-                                      self.lang2)
+            keywords = derived.keywords[key]
 
             if 'vocabulary' in value:
                 if 'url' in value['vocabulary']:
@@ -396,7 +403,8 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
 
         LOGGER.debug('Checking for distribution')
         for value in mcf['distribution'].values():
-            record['distribution'].append(self.generate_link(value))
+            record['distribution'].append(
+                self.generate_link(value, lang1, lang2))
 
         LOGGER.debug('Checking for content_info')
         if mcf.get('content_info', {}):
@@ -407,7 +415,7 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
                 record['variableMeasured'] = self.generate_variables(ci['dimensions']) # noqa
 
         if stringify:
-            return json_dumps(record)
+            return json_dumps(record, compact)
 
         return record
 
@@ -417,35 +425,35 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
         generate party construct from MCF contact
 
         :param contact: dict of MCF contact
-        :param self.lang1: primary language
-        :param self.lang2: alternate language
+        :param lang1: primary language
+        :param lang2: alternate language
 
 
         :returns: MCF contact as a party representation
         """
 
         organization_name = get_charstring(contact.get('organization'),
-                                           self.lang1, self.lang2)
+                                           lang1, lang2)
 
         individual_name = get_charstring(contact.get('individualname'),
-                                         self.lang1, self.lang2)
+                                         lang1, lang2)
 
         position_name = get_charstring(contact.get('positionname'),
-                                       self.lang1, self.lang2)
+                                       lang1, lang2)
 
         address = get_charstring(contact.get('address'),
-                                 self.lang1, self.lang2)
+                                 lang1, lang2)
 
-        city = get_charstring(contact.get('city'), self.lang1, self.lang2)
+        city = get_charstring(contact.get('city'), lang1, lang2)
 
         administrative_area = get_charstring(contact.get('administrativearea'),
-                                             self.lang1, self.lang2)
+                                             lang1, lang2)
 
         postalcode = get_charstring(contact.get('postalcode'),
-                                    self.lang1, self.lang2)
+                                    lang1, lang2)
 
         country = get_charstring(contact.get('country'),
-                                 self.lang1, self.lang2)
+                                 lang1, lang2)
 
         rp = {
             'roles': []
@@ -517,13 +525,16 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
 
         return dict2
 
-    def generate_contacts(self, contact: dict, role: str) -> list:
+    def generate_contacts(self, contact: dict, role: str, lang1: str = None,
+                          lang2: str = None) -> list:
         """
         Generates 1..n contacts, streamlining identical
         contacts with multiple roles
 
         :param contact: `dict` of contacts
         :param role: `str` of role
+        :param lang1: primary language
+        :param lang2: alternate language
 
         :returns: `list` of contacts
         """
@@ -549,24 +560,27 @@ class SchemaOrgOutputSchema(BaseOutputSchema):
             if any([value.get('role', key) == role,
                     value.get('role', key) in role_mcf_schema_map[role]]):
                 contacts.append(
-                    self.generate_party(value, self.lang1, self.lang2))
+                    self.generate_party(value, lang1, lang2))
 
         return contacts
 
-    def generate_link(self, distribution: dict) -> dict:
+    def generate_link(self, distribution: dict, lang1: str = None,
+                      lang2: str = None) -> dict:
         """
         Generates Schema.org link object from MCF distribution object
 
         :param distribution: `dict` of MCF distribution
+        :param lang1: primary language
+        :param lang2: alternate language
 
         :returns: Schema.org link object
         """
 
         name = get_charstring(distribution.get('name'),
-                              self.lang1, self.lang2)
+                              lang1, lang2)
 
         desc = get_charstring(distribution.get('description'),
-                              self.lang1, self.lang2)
+                              lang1, lang2)
 
         link = {
             '@type': 'schema:DataDownload',
@@ -43,20 +43,30 @@
 #
 # =================================================================
 
+from functools import partial
+from itertools import islice
+import logging
 import os
-from typing import Union
+from typing import IO, Iterable, Union
 
-from pygeometa.core import get_charstring
-from pygeometa.helpers import json_dumps
+from pygeometa.core import get_charstring, get_mcf_files, read_mcf
+from pygeometa.helpers import get_filename, json_dumps
 from pygeometa.schemas.base import BaseOutputSchema
-from pygeometa.schemas.util import generate_geojson_geometry
+from pygeometa.schemas.util import get_derived, get_envelope, write_features
+
+LOGGER = logging.getLogger(__name__)
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
 
+# STAC version of items, catalogs and collections
+STAC_VERSION = '1.0.0'
+
 
 class STACItemOutputSchema(BaseOutputSchema):
     """STAC Item output schema"""
 
+    media_type = 'application/geo+json'
+
     def __init__(self):
         """
         Initialize object
@@ -68,50 +78,52 @@ class STACItemOutputSchema(BaseOutputSchema):
 
         super().__init__('stac-item', description, 'json', THISDIR)
 
-    def write(self, mcf: dict, stringify: str = True) -> Union[dict, str]:
+    def write(self, mcf: dict, stringify: str = True,
+              compact: bool = False) -> Union[dict, str]:
         """
         Write MCF to STAC Item
 
         :param mcf: dict of MCF content model
         :param stringify: whether to return a string representation (default)
                           else native (dict, etree)
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace)
 
         :returns: `dict` or `str` of MCF as a STAC item
         """
 
-        lang1 = mcf['metadata'].get('language')
-        lang2 = mcf['metadata'].get('language_alternate')
-
-        geometry = generate_geojson_geometry(
-            mcf['identification']['extents']['spatial'])
+        derived = get_derived(mcf)
+        lang1 = derived.lang1
+        lang2 = derived.lang2
 
-        bbox = mcf['identification']['extents']['spatial'][0]['bbox']
-
-        title = get_charstring(mcf['identification'].get('title'),
-                               lang1, lang2)
-        description = get_charstring(mcf['identification'].get('abstract'),
-                                     lang1, lang2)
+        title = derived.charstring('identification', 'title')
+        description = derived.charstring('identification', 'abstract')
 
         stac_item = {
-            'stac-version': '1.0.0-beta.2',
+            'stac_version': STAC_VERSION,
             'id': mcf['metadata']['identifier'],
             'type': 'Feature',
-            'bbox': bbox,
-            'geometry': geometry,
+            'bbox': derived.envelope,
+            'geometry': derived.geometry,
             'properties': {
                 'title': title[0],
                 'description': description[0],
+                'datetime': None,
                 'providers': []
             },
-            'links': []
+            'links': [],
+            'assets': {}
         }
 
+        # datetime is required, and null only with a start/end interval
         if 'temporal' in mcf['identification']['extents']:
             begin = mcf['identification']['extents']['temporal'][0]['begin']
             end = mcf['identification']['extents']['temporal'][0]['end']
 
             stac_item['properties']['start_datetime'] = begin
             stac_item['properties']['end_datetime'] = end
+        elif 'creation' in mcf['metadata']['dates']:
+            stac_item['properties']['datetime'] = derived.date('creation')
 
         if 'creation' in mcf['metadata']['dates']:
             stac_item['properties']['created'] = mcf['metadata']['dates']['creation']  # noqa
@@ -132,6 +144,206 @@ class STACItemOutputSchema(BaseOutputSchema):
             stac_item['links'].append(link)
 
         if stringify:
-            return json_dumps(stac_item)
+            return json_dumps(stac_item, compact)
 
         return stac_item
+
+    def write_item_collection(self, mcfs: Iterable, fh: IO,
+                              compact: bool = False) -> int:
+        """
+        Write STAC items of MCFs as an ItemCollection, one at a time, so
+        that the collection never has to fit in memory (see
+        `write_records`)
+
+        :param mcfs: iterable of MCFs (`dict`s, as from `read_mcf`, or paths
+                     to MCF files/strings)
+        :param fh: text file-like object to write to
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace)
+
+        :returns: `int` of number of items written
+        """
+
+        return write_features(self.write_records(mcfs), fh, compact=compact)
+
+    def write_catalog(self, mcfs: Union[Iterable, str], directory: str,
+                      collection_id: str = 'collection',
+                      description: str = 'STAC catalog generated by pygeometa',
+                      workers: int = 1, compact: bool = False) -> int:
+        """
+        Write a static STAC catalog of MCFs: a root catalog
+        (`catalog.json`) of a collection (`<collection_id>/collection.json`)
+        of their items (`<collection_id>/<item id>/<item id>.json`).  Each
+        item is written to disk as soon as it is generated (in processes,
+        with `workers` > 1), keeping only its id and extents for the
+        collection.
+        MCFs which fail to write are logged and skipped, as are MCFs whose
+        item id (directory name) is already used by a previous item
+
+        :param mcfs: iterable of MCFs (`dict`s, as from `read_mcf`, or paths
+                     to MCF files/strings), or directory of MCF files (*.yml,
+                     *.yaml)
+        :param directory: directory to write the catalog to
+        :param collection_id: identifier of the collection
+        :param description: description of the catalog and collection
+        :param workers: number of processes to generate items with
+        :param compact: whether to serialize JSON compactly (without
+                        indentation or whitespace)
+
+        :returns: `int` of number of items written
+        """
+
+        if isinstance(mcfs, (str, os.PathLike)):
+            LOGGER.debug(f'Reading MCFs of directory {mcfs}')
+            mcfs = get_mcf_files([mcfs])
+
+        collection_dir = os.path.join(directory, collection_id)
+        os.makedirs(collection_dir, exist_ok=True)
+
+        generate_item = partial(_generate_catalog_item, self, collection_id,
+                                compact)
+
+        items = {}  # dict keys: unique, in order
+        bbox = None
+        interval = [None, None]
+
+        def add_item(result: Union[tuple, None]) -> None:
+            nonlocal bbox
+
+            if result is None:
+                return
+
+            count, name, content, item_bbox, begin, end = result
+            if name in items:
+                LOGGER.warning(f'Writing item {count} failed: item {name} '
+                               'already written')
+                return
+            items[name] = None
+
+            os.makedirs(os.path.join(collection_dir, name), exist_ok=True)
+            with open(os.path.join(collection_dir, name, f'{name}.json'), 'w',
+                      encoding='utf-8') as fh:
+                fh.write(content)
+
+            if item_bbox:
+                bbox = get_envelope([b for b in [bbox, item_bbox] if b])
+
+            if begin not in [None, 'None', 'now']:
+                if interval[0] is None or str(begin) < interval[0]:
+                    interval[0] = str(begin)
+            if end not in [None, 'None', 'now']:
+                if interval[1] is None or str(end) > interval[1]:
+                    interval[1] = str(end)
+
+        mcfs = enumerate(mcfs)
+
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # in chunks, so that MCFs are not all read ahead
+                while chunk := list(islice(mcfs, workers * 16)):
+                    for result in executor.map(generate_item, *zip(*chunk)):
+                        add_item(result)
+        else:
+            for count, mcf in mcfs:
+                add_item(generate_item(count, mcf))
+
+        LOGGER.debug(f'Wrote {len(items)} items')
+
+        collection = {
+            'type': 'Collection',
+            'stac_version': STAC_VERSION,
+            'id': collection_id,
+            'description': description,
+            'license': 'other',
+            'extent': {
+                'spatial': {
+                    'bbox': [bbox or [-180, -90, 180, 90]]
+                },
+                'temporal': {
+                    'interval': [interval]
+                }
+            },
+            'links': [
+                _link('root', '../catalog.json'),
+                _link('parent', '../catalog.json')
+            ] + [_link('item', f'./{name}/{name}.json', 'application/geo+json')
+                 for name in items]
+        }
+
+        catalog = {
+            'type': 'Catalog',
+            'stac_version': STAC_VERSION,
+            'id': 'catalog',
+            'description': description,
+            'links': [
+                _link('root', './catalog.json'),
+                _link('child', f'./{collection_id}/collection.json')
+            ]
+        }
+
+        with open(os.path.join(collection_dir, 'collection.json'), 'w',
+                  encoding='utf-8') as fh:
+            fh.write(json_dumps(collection, compact))
+
+        with open(os.path.join(directory, 'catalog.json'), 'w',
+                  encoding='utf-8') as fh:
+            fh.write(json_dumps(catalog, compact))
+
+        return len(items)
+
+
+def _generate_catalog_item(schema: STACItemOutputSchema, collection_id: str,
+                           compact: bool, count: int,
+                           mcf: Union[dict, str]) -> Union[tuple, None]:
+    """
+    Helper function to generate the STAC item of an MCF for a catalog
+    (see `STACItemOutputSchema.write_catalog`, which writes it, so that
+    items with the same id never overwrite each other)
+
+    :param schema: `STACItemOutputSchema` object
+    :param collection_id: identifier of collection
+    :param compact: whether to serialize JSON compactly
+    :param count: position of MCF (for logging)
+    :param mcf: `dict` of MCF or path to MCF file/string
+
+    :returns: `tuple` of position of MCF, item directory name, serialized
+              item, bbox, start and end datetime, or `None` if the MCF
+              failed to write
+    """
+
+    try:
+        if not isinstance(mcf, dict):
+            mcf = read_mcf(mcf)
+        item = schema.write(mcf, stringify=False)
+    except Exception as err:
+        LOGGER.warning(f'Writing item {count} failed: {err}')
+        return None
+
+    name = get_filename(item['id'])
+
+    item['collection'] = collection_id
+    item['links'] = item['links'] + [
+        _link('root', '../../catalog.json'),
+        _link('parent', '../collection.json'),
+        _link('collection', '../collection.json')
+    ]
+
+    return (count, name, json_dumps(item, compact), item['bbox'],
+            item['properties'].get('start_datetime'),
+            item['properties'].get('end_datetime'))
+
+
+def _link(rel: str, href: str, type_: str = 'application/json') -> dict:
+    """
+    Helper function to generate a STAC link
+
+    :param rel: link relation
+    :param href: link target
+    :param type_: media type of link target
+
+    :returns: `dict` of STAC link
+    """
+
+    return {'rel': rel, 'href': href, 'type': type_}
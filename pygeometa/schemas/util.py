@@ -43,63 +43,353 @@
 #
 # =================================================================
 
+from contextlib import contextmanager
+from functools import cached_property
 import logging
+import threading
+from typing import Any, IO, Iterable, Iterator, Union
+
+from pygeometa.core import get_charstring
+from pygeometa.helpers import (freeze, FrozenDict, generate_datetime,
+                               get_hashable, json_dumps)
 
 LOGGER = logging.getLogger(__name__)
 
+# derived values shared by identity of (mutable) MCF (see share_derived)
+_SHARED_DERIVED = {}
+_SHARED_DERIVED_LOCK = threading.Lock()
+
 
-def generate_geojson_geometry(spatial: list) -> dict:
+class DerivedMCF:
     """
-    Helper function to generate GeoJSON geometry from an
-    MCF spatial extent
+    Values derived from an MCF which are common to several writers
+    (resolved charstrings, RFC3339 dates, GeoJSON geometry and envelope,
+    and deduplicated contacts), each computed on first use.  See `get_derived`.
 
-    :param spatial: `list` of spatial extents defined
+    Like the MCF, derived values may be shared between writers, and
+    must not be modified: those of a read-only MCF (see `get_derived`) are
+    read-only too
+    """
 
-    :returns: `dict` of GeoJSON geometry
+    def __init__(self, mcf: dict):
+        """
+        Initialize object
+
+        :param mcf: dict of MCF content model
+
+        :returns: `pygeometa.schemas.util.DerivedMCF`
+        """
+
+        self.mcf = mcf
+        self._freeze = freeze if isinstance(mcf, FrozenDict) else _identity
+        self.lang1 = mcf.get('metadata', {}).get('language')
+        self.lang2 = mcf.get('metadata', {}).get('language_alternate')
+
+        self._charstrings = {}
+        self._dates = {}
+
+    def charstring(self, section: str, key: str) -> list:
+        """
+        Resolve a charstring of an MCF section
+
+        :param section: MCF section (e.g. `identification`)
+        :param key: key of the section (e.g. `title`)
+
+        :returns: `list` of charstring in primary and alternate language
+        """
+
+        if (section, key) not in self._charstrings:
+            self._charstrings[(section, key)] = self._freeze(get_charstring(
+                self.mcf[section].get(key), self.lang1, self.lang2))
+
+        return self._charstrings[(section, key)]
+
+    def date(self, key: str) -> str:
+        """
+        Resolve an MCF metadata date as an RFC3339 date-time
+
+        :param key: date type (e.g. `creation`, `revision`)
+
+        :returns: `str` of date-time value
+        """
+
+        if key not in self._dates:
+            self._dates[key] = generate_datetime(
+                self.mcf['metadata']['dates'][key])
+
+        return self._dates[key]
+
+    @cached_property
+    def keywords(self) -> dict:
+        """keywords of each MCF keyword set, in primary and alternate
+        language"""
+
+        return self._freeze({
+            key: get_charstring(value.get('keywords'), self.lang1, self.lang2)
+            for key, value in self.mcf['identification']['keywords'].items()
+        })
+
+    @cached_property
+    def geometry(self) -> dict:
+        """GeoJSON geometry of the MCF spatial extents"""
+
+        return self._freeze(generate_geojson_geometry(
+            self.mcf['identification']['extents']['spatial']))
+
+    @cached_property
+    def envelope(self) -> Union[list, None]:
+        """envelope bbox of the MCF spatial extents"""
+
+        return self._freeze(get_envelope(
+            get_bboxes(self.mcf['identification']['extents']['spatial'])))
+
+    @cached_property
+    def contacts(self) -> list:
+        """deduplicated MCF contacts (see `deduplicate_contacts`)"""
+
+        return self._freeze(deduplicate_contacts(self.mcf['contact']))
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def get_derived(mcf: dict) -> DerivedMCF:
+    """
+    Helper function to get the derived values of an MCF.  The derived
+    values of a read-only MCF (see `pygeometa.helpers.freeze`) are cached
+    on it, so that all writers of the same MCF share them, and are
+    read-only as well.  Those of a mutable MCF are shared while it is
+    being generated (see `share_derived`), and derived per call otherwise
+
+    :param mcf: dict of MCF content model
+
+    :returns: `pygeometa.schemas.util.DerivedMCF`
     """
 
-    geometry = None
+    if not isinstance(mcf, FrozenDict):
+        shared = _SHARED_DERIVED.get(id(mcf))
+        if shared is not None and shared[0] is mcf:
+            return shared[1]
+        return DerivedMCF(mcf)
 
-    crs_list = [s.get('crs') for s in spatial]
+    derived = getattr(mcf, '_derived', None)
 
-    if len(crs_list) == len(spatial):
-        single_crs = len(set(crs_list)) == 1
+    if derived is None:
+        LOGGER.debug('Deriving values of read-only MCF')
+        derived = mcf._derived = DerivedMCF(mcf)
 
-    if not single_crs:
-        LOGGER.debug('spatial extent has multiple CRS; using first bbox')
-        try:
-            minx, miny, maxx, maxy = spatial[0]['bbox']
-            geometry = {
-                'type': 'Polygon',
-                'coordinates': [[
-                    [minx, miny],
-                    [minx, maxy],
-                    [maxx, maxy],
-                    [maxx, miny],
-                    [minx, miny]
-                ]]
+    return derived
+
+
+@contextmanager
+def share_derived(mcf: dict) -> Iterator[DerivedMCF]:
+    """
+    Context manager sharing the derived values of an MCF between all
+    writers of it (e.g. in threads) within its block, without freezing it
+    (see `get_derived`).  The MCF must not be modified within the block
+
+    :param mcf: dict of MCF content model
+
+    :returns: `pygeometa.schemas.util.DerivedMCF` of the MCF
+    """
+
+    derived = get_derived(mcf)
+
+    if isinstance(mcf, FrozenDict):  # already shared
+        yield derived
+        return
+
+    key = id(mcf)
+
+    with _SHARED_DERIVED_LOCK:
+        previous = _SHARED_DERIVED.get(key)
+        _SHARED_DERIVED[key] = (mcf, derived)
+
+    try:
+        yield derived
+    finally:
+        with _SHARED_DERIVED_LOCK:
+            if previous is None:
+                _SHARED_DERIVED.pop(key, None)
+            else:
+                _SHARED_DERIVED[key] = previous
+
+
+def deduplicate_contacts(contact: dict) -> list:
+    """
+    Helper function to streamline identical MCF contacts with
+    multiple roles
+
+    :param contact: `dict` of MCF contacts
+
+    :returns: `list` of `dict`s of contact and roles
+    """
+
+    contacts = {}
+
+    for key, value in contact.items():
+        # identical contacts share the same (order insensitive) index key
+        index_key = get_hashable(value)
+        if index_key in contacts:
+            LOGGER.debug('Found matching contact; adding role')
+            contacts[index_key]['roles'].append(key)
+        else:
+            LOGGER.debug('Adding contact')
+            contacts[index_key] = {
+                'contact': value,
+                'roles': [key]
             }
-        except TypeError:
-            geometry = None
-    else:
-        LOGGER.debug('spatial extent is a multiple bbox with same CRS')
-        bboxes = []
+
+    LOGGER.debug(f'Contacts: {contacts}')
+
+    return list(contacts.values())
+
+
+def get_bboxes(spatial: list) -> list:
+    """
+    Helper function to get the (unique) bboxes of an MCF spatial extent
+    which can be represented together: all bboxes if they share the same
+    CRS, else only the first one.  Empty or invalid bboxes are skipped
+
+    :param spatial: `list` of spatial extents defined
+
+    :returns: `list` of `tuple`s of bboxes (minx, miny, maxx, maxy)
+    """
+
+    if len({s.get('crs') for s in spatial}) > 1:
+        LOGGER.debug('spatial extent has multiple CRS; using first bbox')
+        spatial = spatial[:1]
+
+    # dict keys: unique, in order
+    try:
+        bboxes = dict.fromkeys([(minx, miny, maxx, maxy) for
+                                minx, miny, maxx, maxy in
+                                (s['bbox'] for s in spatial)])
+    except (KeyError, TypeError, ValueError):
+        bboxes = {}
         for s in spatial:
             try:
-                minx, miny, maxx, maxy = (s['bbox'])
-                bboxes.append([[
-                        [minx, miny],
-                        [minx, maxy],
-                        [maxx, maxy],
-                        [maxx, miny],
-                        [minx, miny]
-                    ]])
-            except TypeError:
+                minx, miny, maxx, maxy = s['bbox']
+            except (KeyError, TypeError, ValueError):
                 LOGGER.debug('bbox failed')
+                continue
+
+            bboxes[(minx, miny, maxx, maxy)] = None
+
+    return list(bboxes)
+
+
+def get_envelope(bboxes: list) -> Union[list, None]:
+    """
+    Helper function to get the envelope of bboxes
+
+    :param bboxes: `list` of bboxes (minx, miny, maxx, maxy)
+
+    :returns: `list` of envelope bbox (minx, miny, maxx, maxy) or `None`
+              if there are no bboxes
+    """
+
+    if not bboxes:
+        return None
+    elif len(bboxes) == 1:
+        return list(bboxes[0])
+
+    minx, miny, maxx, maxy = zip(*bboxes)
+
+    return [min(minx), min(miny), max(maxx), max(maxy)]
+
 
-        geometry = {
-            'type': 'MultiPolygon',
-            'coordinates': bboxes
+def generate_geojson_geometry(spatial: list,
+                              envelope: bool = False) -> Union[dict, None]:
+    """
+    Helper function to generate GeoJSON geometry from an
+    MCF spatial extent
+
+    :param spatial: `list` of spatial extents defined
+    :param envelope: whether to generate a single Polygon of the envelope
+                     of all bboxes (e.g. for extents of many stations)
+                     instead of a MultiPolygon
+
+    :returns: `dict` of GeoJSON geometry
+    """
+
+    single_crs = len({s.get('crs') for s in spatial}) == 1
+
+    bboxes = get_bboxes(spatial if single_crs else spatial[:1])
+
+    if envelope or not single_crs:
+        bbox = get_envelope(bboxes)
+        if bbox is None:
+            return None
+
+        minx, miny, maxx, maxy = bbox
+        return {
+            'type': 'Polygon',
+            'coordinates': [[
+                [minx, miny],
+                [minx, maxy],
+                [maxx, maxy],
+                [maxx, miny],
+                [minx, miny]
+            ]]
         }
 
-    return geometry
+    LOGGER.debug('spatial extent is a multiple bbox with same CRS')
+    return {
+        'type': 'MultiPolygon',
+        'coordinates': [[[
+            [minx, miny],
+            [minx, maxy],
+            [maxx, maxy],
+            [maxx, miny],
+            [minx, miny]
+        ]] for minx, miny, maxx, maxy in bboxes]
+    }
+
+
+def write_features(features: Iterable, fh: IO, ndjson: bool = False,
+                   compact: bool = False) -> int:
+    """
+    Helper function to write GeoJSON features (e.g. OARec records or STAC
+    items) one at a time, as a FeatureCollection or as newline-delimited
+    JSON, so that they never have to fit in memory together
+
+    :param features: iterable of `dict`s of GeoJSON features
+    :param fh: text file-like object to write to
+    :param ndjson: whether to write newline-delimited JSON (always
+                   compact) instead of a FeatureCollection
+    :param compact: whether to serialize JSON compactly (without
+                    indentation or whitespace)
+
+    :returns: `int` of number of features written
+    """
+
+    count = 0
+
+    if ndjson:
+        compact = True
+    elif compact:
+        fh.write('{"type":"FeatureCollection","features":[')
+    else:
+        fh.write('{\n"type": "FeatureCollection",\n"features": [\n')
+
+    for feature in features:
+        if ndjson:
+            fh.write(json_dumps(feature, True))
+            fh.write('\n')
+        else:
+            if count > 0:
+                fh.write(',' if compact else ',\n')
+            fh.write(json_dumps(feature, compact))
+
+        count += 1
+
+    if compact and not ndjson:
+        fh.write(f'],"numberReturned":{count}}}')
+    elif not ndjson:
+        fh.write(f'\n],\n"numberReturned": {count}\n}}\n')
+
+    LOGGER.debug(f'Wrote {count} features')
+
+    return count
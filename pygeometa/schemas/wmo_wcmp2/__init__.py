@@ -46,9 +46,7 @@
 from datetime import datetime
 import logging
 import os
-from typing import Union
 
-from pygeometa.helpers import json_dumps
 from pygeometa.schemas.ogcapi_records import OGCAPIRecordOutputSchema
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
@@ -59,6 +57,14 @@ LOGGER = logging.getLogger(__name__)
 class WMOWCMP2OutputSchema(OGCAPIRecordOutputSchema):
     """OGC API - Records - Part 1: Core record schema"""
 
+    transforms = [
+        'set_conformance',
+        'set_version',
+        'set_links',
+        'set_data_policy',
+        'set_created'
+    ]
+
     def __init__(self):
         """
         Initialize object
@@ -72,32 +78,58 @@ class WMOWCMP2OutputSchema(OGCAPIRecordOutputSchema):
 
         self.description = description
 
-    def write(self, mcf: dict, stringify: str = True) -> Union[dict, str]:
+    def set_conformance(self, record: dict, mcf: dict) -> None:
         """
-        Write outputschema to JSON string buffer
+        Sets WCMP2 conformance
 
+        :param record: `dict` of OARec record
         :param mcf: dict of MCF content model
-        :param stringify: whether to return a string representation (default)
-                          else native (dict, etree)
-
 
-        :returns: `dict` or `str` of MCF as an OARec record representation
+        :returns: None
         """
 
-        record = super().write(mcf, stringify=False)
-
         LOGGER.debug('Setting WCMP2 conformance')
         record['conformsTo'] = ['http://wis.wmo.int/spec/wcmp/2/conf/core']
 
+    def set_version(self, record: dict, mcf: dict) -> None:
+        """
+        Sets WCMP2 version from MCF edition
+
+        :param record: `dict` of OARec record
+        :param mcf: dict of MCF content model
+
+        :returns: None
+        """
+
         if 'edition' in mcf['identification']:
             record['properties']['version'] = mcf['identification']['edition']
 
+    def set_links(self, record: dict, mcf: dict) -> None:
+        """
+        Sets WCMP2 links: the distribution links of the OARec record
+        (those whose href is the url of an MCF distribution), without its
+        other (e.g. license) links
+
+        :param record: `dict` of OARec record
+        :param mcf: dict of MCF content model
+
+        :returns: None
+        """
+
         LOGGER.debug('Setting WCMP2 distribution links')
-        record['links'] = []
-        for key, value in mcf['distribution'].items():
-            link = self.generate_link(value)
+        urls = {value['url'] for value in mcf['distribution'].values()}
+        record['links'] = [link for link in record['links']
+                           if link['href'] in urls]
+
+    def set_data_policy(self, record: dict, mcf: dict) -> None:
+        """
+        Sets WCMP2 data policy of datasets
 
-            record['links'].append(link)
+        :param record: `dict` of OARec record
+        :param mcf: dict of MCF content model
+
+        :returns: None
+        """
 
         if mcf['metadata'].get('hierarchylevel') == 'dataset':
             try:
@@ -105,10 +137,15 @@ class WMOWCMP2OutputSchema(OGCAPIRecordOutputSchema):
             except KeyError:
                 LOGGER.warning('Missing wmo:dataPolicy')
 
+    def set_created(self, record: dict, mcf: dict) -> None:
+        """
+        Sets WCMP2 creation date (now) if missing
+
+        :param record: `dict` of OARec record
+        :param mcf: dict of MCF content model
+
+        :returns: None
+        """
+
         if record['properties'].get('created') is None:
             record['properties']['created'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')  # noqa
-
-        if stringify:
-            return json_dumps(record)
-        else:
-            return record
@@ -53,6 +53,8 @@ THISDIR = os.path.dirname(os.path.realpath(__file__))
 class WMOWIGOSOutputSchema(BaseOutputSchema):
     """WMO WIGOS output schema"""
 
+    media_type = 'application/xml'
+
     def __init__(self):
         """
         Initialize object
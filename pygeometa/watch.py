@@ -0,0 +1,219 @@
+# =================================================================
+#
+# Terms and Conditions of Use
+#
+# Unless otherwise noted, computer program source code of this
+# distribution # is covered under Crown Copyright, Government of
+# Canada, and is distributed under the MIT License.
+#
+# The Canada wordmark and related graphics associated with this
+# distribution are protected under trademark law and copyright law.
+# No permission is granted to use them outside the parameters of
+# the Government of Canada's corporate identity program. For
+# more information, see
+# http://www.tbs-sct.gc.ca/fip-pcim/index-eng.asp
+#
+# Copyright title to all 3rd party software distributed with this
+# software is held by the respective copyright holders as noted in
+# those files. Users are asked to read the 3rd Party Licenses
+# referenced with those assets.
+#
+# Copyright (c) 2026 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import logging
+import os
+import time
+from typing import Union
+
+from pygeometa.cache import MemoryCache
+from pygeometa.core import (_generate_file, _get_output_filename,
+                            _get_output_name, get_mcf_files)
+from pygeometa.manifest import get_mcf_dependencies, get_template_files
+
+LOGGER = logging.getLogger(__name__)
+
+POLL_INTERVAL = 1.0
+
+
+class Watcher:
+    """
+    Watcher of MCFs, their `base_mcf` ancestors and schema templates,
+    which regenerates the outputs affected by changes
+
+    Changes are detected by polling modification times, make-style: an
+    output is regenerated if it is missing or older than any of its inputs.
+    MCFs are generated in-process, so that parsed `base_mcf` files (see
+    `pygeometa.core.read_mcf`) and compiled templates (reloaded by Jinja2
+    when they change) stay in memory between changes.
+    """
+
+    def __init__(self, paths: list, output_dir: str, schemas: list = None,
+                 template_dir: str = None, name_by: str = 'source',
+                 compact: bool = False):
+        """
+        Initialize object
+
+        :param paths: `list` of MCF files, directories or glob patterns
+                      (see `pygeometa.core.get_mcf_files`), resolved again
+                      on each poll to pick up new MCFs
+        :param output_dir: directory to write metadata to
+        :param schemas: `list` of schema names
+        :param template_dir: directory of a locally defined schema
+        :param name_by: name outputs by MCF file name (`source`) or by MCF
+                        `identifier`
+        :param compact: whether to serialize JSON compactly
+
+        :returns: `pygeometa.watch.Watcher`
+        """
+
+        self.paths = paths
+        self.output_dir = output_dir
+        self.schemas = list(schemas or [])
+        self.template_dir = template_dir
+        self.name_by = name_by
+        self.compact = compact
+
+        self.targets = list(self.schemas)
+        if template_dir is not None:
+            self.targets.append(template_dir)
+
+        self.cache = MemoryCache()
+        self._templates = {}
+        self._dependencies = {}
+        self._outputs = {}
+        self._failed = {}
+
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _get_stale_targets(self, mcf: str, mtime) -> list:
+        """
+        gets the schemas whose outputs of an MCF are missing or older than
+        any of their inputs
+
+        :param mcf: path to MCF file
+        :param mtime: function returning the modification time of a file
+
+        :returns: `list` of schema names (or template directory)
+        """
+
+        if mcf not in self._dependencies:
+            self._dependencies[mcf] = get_mcf_dependencies(mcf)[0]
+
+        inputs = max(mtime(f) or 0 for f in self._dependencies[mcf])
+        outputs = self._outputs.get(mcf, {})
+
+        if self.name_by == 'source':
+            name = _get_output_name(mcf)
+            outputs = {t: _get_output_filename(name, t) for t in self.targets}
+
+        stale = []
+        for target in self.targets:
+            newest = max([inputs] + [mtime(f) or 0
+                                     for f in self._templates[target]])
+            output = outputs.get(target)
+            if output is None:
+                stale.append(target)
+                continue
+            output_mtime = mtime(os.path.join(self.output_dir, output))
+            if output_mtime is None or output_mtime < newest:
+                stale.append(target)
+
+        return stale
+
+    def poll(self) -> dict:
+        """
+        regenerates the outputs affected by changes since the last poll
+
+        MCFs which fail are not retried until one of their inputs changes.
+
+        :returns: `dict` of regenerated MCFs and error messages (`None` if
+                  generated)
+        """
+
+        mtimes = {}
+
+        def mtime(filepath: str) -> Union[int, None]:
+            if filepath not in mtimes:
+                try:
+                    mtimes[filepath] = os.stat(filepath).st_mtime_ns
+                except FileNotFoundError:
+                    mtimes[filepath] = None
+            return mtimes[filepath]
+
+        results = {}
+
+        # resolved again on each poll to pick up new (e.g. included)
+        # templates
+        self._templates = {t: get_template_files(t) for t in self.targets}
+
+        for mcf in get_mcf_files(self.paths):
+            stale = self._get_stale_targets(mcf, mtime)
+            if not stale:
+                continue
+
+            signature = tuple(mtime(f) for f in self._dependencies[mcf])
+            signature += tuple(mtime(f) for t in stale
+                               for f in self._templates[t])
+            if self._failed.get(mcf) == signature:
+                continue
+
+            LOGGER.info(f"Regenerating {mcf} ({', '.join(stale)})")
+            schemas = [t for t in stale if t != self.template_dir]
+            template_dir = self.template_dir if self.template_dir in stale \
+                else None
+            error, outputs = _generate_file(
+                mcf, schemas, self.output_dir, self.name_by, self.compact,
+                template_dir=template_dir, cache=self.cache)
+
+            self._dependencies[mcf] = get_mcf_dependencies(mcf)[0]
+            if error is None:
+                self._outputs.setdefault(mcf, {}).update(outputs)
+                self._failed.pop(mcf, None)
+            else:
+                self._failed[mcf] = signature
+
+            results[mcf] = error
+
+        return results
+
+    def run(self, interval: float = POLL_INTERVAL, callback=None) -> None:
+        """
+        polls for changes until interrupted
+
+        :param interval: seconds between polls
+        :param callback: optional function called with the results of each
+                         poll which regenerated outputs
+
+        :returns: None
+        """
+
+        LOGGER.info(f'Watching {len(self.paths)} paths every {interval}s')
+
+        while True:
+            results = self.poll()
+            if results and callback is not None:
+                callback(results)
+            time.sleep(interval)
@@ -0,0 +1,823 @@
+# =================================================================
+#
+# Terms and Conditions of Use
+#
+# Unless otherwise noted, computer program source code of this
+# distribution # is covered under Crown Copyright, Government of
+# Canada, and is distributed under the MIT License.
+#
+# The Canada wordmark and related graphics associated with this
+# distribution are protected under trademark law and copyright law.
+# No permission is granted to use them outside the parameters of
+# the Government of Canada's corporate identity program. For
+# more information, see
+# http://www.tbs-sct.gc.ca/fip-pcim/index-eng.asp
+#
+# Copyright title to all 3rd party software distributed with this
+# software is held by the respective copyright holders as noted in
+# those files. Users are asked to read the 3rd Party Licenses
+# referenced with those assets.
+#
+# Copyright (c) 2026 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+# pygeometa microbenchmarks
+#
+# Usage: python3 run_benchmarks.py [name ...]
+#
+# Each benchmark reports the best per-call time of a number of timeit
+# repetitions.  Results are indicative only and vary across machines.
+
+import copy
+import datetime
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from pygeometa.cache import FileCache, MemoryCache
+from pygeometa.core import (generate_batch, generate_many, get_mcf_files,
+                            get_template_environment, import_metadata,
+                            read_mcf, render_j2_template, SCHEMAS,
+                            TEMPLATE_FILTERS, transform_batch,
+                            transform_metadata)
+from pygeometa.helpers import (freeze, FrozenDict, json_dumps,
+                               MetadataInput, set_json_encoder)
+from pygeometa.schemas import (get_supported_schemas, load_schema, preload,
+                               rank_schemas, sniff_content)
+from pygeometa.schemas.util import generate_geojson_geometry
+from pygeometa.watch import Watcher
+
+THISDIR = os.path.dirname(os.path.realpath(__file__))
+
+NUMBER = 10000
+REPEAT = 5
+
+# ISO 19139 based profile templates and the common templates they share
+ISO_TEMPLATES = [
+    'iso19139/main.j2',
+    'iso19139_2/main.j2',
+    'wmo_cmp/main.j2',
+    'iso19139_hnap/main.j2',
+    'common/iso19139-base.j2',
+    'common/iso19139-charstring.j2',
+    'common/iso19139-geographic-element.j2',
+    'iso19139_hnap/charstring.j2',
+    'iso19139/contact.j2',
+    'iso19139_2/contact.j2',
+    'wmo_cmp/contact.j2',
+    'iso19139_hnap/contact.j2'
+]
+
+# mixed import corpus (schema.org is generated from sample.mcf.yml)
+AUTODETECT_CORPUS = {
+    'iso19139': 'md-SMJP01RJTD-gmd.xml',
+    'openaire': 'openaire.json',
+    'mmd': 'mmd.json',
+    'cwl': 'cwl.yml',
+    'schema-org': None
+}
+
+# sample arguments for each registered template filter
+TEMPLATE_FILTER_ARGS = {
+    'normalize_datestring': [
+        (datetime.date(2011, 11, 11),),
+        ('$Date: 2014-01-31 12:34:56 -0500 (Fri, 31 Jan 2014) $',),
+        ('Copyright (c) $Date: 2014-01-31 12:34:56 -0500 $ Example', 'year'),
+        ('$date$',)
+    ],
+    'get_distribution_language': [
+        ('url_en',),
+        ('url',)
+    ],
+    'get_charstring': [
+        ('title', 'en'),
+        ({'en': 'title', 'fr': 'titre'}, 'en', 'fr')
+    ],
+    'prune_distribution_formats': [
+        ({
+            'wms': {'format_en': 'image', 'format_fr': 'image'},
+            'wfs': {'format_en': 'GRIB2', 'format_fr': 'GRIB2'},
+            'wcs': {'format_en': 'GRIB2', 'format_fr': 'GRIB2'}
+        },)
+    ],
+    'prune_transfer_option': [
+        ({
+            'waf_eng-CAN': {'name': 'Datamart'},
+            'wms_eng-CAN': {'name': 'GeoMet'},
+            'wms_fra-CAN': {'name': 'GeoMet french'}
+        }, 'eng; CAN')
+    ]
+}
+
+
+def report(name: str, timings: list, number: int) -> None:
+    """
+    print a benchmark result
+
+    :param name: name of benchmark
+    :param timings: `list` of timeit repetitions
+    :param number: number of calls per repetition
+
+    :returns: None
+    """
+
+    usec = min(timings) / number * 1e6
+    print(f'{name:<60} {usec:10.3f} usec/call')
+
+
+def benchmark_template_filters() -> None:
+    """benchmark each template filter registered in render_j2_template"""
+
+    for name, function in TEMPLATE_FILTERS.items():
+        if name not in TEMPLATE_FILTER_ARGS:
+            raise RuntimeError(f'No benchmark arguments for filter {name}')
+
+        for args in TEMPLATE_FILTER_ARGS[name]:
+            timings = timeit.repeat(lambda: function(*args), number=NUMBER,
+                                    repeat=REPEAT)
+            report(f'filter {name}{args!r:.40}', timings, NUMBER)
+
+
+def compile_iso_templates() -> None:
+    """compile the ISO 19139 profile templates into a fresh environment"""
+
+    get_template_environment.cache_clear()
+    env = get_template_environment()
+
+    for name in ISO_TEMPLATES:
+        env.get_template(name)
+
+
+def benchmark_template_compile() -> None:
+    """benchmark compiling and rendering the ISO 19139 profiles"""
+
+    timings = timeit.repeat(compile_iso_templates, number=1, repeat=REPEAT)
+    report('compile ISO 19139 profile templates', timings, 1)
+
+    tracemalloc.start()
+    compile_iso_templates()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{"compiled ISO 19139 profile templates (memory)":<60} '
+          f'{current / 1024:10.1f} KiB (peak {peak / 1024:.1f} KiB)')
+
+    mcf = read_mcf(os.path.join(THISDIR, '..', 'sample.mcf.yml'))
+
+    for profile in ['iso19139', 'iso19139_2', 'wmo_cmp']:
+        template_dir = str(SCHEMAS / profile)
+        timings = timeit.repeat(lambda: render_j2_template(mcf, template_dir),
+                                number=100, repeat=REPEAT)
+        report(f'render {profile}', timings, 100)
+
+
+def benchmark_schema_loading() -> None:
+    """benchmark schema plugin loading and import autodetection"""
+
+    # autodetection logs a warning for each schema unable to import
+    logging.getLogger('pygeometa').setLevel(logging.ERROR)
+
+    preload()
+
+    timings = timeit.repeat(lambda: load_schema('iso19139'), number=NUMBER,
+                            repeat=REPEAT)
+    report('load_schema iso19139', timings, NUMBER)
+
+    with open(os.path.join(THISDIR, 'md-SMJP01RJTD-gmd.xml')) as fh:
+        metadata = fh.read()
+
+    timings = timeit.repeat(lambda: import_metadata('autodetect', metadata),
+                            number=10, repeat=REPEAT)
+    report('import_metadata autodetect (ISO 19139)', timings, 10)
+
+
+def load_corpus() -> dict:
+    """
+    load the mixed import corpus
+
+    :returns: `dict` of schema shortnames to metadata content
+    """
+
+    corpus = {}
+
+    for schema, filename in AUTODETECT_CORPUS.items():
+        if filename is None:
+            mcf = read_mcf(os.path.join(THISDIR, '..', 'sample.mcf.yml'))
+            corpus[schema] = load_schema(schema).write(mcf)
+        else:
+            with open(os.path.join(THISDIR, filename)) as fh:
+                corpus[schema] = fh.read()
+
+    return corpus
+
+
+def import_exhaustive(metadata: str) -> dict:
+    """
+    import metadata by trying every readable schema in turn (i.e. without
+    content sniffing), for comparison
+
+    :param metadata: `str` of metadata content
+
+    :returns: `dict` of MCF content
+    """
+
+    for schema in get_supported_schemas():
+        schema_object = load_schema(schema)
+        if not schema_object.can_read:
+            continue
+        try:
+            return schema_object.import_(metadata)
+        except Exception:
+            pass
+
+
+def benchmark_autodetect() -> None:
+    """benchmark import autodetection over a mixed corpus"""
+
+    # failed imports log errors
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    preload()
+
+    corpus = load_corpus()
+
+    for schema, metadata in corpus.items():
+        timings = timeit.repeat(lambda: sniff_content(metadata), number=100,
+                                repeat=REPEAT)
+        report(f'sniff {schema}', timings, 100)
+
+        _, signature = sniff_content(metadata)
+        if rank_schemas(signature)[0] != schema:
+            raise RuntimeError(f'{schema} not ranked first')
+
+        timings = timeit.repeat(lambda: import_exhaustive(metadata),
+                                number=10, repeat=REPEAT)
+        report(f'import {schema} (try every schema)', timings, 10)
+
+        timings = timeit.repeat(
+            lambda: import_exhaustive(MetadataInput(metadata)),
+            number=10, repeat=REPEAT)
+        report(f'import {schema} (try every schema, parse once)', timings, 10)
+
+        timings = timeit.repeat(lambda: import_metadata('autodetect',
+                                                        metadata),
+                                number=10, repeat=REPEAT)
+        report(f'import {schema} (autodetect)', timings, 10)
+
+    def import_corpus():
+        for metadata in corpus.values():
+            import_metadata('autodetect', metadata)
+
+    timings = timeit.repeat(import_corpus, number=10, repeat=REPEAT)
+    report('import mixed corpus (autodetect)', timings, 10)
+
+
+def benchmark_cache() -> None:
+    """benchmark repeated transforms (harvest passes) with result caches"""
+
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    corpus = list(load_corpus().values())
+
+    def transform_corpus(cache=None):
+        for metadata in corpus:
+            transform_metadata('autodetect', 'oarec-record', metadata,
+                               cache=cache)
+
+    timings = timeit.repeat(transform_corpus, number=10, repeat=REPEAT)
+    report('transform mixed corpus (no cache)', timings, 10)
+
+    cache = MemoryCache()
+    transform_corpus(cache)
+    timings = timeit.repeat(lambda: transform_corpus(cache), number=10,
+                            repeat=REPEAT)
+    report('transform mixed corpus (memory cache, warm)', timings, 10)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = FileCache(tmp_dir)
+        transform_corpus(cache)
+        timings = timeit.repeat(lambda: transform_corpus(cache), number=10,
+                                repeat=REPEAT)
+        report('transform mixed corpus (file cache, warm)', timings, 10)
+
+
+def benchmark_iso_import() -> None:
+    """benchmark ISO 19139 import with XPath expressions and OWSLib"""
+
+    iso = load_schema('iso19139')
+
+    for filename in sorted(os.listdir(THISDIR)):
+        if not filename.endswith('.xml'):
+            continue
+        with open(os.path.join(THISDIR, filename), 'rb') as fh:
+            metadata = fh.read()
+
+        for owslib in [True, False]:
+            timings = timeit.repeat(
+                lambda: iso.import_(MetadataInput(metadata), owslib=owslib),
+                number=20, repeat=REPEAT)
+            mode = 'owslib' if owslib else 'xpath'
+            report(f'import {filename[:40]} ({mode})', timings, 20)
+
+
+# peak resident memory of importing all records of a multi-record document,
+# streamed or parsed whole (run in a subprocess, for a clean measurement)
+ISO_RECORDS_MEMORY = """
+import resource, sys
+from lxml import etree
+from pygeometa.schemas import load_schema
+
+iso = load_schema('iso19139')
+if sys.argv[2] == 'stream':
+    records = iso.import_records(sys.argv[1])
+else:
+    root = etree.parse(sys.argv[1]).getroot()
+    records = (iso._import_root(r) for r in root.iter(
+        '{http://www.isotc211.org/2005/gmd}MD_Metadata'))
+count = sum(1 for _ in records)
+print(count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def benchmark_iso_records() -> None:
+    """benchmark streaming import of a multi-record ISO 19139 document"""
+
+    iso = load_schema('iso19139')
+
+    with open(os.path.join(THISDIR, 'md-SMJP01RJTD-gmd.xml'), 'rb') as fh:
+        record = fh.read().split(b'?>', 1)[-1]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'records.xml')
+        with open(filename, 'wb') as fh:
+            fh.write(b'<csw:GetRecordsResponse xmlns:csw='
+                     b'"http://www.opengis.net/cat/csw/2.0.2">'
+                     b'<csw:SearchResults>')
+            for i in range(5000):
+                fh.write(record)
+            fh.write(b'</csw:SearchResults></csw:GetRecordsResponse>')
+
+        timings = timeit.repeat(
+            lambda: sum(1 for _ in iso.import_records(filename)),
+            number=1, repeat=REPEAT)
+        report('import_records (5000 records, per record)', timings, 5000)
+
+        for mode in ['stream', 'parse']:
+            result = subprocess.run(
+                [sys.executable, '-c', ISO_RECORDS_MEMORY, filename, mode],
+                capture_output=True, check=True, text=True)
+            count, maxrss = result.stdout.split()
+            name = f'import {count} records ({mode}, memory)'
+            print(f'{name:<60} {int(maxrss) / 1024:10.1f} MiB (peak RSS)')
+
+
+def benchmark_json_dumps() -> None:
+    """benchmark JSON serialization of OARec records"""
+
+    mcf = read_mcf(os.path.join(THISDIR, '..', 'sample.mcf.yml'))
+    record = load_schema('oarec-record').write(mcf, stringify=False)
+
+    encoders = ['json']
+    try:
+        import orjson  # noqa: F401
+        encoders.append('orjson')
+    except ImportError:
+        print('orjson not installed; skipping')
+
+    try:
+        for encoder in encoders:
+            set_json_encoder(encoder)
+            for compact in [False, True]:
+                mode = 'compact' if compact else 'pretty'
+                timings = timeit.repeat(lambda: json_dumps(record, compact),
+                                        number=1000, repeat=REPEAT)
+                report(f'json_dumps OARec record ({encoder}, {mode})',
+                       timings, 1000)
+                size = len(json_dumps(record, compact).encode('utf-8'))
+                print(f'{"  size":<60} {size:10d} bytes')
+    finally:
+        set_json_encoder()
+
+
+def benchmark_contacts() -> None:
+    """benchmark merging of OARec contacts with many roles"""
+
+    oarec = load_schema('oarec-record')
+
+    for roles, distinct in [(10, 5), (50, 10)]:
+        contacts = {
+            f'role{i}': {
+                'organization': f'Organization {i % distinct}',
+                'email': f'contact{i % distinct}@example.org'
+            } for i in range(roles)
+        }
+        timings = timeit.repeat(lambda: oarec.generate_contacts(contacts),
+                                number=10, repeat=REPEAT)
+        report(f'generate_contacts ({roles} roles, {distinct} contacts)',
+               timings, 10)
+
+
+def benchmark_profiles() -> None:
+    """benchmark writing OARec and WCMP2 records of the same MCF"""
+
+    mcf = read_mcf(os.path.join(THISDIR, '..', 'sample.mcf.yml'))
+    oarec = load_schema('oarec-record')
+    wcmp2 = load_schema('wmo-wcmp2')
+
+    def write_separately():
+        oarec.write(mcf)
+        wcmp2.write(mcf)
+
+    def write_shared():
+        record = oarec.generate_record(mcf)
+        oarec.write(mcf, record=record)
+        wcmp2.write(mcf, record=record)
+
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    for name, function in [('separately', write_separately),
+                           ('sharing base record', write_shared)]:
+        timings = timeit.repeat(function, number=100, repeat=REPEAT)
+        report(f'write OARec and WCMP2 ({name})', timings, 100)
+
+
+def benchmark_frozen_mcf() -> None:
+    """benchmark fanning out one MCF to several JSON writers"""
+
+    mcf = read_mcf(os.path.join(THISDIR, '..', 'sample.mcf.yml'))
+    writers = [load_schema(s) for s in ['dcat', 'oarec-record', 'stac-item']]
+
+    def write_copies():
+        for writer in writers:
+            writer.write(copy.deepcopy(mcf))
+
+    def write_frozen():
+        frozen = freeze(mcf)
+        for writer in writers:
+            writer.write(frozen)
+
+    for name, function in [('deepcopy per writer', write_copies),
+                           ('one frozen MCF', write_frozen)]:
+        timings = timeit.repeat(function, number=100, repeat=REPEAT)
+        report(f'write DCAT, OARec and STAC ({name})', timings, 100)
+
+
+def benchmark_generate_many() -> None:
+    """benchmark generating several schemas from one MCF"""
+
+    mcf = os.path.join(THISDIR, '..', 'sample.mcf.yml')
+    schemas = ['iso19139', 'oarec-record', 'wmo-wcmp2', 'schema-org']
+
+    def generate_separately():
+        for schema in schemas:
+            load_schema(schema).write(read_mcf(mcf))
+
+    def generate_together():
+        generate_many(mcf, schemas)
+
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    for name, function in [('read per schema', generate_separately),
+                           ('generate_many', generate_together)]:
+        timings = timeit.repeat(function, number=20, repeat=REPEAT)
+        report(f'generate 4 schemas ({name})', timings, 20)
+
+    def cli(schema):
+        subprocess.run([sys.executable, '-c',
+                        'import pygeometa; pygeometa.cli()', 'metadata',
+                        'generate', mcf, '--schema', schema],
+                       check=True, capture_output=True)
+
+    for name, function in [
+            ('one CLI call per schema', lambda: [cli(s) for s in schemas]),
+            ('one CLI call', lambda: cli(','.join(schemas)))]:
+        timings = timeit.repeat(function, number=1, repeat=REPEAT)
+        report(f'generate 4 schemas ({name})', timings, 1)
+
+
+def benchmark_derived() -> None:
+    """benchmark writers sharing the derived values of one MCF"""
+
+    mcf = read_mcf(os.path.join(THISDIR, '..', 'sample.mcf.yml'))
+    frozen = freeze(mcf)
+    writers = [load_schema(s) for s in
+               ['oarec-record', 'stac-item', 'schema-org', 'csvw']]
+
+    def write_plain():
+        for writer in writers:
+            writer.write(mcf)
+
+    def write_frozen():
+        # a shallow copy of a frozen MCF, without cached derived values
+        frozen2 = FrozenDict(frozen)
+        for writer in writers:
+            writer.write(frozen2)
+
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    for name, function in [('derived per writer', write_plain),
+                           ('derived once', write_frozen)]:
+        timings = timeit.repeat(function, number=100, repeat=REPEAT)
+        report(f'write OARec, STAC, schema.org and CSVW ({name})',
+               timings, 100)
+
+
+def benchmark_geometry() -> None:
+    """benchmark GeoJSON geometry of many spatial extents"""
+
+    # station network: 10000 extents of 5000 distinct stations
+    spatial = [{'bbox': [i % 5000 / 100, 45, i % 5000 / 100 + 0.01, 45.01],
+                'crs': 4326} for i in range(10000)]
+
+    for name, envelope in [('MultiPolygon', False), ('envelope', True)]:
+        timings = timeit.repeat(
+            lambda: generate_geojson_geometry(spatial, envelope),
+            number=10, repeat=REPEAT)
+        report(f'generate_geojson_geometry (10000 extents, {name})',
+               timings, 10)
+
+    mcf = read_mcf(os.path.join(THISDIR, '..', 'sample.mcf.yml'))
+    mcf['identification']['extents']['spatial'] = spatial
+    stac = load_schema('stac-item')
+
+    timings = timeit.repeat(lambda: stac.write(mcf), number=3, repeat=REPEAT)
+    report('write STAC item (10000 extents)', timings, 3)
+
+
+def benchmark_write_collection() -> None:
+    """benchmark writing many OARec records to one collection"""
+
+    mcf = read_mcf(os.path.join(THISDIR, '..', 'sample.mcf.yml'))
+    oarec = load_schema('oarec-record')
+
+    def mcfs():
+        for i in range(2000):
+            yield {**mcf, 'metadata': {**mcf['metadata'], 'identifier': i}}
+
+    def concatenate(fh):
+        records = [oarec.write(m, compact=True) for m in mcfs()]
+        fh.write('{"type":"FeatureCollection","features":[')
+        fh.write(','.join(records))
+        fh.write(']}')
+
+    def stream(fh):
+        oarec.write_collection(mcfs(), fh, compact=True)
+
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    with tempfile.TemporaryFile('w') as fh:
+        for name, function in [('concatenated', concatenate),
+                               ('write_collection', stream)]:
+            timings = timeit.repeat(lambda: function(fh), number=1,
+                                    repeat=REPEAT)
+            report(f'write 2000 records ({name}, per record)', timings, 2000)
+
+            tracemalloc.start()
+            function(fh)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f'{f"write 2000 records ({name}, memory)":<60} '
+                  f'{peak / 1024:10.1f} KiB (peak)')
+
+
+def benchmark_stac_catalog() -> None:
+    """benchmark writing a static STAC catalog of many MCFs"""
+
+    with open(os.path.join(THISDIR, '..', 'sample.mcf.yml')) as fh:
+        sample = fh.read()
+
+    stac = load_schema('stac-item')
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as directory:
+        mcf_dir = os.path.join(directory, 'mcf')
+        os.mkdir(mcf_dir)
+        for i in range(200):
+            with open(os.path.join(mcf_dir, f'{i}.yml'), 'w') as fh:
+                fh.write(sample.replace('3f342f64-9348-11df-ba6a-0014c2c00eab',
+                                        str(i)))
+
+        for workers in [1, 4]:
+            timings = timeit.repeat(
+                lambda: stac.write_catalog(mcf_dir, os.path.join(
+                    directory, 'stac'), workers=workers),
+                number=1, repeat=REPEAT)
+            report(f'write STAC catalog (200 items, {workers} workers, '
+                   'per item)', timings, 200)
+
+        mcf = os.path.join(mcf_dir, '0.yml')
+        timings = timeit.repeat(
+            lambda: subprocess.run([sys.executable, '-c',
+                                    'import pygeometa; pygeometa.cli()',
+                                    'metadata', 'generate', mcf, '--schema',
+                                    'stac-item'],
+                                   check=True, capture_output=True),
+            number=1, repeat=REPEAT)
+        report('write STAC item (one CLI call per item)', timings, 1)
+
+
+def benchmark_generate_batch() -> None:
+    """benchmark generating metadata of many MCFs"""
+
+    with open(os.path.join(THISDIR, '..', 'sample.mcf.yml')) as fh:
+        sample = fh.read()
+
+    schemas = ['iso19139', 'oarec-record']
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(100):
+            with open(os.path.join(directory, f'{i}.yml'), 'w') as fh:
+                fh.write(sample)
+
+        mcfs = get_mcf_files([directory])
+        output_dir = os.path.join(directory, 'out')
+
+        for workers in [1, 4]:
+            timings = timeit.repeat(
+                lambda: generate_batch(mcfs, schemas, output_dir, workers),
+                number=1, repeat=REPEAT)
+            report(f'generate_batch (100 MCFs, {workers} workers, per MCF)',
+                   timings, 100)
+
+        timings = timeit.repeat(
+            lambda: subprocess.run([sys.executable, '-c',
+                                    'import pygeometa; pygeometa.cli()',
+                                    'metadata', 'generate', mcfs[0],
+                                    '--schema', ','.join(schemas),
+                                    '--output-dir', output_dir],
+                                   check=True, capture_output=True),
+            number=1, repeat=REPEAT)
+        report('generate (one CLI call per MCF)', timings, 1)
+
+
+def benchmark_generate_incremental() -> None:
+    """benchmark regenerating metadata of many MCFs, few of them changed"""
+
+    with open(os.path.join(THISDIR, '..', 'sample.mcf.yml')) as fh:
+        sample = fh.read()
+
+    schemas = ['iso19139', 'oarec-record']
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(200):
+            with open(os.path.join(directory, f'{i}.yml'), 'w') as fh:
+                fh.write(sample)
+
+        mcfs = get_mcf_files([directory])
+        output_dir = os.path.join(directory, 'out')
+
+        timings = timeit.repeat(
+            lambda: generate_batch(mcfs, schemas, output_dir),
+            number=1, repeat=REPEAT)
+        report('generate_batch (200 MCFs, all)', timings, 1)
+
+        generate_batch(mcfs, schemas, output_dir, incremental=True)
+
+        def change_and_regenerate():
+            for mcf in mcfs[:5]:
+                with open(mcf, 'a') as fh:
+                    fh.write('\n')
+            generate_batch(mcfs, schemas, output_dir, incremental=True)
+
+        timings = timeit.repeat(change_and_regenerate, number=1,
+                                repeat=REPEAT)
+        report('generate_batch (200 MCFs, 5 changed, incremental)',
+               timings, 1)
+
+
+def benchmark_watch() -> None:
+    """benchmark regenerating metadata on change of an MCF"""
+
+    with open(os.path.join(THISDIR, 'sample-child.mcf.yml')) as fh:
+        child = fh.read()
+    with open(os.path.join(THISDIR, 'base-metadata.mcf.yml')) as fh:
+        base = fh.read()
+
+    schemas = ['iso19139', 'oarec-record']
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as directory:
+        mcf_dir = os.path.join(directory, 'mcfs')
+        os.makedirs(mcf_dir)
+        with open(os.path.join(mcf_dir, 'base-metadata.mcf.yml'), 'w') as fh:
+            fh.write(base)
+        for i in range(100):
+            with open(os.path.join(mcf_dir, f'{i}.yml'), 'w') as fh:
+                fh.write(child)
+
+        mcfs = get_mcf_files([os.path.join(mcf_dir, '*[0-9].yml')])
+        output_dir = os.path.join(directory, 'out')
+        watcher = Watcher(mcfs, output_dir, schemas)
+        watcher.poll()
+
+        timings = []
+        for _ in range(REPEAT):
+            time.sleep(0.05)
+            with open(mcfs[0], 'a') as fh:
+                fh.write('\n')
+            start = time.perf_counter()
+            watcher.poll()
+            timings.append(time.perf_counter() - start)
+        report('Watcher.poll (100 MCFs, 1 changed)', timings, 1)
+
+        timings = timeit.repeat(
+            lambda: subprocess.run([sys.executable, '-c',
+                                    'import pygeometa; pygeometa.cli()',
+                                    'metadata', 'generate', mcfs[0],
+                                    '--schema', ','.join(schemas),
+                                    '--output-dir', output_dir],
+                                   check=True, capture_output=True),
+            number=1, repeat=REPEAT)
+        report('generate (one CLI call per change)', timings, 1)
+
+
+def benchmark_transform_batch() -> None:
+    """benchmark transforming many metadata records"""
+
+    with open(os.path.join(THISDIR, 'md-SMJP01RJTD-gmd.xml'), 'rb') as fh:
+        record = fh.read()
+
+    records = [(str(i), record) for i in range(200)]
+    logging.getLogger('pygeometa').setLevel(logging.CRITICAL)
+
+    for workers in [1, 4]:
+        timings = timeit.repeat(
+            lambda: list(transform_batch(records, 'autodetect',
+                                         'oarec-record', workers, True)),
+            number=1, repeat=REPEAT)
+        report(f'transform_batch (200 records, {workers} workers, '
+               'per record)', timings, 200)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'record.xml')
+        with open(filename, 'wb') as fh:
+            fh.write(record)
+
+        timings = timeit.repeat(
+            lambda: subprocess.run([sys.executable, '-c',
+                                    'import pygeometa; pygeometa.cli()',
+                                    'metadata', 'transform', filename,
+                                    '--output-schema', 'oarec-record'],
+                                   check=True, capture_output=True),
+            number=1, repeat=REPEAT)
+        report('transform (one CLI call per record)', timings, 1)
+
+
+BENCHMARKS = {
+    'template_filters': benchmark_template_filters,
+    'template_compile': benchmark_template_compile,
+    'schema_loading': benchmark_schema_loading,
+    'autodetect': benchmark_autodetect,
+    'cache': benchmark_cache,
+    'iso_import': benchmark_iso_import,
+    'iso_records': benchmark_iso_records,
+    'json_dumps': benchmark_json_dumps,
+    'contacts': benchmark_contacts,
+    'profiles': benchmark_profiles,
+    'frozen_mcf': benchmark_frozen_mcf,
+    'generate_many': benchmark_generate_many,
+    'derived': benchmark_derived,
+    'geometry': benchmark_geometry,
+    'write_collection': benchmark_write_collection,
+    'stac_catalog': benchmark_stac_catalog,
+    'generate_batch': benchmark_generate_batch,
+    'generate_incremental': benchmark_generate_incremental,
+    'watch': benchmark_watch,
+    'transform_batch': benchmark_transform_batch
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or BENCHMARKS.keys()
+
+    for name in names:
+        print(f'== {name}')
+        BENCHMARKS[name]()
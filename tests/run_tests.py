@@ -45,32 +45,62 @@
 #
 # =================================================================
 
+import copy
 import datetime
+import io
 import json
+import mmap
 import os
+import pickle
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
 import unittest
 
 from jsonschema.protocols import Validator
 import yaml
 
+from pygeometa.cache import FileCache, get_cache_key, MemoryCache
 from pygeometa.core import (read_mcf, pretty_print, render_j2_template,
-                            get_charstring, import_metadata,
+                            get_charstring, get_template_environment,
+                            generate_batch, generate_many, get_mcf_files,
+                            import_metadata, iter_metadata_records,
                             normalize_datestring, prune_distribution_formats,
                             prune_transfer_option, MCFReadError,
-                            MCFValidationError, SCHEMAS, transform_metadata,
-                            validate_mcf)
-from pygeometa.helpers import generate_datetime, json_dumps
-from pygeometa.schemas import (get_supported_schemas, InvalidSchemaError,
-                               load_schema)
+                            MCFValidationError, SCHEMAS, transform_batch,
+                            transform_metadata, validate_mcf,
+                            write_transform_results)
+from pygeometa.helpers import (freeze, generate_datetime, json_dumps,
+                               MetadataInput, MMAP_THRESHOLD,
+                               read_metadata_file, set_json_encoder)
+from pygeometa.manifest import get_mcf_dependencies, Manifest, MANIFEST_FILE
+from pygeometa.schemas import (get_plugin_index, get_plugin_index_file,
+                               get_supported_schemas, InvalidSchemaError,
+                               load_schema, preload, rank_schemas, REGISTRY,
+                               SchemaRegistry, sniff_content)
 from pygeometa.schemas.iso19139 import ISO19139OutputSchema
 from pygeometa.schemas.ogcapi_records import OGCAPIRecordOutputSchema
 from pygeometa.schemas.schema_org import _get_box_from_coords
-from pygeometa.schemas.util import generate_geojson_geometry
+from pygeometa.schemas import util
+from pygeometa.schemas.util import (DerivedMCF, generate_geojson_geometry,
+                                    get_bboxes, get_derived, get_envelope,
+                                    share_derived)
+from pygeometa.watch import Watcher
 
 from sample_schema import SampleOutputSchema
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
 
+# cumulative import time budget (microseconds) of the pygeometa CLI: about
+# 5 times its import time on a developer machine, so as to catch eager
+# imports or work at import time without failing on loaded CI runners
+# (set PYGEOMETA_IMPORT_TIME_BUDGET to adjust it on slow machines)
+IMPORT_TIME_BUDGET = int(os.environ.get('PYGEOMETA_IMPORT_TIME_BUDGET',
+                                        500000))
+
 
 def msg(test_id, test_description):
     """convenience function to print out test id and desc"""
@@ -176,6 +206,24 @@ class PygeometaTest(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             self.assertIsInstance(normalize_datestring(None), str)
 
+        with self.assertRaises(RuntimeError):
+            normalize_datestring(['2013'])
+
+        now = datetime.datetime(2026, 1, 2, 3, 4, 5)
+        self.assertEqual(normalize_datestring('$date$', now=now),
+                         '2026-01-02')
+        self.assertEqual(normalize_datestring('$datetime$', now=now),
+                         '2026-01-02T03:04:05Z')
+        self.assertEqual(normalize_datestring('(c) $year$', now=now),
+                         '(c) 2026')
+
+        svn_date = '$Date: 2014-01-31 12:34:56 -0500 (Fri, 31 Jan 2014) $'
+        self.assertEqual(normalize_datestring(svn_date),
+                         '2014-01-31T12:34:56')
+        self.assertEqual(normalize_datestring(svn_date, 'year'), '2014')
+        self.assertEqual(normalize_datestring(datetime.date(1850, 1, 2)),
+                         '02.01.1850')
+
     def test_prune_distribution_formats(self):
         """Test deriving unique distribution formats"""
 
@@ -243,6 +291,134 @@ class PygeometaTest(unittest.TestCase):
                          'Expected specific number of supported schemas')
         self.assertIn('autodetect', schemas, 'Expected autodetect in list')
 
+        schemas = {s['id']: s for s in get_supported_schemas(details=True)}
+        self.assertEqual(len(schemas), 14,
+                         'Expected specific number of supported schemas')
+
+        readers = [k for k, v in schemas.items() if v['read']]
+        self.assertEqual(readers, ['csvw', 'cwl', 'iso19139', 'mmd',
+                                   'openaire', 'schema-org'],
+                         'Expected exact list of readable schemas')
+
+        non_writers = [k for k, v in schemas.items() if not v['write']]
+        self.assertEqual(non_writers, ['cwl', 'mmd', 'openaire'],
+                         'Expected exact list of non-writable schemas')
+
+        self.assertEqual(schemas['iso19139']['media_type'],
+                         'application/xml', 'Expected specific media type')
+        self.assertEqual(schemas['wmo-wcmp2']['media_type'],
+                         'application/geo+json',
+                         'Expected specific media type')
+
+    def test_schema_registry(self):
+        """Test schema plugin registry"""
+
+        schema = load_schema('iso19139')
+        self.assertIsInstance(schema, ISO19139OutputSchema)
+        self.assertIs(load_schema('iso19139'), schema,
+                      'Expected cached plugin object')
+        self.assertIs(REGISTRY.get_class('iso19139'), ISO19139OutputSchema,
+                      'Expected cached plugin class')
+
+        with self.assertRaises(InvalidSchemaError):
+            load_schema('404')
+
+        schemas = preload()
+        self.assertEqual(len(schemas), len(REGISTRY.schemas))
+        self.assertIs(preload(['iso19139'])[0], schema,
+                      'Expected preloaded plugin object')
+
+        registry = SchemaRegistry(REGISTRY.schemas)
+        results = []
+
+        def load():
+            results.append(registry.get('oarec-record'))
+
+        threads = [threading.Thread(target=load) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual(len(set(map(id, results))), 1,
+                         'Expected one plugin object across threads')
+
+        registry.clear()
+        self.assertIsNot(registry.get('oarec-record'), results[0],
+                         'Expected new plugin object after clear')
+
+    def test_schema_plugins(self):
+        """Test entry point schema plugin discovery"""
+
+        def install(site_dir, version):
+            dist_info = os.path.join(
+                site_dir, f'pygeometa_sample-{version}.dist-info')
+            os.makedirs(dist_info)
+            with open(os.path.join(dist_info, 'METADATA'), 'w') as fh:
+                fh.write('Metadata-Version: 2.1\n'
+                         'Name: pygeometa-sample\n'
+                         f'Version: {version}\n')
+            with open(os.path.join(dist_info, 'entry_points.txt'), 'w') as fh:
+                fh.write('[pygeometa.schemas]\n'
+                         'sample = sample_schema:SampleOutputSchema\n'
+                         'iso19139 = sample_schema:SampleOutputSchema\n')
+            return dist_info
+
+        cache_dir = os.environ.get('PYGEOMETA_CACHE_DIR')
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            site_dir = os.path.join(tmp_dir, 'site-packages')
+            os.environ['PYGEOMETA_CACHE_DIR'] = os.path.join(tmp_dir, 'cache')
+            sys.path.insert(0, site_dir)
+
+            try:
+                dist_info = install(site_dir, '1.0')
+
+                index = get_plugin_index()
+                self.assertEqual(index['sample'],
+                                 'sample_schema.SampleOutputSchema',
+                                 'Expected dotted path of plugin')
+                index_file = get_plugin_index_file()
+                self.assertTrue(index_file.exists(), 'Expected index file')
+
+                # index is reused while installed distributions are unchanged
+                with index_file.open() as fh:
+                    cached_index = json.load(fh)
+                cached_index['schemas']['cached'] = 'foo.Bar'
+                with index_file.open('w') as fh:
+                    json.dump(cached_index, fh)
+                self.assertIn('cached', get_plugin_index(),
+                              'Expected cached plugin index')
+
+                # upgrading a distribution invalidates the index
+                os.rename(dist_info, dist_info.replace('1.0', '1.1'))
+                self.assertNotIn('cached', get_plugin_index(),
+                                 'Expected rebuilt plugin index')
+
+                registry = SchemaRegistry(REGISTRY.schemas, get_plugin_index)
+                self.assertIn('sample', registry.schemas)
+                self.assertIsInstance(registry.get('sample'),
+                                      SampleOutputSchema)
+                self.assertIs(registry.get_class('iso19139'),
+                              ISO19139OutputSchema,
+                              'Expected built-in schema precedence')
+
+                # an unusable cache directory falls back to scanning quietly
+                not_a_dir = os.path.join(tmp_dir, 'not-a-dir')
+                with open(not_a_dir, 'w'):
+                    pass
+                os.environ['PYGEOMETA_CACHE_DIR'] = not_a_dir
+                with self.assertNoLogs(level='WARNING'):
+                    index = get_plugin_index()
+                self.assertIn('sample', index, 'Expected scanned plugins')
+            finally:
+                sys.path.remove(site_dir)
+                if cache_dir is None:
+                    os.environ.pop('PYGEOMETA_CACHE_DIR')
+                else:
+                    os.environ['PYGEOMETA_CACHE_DIR'] = cache_dir
+
     def test_render_j2_template(self):
         """test template rendering"""
 
@@ -283,6 +459,42 @@ class PygeometaTest(unittest.TestCase):
             s_os = SampleOutputSchema()
             _ = s_os.write(read_mcf(get_abspath(mcf_path)))
 
+    def test_template_environment(self):
+        """test shared template environment of built-in schemas"""
+
+        mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+
+        env = get_template_environment()
+        self.assertIs(env, get_template_environment(),
+                      'Expected cached template environment')
+        self.assertIsNot(env, get_template_environment(
+            get_abspath('sample_schema_j2')),
+            'Expected separate environment for local schemas')
+
+        iso = load_schema('iso19139').write(mcf)
+        iso2 = load_schema('iso19139-2').write(mcf)
+        wmo_cmp = load_schema('wmo-cmp').write(mcf)
+
+        # profiles extend a single compiled base template
+        base = env.get_template('common/iso19139-base.j2')
+        for profile in ['iso19139', 'iso19139_2', 'wmo_cmp']:
+            template = env.get_template(f'{profile}/main.j2')
+            self.assertIs(env.get_template(f'{profile}/main.j2'), template,
+                          'Expected cached template')
+            self.assertIs(env.get_template('common/iso19139-base.j2'), base,
+                          'Expected cached base template')
+
+        iso_codelists = 'http://www.isotc211.org/2005/resources/Codelist/gmxCodelists.xml'  # noqa
+        wmo_codelists = 'http://wis.wmo.int/2011/schemata/iso19139_2007/schema/resources/Codelist/gmxCodelists.xml'  # noqa
+
+        self.assertIn('<gmd:MD_Metadata', iso)
+        self.assertIn(f'{iso_codelists}#MD_ScopeCode', iso)
+        self.assertIn('<gmi:MI_Metadata', iso2)
+        self.assertIn('<gmi:acquisitionInformation>', iso2)
+        self.assertIn(f'{wmo_codelists}#MD_ScopeCode', wmo_cmp)
+        self.assertNotIn(f'{iso_codelists}#MD_ScopeCode', wmo_cmp)
+        self.assertIn('WMO Core Metadata Profile', wmo_cmp)
+
     def itest_nested_mcf(self):
         """test nested mcf support"""
 
@@ -365,6 +577,657 @@ class PygeometaTest(unittest.TestCase):
         record = OGCAPIRecordOutputSchema().write(mcf, stringify=False)
         self.assertIsInstance(record, dict)
 
+        for schema in ['csvw', 'dcat', 'oarec-record', 'schema-org',
+                       'stac-item', 'wmo-wcmp2']:
+            record = load_schema(schema).write(mcf, compact=True)
+            self.assertNotIn('\n', record, f'Expected compact {schema}')
+            self.assertIsInstance(json.loads(record), dict)
+
+        with open(get_abspath('md-SMJP01RJTD-gmd.xml'), 'rb') as fh:
+            record = transform_metadata('autodetect', 'oarec-record',
+                                        fh.read(), compact=True)
+        self.assertNotIn('\n', record, 'Expected compact transform')
+        self.assertEqual(json.loads(record)['id'],
+                         'urn:x-wmo:md:int.wmo.wis::SMJP01RJTD')
+
+    def test_generate_contacts(self):
+        """test merging of identical contacts with multiple roles"""
+
+        mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+
+        parties = [{
+            'organization': f'Organization {i}',
+            'email': f'contact{i}@example.org',
+            'address': {'en': f'{i} Main Street', 'fr': f'{i} rue Main'}
+        } for i in range(5)]
+
+        mcf['contact'] = {}
+        for role in range(40):
+            party = parties[role % 5]
+            if role % 2:  # identical contact, different key order
+                party = dict(reversed(party.items()))
+            mcf['contact'][f'role{role}'] = party
+
+        for schema in ['oarec-record', 'wmo-wcmp2']:
+            record = load_schema(schema).write(mcf, stringify=False)
+            contacts = record['properties']['contacts']
+
+            self.assertEqual(len(contacts), 5, 'Expected merged contacts')
+            for i, contact in enumerate(contacts):
+                self.assertEqual(contact['organization'], f'Organization {i}')
+                self.assertEqual(contact['roles'],
+                                 [f'role{r}' for r in range(i, 40, 5)],
+                                 'Expected roles in order')
+
+    def test_profile_transforms(self):
+        """test profiles sharing a base OARec record"""
+
+        mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+        mcf['identification']['license'] = {
+            'name': 'CC BY 4.0',
+            'url': 'https://creativecommons.org/licenses/by/4.0'
+        }
+        mcf['metadata']['dates'].pop('creation', None)
+
+        oarec = load_schema('oarec-record')
+        wcmp2 = load_schema('wmo-wcmp2')
+
+        record = oarec.generate_record(mcf)
+        base_record = json_dumps(record)
+
+        wcmp2_record = wcmp2.write(mcf, stringify=False, record=record)
+        oarec_record = oarec.write(mcf, stringify=False, record=record)
+
+        self.assertEqual(json_dumps(record), base_record,
+                         'Expected base record to be unchanged')
+        self.assertEqual(oarec_record, record)
+        self.assertEqual(wcmp2_record['conformsTo'],
+                         ['http://wis.wmo.int/spec/wcmp/2/conf/core'])
+        self.assertIn('created', wcmp2_record['properties'])
+        self.assertNotIn('created', oarec_record['properties'])
+
+        self.assertEqual(oarec_record['links'][0]['rel'], 'license')
+        self.assertEqual(wcmp2_record['links'], oarec_record['links'][1:],
+                         'Expected distribution links only')
+
+        related = {'rel': 'related', 'href': 'https://example.org'}
+        record2 = {**record, 'links': record['links'] + [related]}
+        self.assertEqual(
+            wcmp2.write(mcf, stringify=False, record=record2)['links'],
+            oarec_record['links'][1:],
+            'Expected links to be matched by distribution url')
+
+        wcmp2_record2 = wcmp2.write(mcf, stringify=False)
+        wcmp2_record2['properties']['created'] = wcmp2_record['properties']['created']  # noqa
+        self.assertEqual(wcmp2_record2, wcmp2_record)
+
+    def test_write_collection(self):
+        """test writing OARec records as a FeatureCollection / NDJSON"""
+
+        mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+        oarec = load_schema('oarec-record')
+        mcfs = [get_abspath('../sample.mcf.yml'), 'missing.yml', mcf]
+
+        for compact in [False, True]:
+            with io.StringIO() as fh:
+                count = oarec.write_collection(iter(mcfs), fh,
+                                               compact=compact)
+                collection = json.loads(fh.getvalue())
+
+            self.assertEqual(count, 2)
+            self.assertEqual(collection['type'], 'FeatureCollection')
+            self.assertEqual(collection['numberReturned'], 2)
+            self.assertEqual(collection['features'],
+                             [oarec.write(mcf, stringify=False)] * 2)
+
+        with io.StringIO() as fh:
+            self.assertEqual(oarec.write_collection([], fh), 0)
+            self.assertEqual(json.loads(fh.getvalue())['features'], [])
+
+        with io.StringIO() as fh:
+            count = oarec.write_collection(mcfs, fh, ndjson=True)
+            lines = fh.getvalue().splitlines()
+
+        self.assertEqual(count, 2)
+        self.assertEqual(lines, [oarec.write(mcf, compact=True)] * 2)
+
+    def test_stac_catalog(self):
+        """test writing STAC ItemCollections and static catalogs"""
+
+        mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+        stac = load_schema('stac-item')
+
+        with io.StringIO() as fh:
+            count = stac.write_item_collection(
+                [mcf, 'missing.yml', get_abspath('deep-nest-child.mcf.yml')],
+                fh)
+            collection = json.loads(fh.getvalue())
+
+        self.assertEqual(count, 2)
+        self.assertEqual(collection['type'], 'FeatureCollection')
+        self.assertEqual(collection['features'][0],
+                         json.loads(stac.write(mcf)))
+
+        mcf2 = read_mcf(get_abspath('deep-nest-child.mcf.yml'))
+        duplicate = copy.deepcopy(mcf)
+        duplicate['identification']['title'] = 'duplicate'
+        mcfs = [get_abspath('../sample.mcf.yml'), 'missing.yml', mcf2,
+                duplicate]
+
+        for workers in [1, 4]:
+            with tempfile.TemporaryDirectory() as directory:
+                with self.assertLogs(level='WARNING') as logs:
+                    count = stac.write_catalog(iter(mcfs), directory,
+                                               collection_id='test',
+                                               workers=workers)
+                self.assertEqual(count, 2)
+                self.assertIn('already written', logs.output[-1],
+                              'Expected duplicate item to fail')
+
+                with open(os.path.join(directory, 'catalog.json')) as fh:
+                    catalog = json.load(fh)
+                with open(os.path.join(directory, 'test',
+                                       'collection.json')) as fh:
+                    collection = json.load(fh)
+
+                item_id = mcf['metadata']['identifier']
+                with open(os.path.join(directory, 'test', item_id,
+                                       f'{item_id}.json')) as fh:
+                    item = json.load(fh)
+
+            self.assertEqual(catalog['links'][1]['href'],
+                             './test/collection.json')
+            self.assertEqual(collection['type'], 'Collection')
+            self.assertEqual(
+                [link['href'] for link in collection['links']
+                 if link['rel'] == 'item'],
+                [f'./{item_id}/{item_id}.json', './MYID/MYID.json'])
+            self.assertEqual(collection['extent']['spatial']['bbox'],
+                             [[-141, 42, -52, 84]])
+            self.assertEqual(collection['extent']['temporal']['interval'],
+                             [['1950-07-31', None]])
+            self.assertEqual(item['collection'], 'test')
+            self.assertEqual(item['stac_version'], '1.0.0')
+            # fields required by STAC 1.0.0 items
+            for key in ['type', 'stac_version', 'id', 'geometry', 'bbox',
+                        'properties', 'links', 'assets']:
+                self.assertIn(key, item, f'Expected item {key}')
+            self.assertIn('datetime', item['properties'])
+            self.assertIsNone(item['properties']['datetime'],
+                              'Expected null datetime with an interval')
+            self.assertIn('start_datetime', item['properties'])
+            self.assertIn('end_datetime', item['properties'])
+            self.assertNotEqual(item['properties']['title'], 'duplicate',
+                                'Expected first item to be kept')
+            self.assertEqual(item['links'][-3:], [{
+                'rel': 'root',
+                'href': '../../catalog.json',
+                'type': 'application/json'
+                }, {
+                'rel': 'parent',
+                'href': '../collection.json',
+                'type': 'application/json'
+                }, {
+                'rel': 'collection',
+                'href': '../collection.json',
+                'type': 'application/json'
+            }])
+
+    def test_frozen_mcf(self):
+        """test writers with read-only MCFs"""
+
+        mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+        frozen = freeze(mcf)
+
+        self.assertEqual(frozen, mcf)
+        with self.assertRaises(TypeError):
+            frozen['metadata']['identifier'] = 'foo'
+        with self.assertRaises(TypeError):
+            frozen['identification']['topiccategory'].append('foo')
+        with self.assertRaises(TypeError):
+            frozen['contact'].pop('pointOfContact')
+
+        mcf2 = copy.deepcopy(frozen)
+        mcf2['metadata']['identifier'] = 'foo'
+        self.assertEqual(frozen['metadata']['identifier'],
+                         mcf['metadata']['identifier'])
+        self.assertEqual(pickle.loads(pickle.dumps(frozen)), mcf)
+        self.assertIs(freeze(frozen), frozen)
+
+        # (excluding writers which cannot write sample.mcf.yml)
+        schemas = [s['id'] for s in get_supported_schemas(details=True)
+                   if s['write'] and
+                   s['id'] not in ['iso19139-hnap', 'wmo-wigos']]
+
+        expected = {}
+        for schema in schemas:
+            expected[schema] = load_schema(schema).write(copy.deepcopy(mcf))
+
+        # one frozen MCF fanned out to all writers concurrently
+        results = {}
+
+        def write(schema):
+            results[schema] = load_schema(schema).write(frozen)
+
+        threads = [threading.Thread(target=write, args=(s,))
+                   for s in schemas]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, expected)
+        self.assertEqual(frozen, mcf)
+
+    def test_generate_many(self):
+        """test generating several schemas from one MCF"""
+
+        mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+        schemas = ['iso19139', 'oarec-record', 'wmo-wcmp2', 'schema-org']
+
+        expected = {}
+        for schema in schemas:
+            expected[schema] = load_schema(schema).write(copy.deepcopy(mcf))
+
+        results = generate_many(get_abspath('../sample.mcf.yml'), schemas)
+        self.assertEqual(list(results), schemas)
+        self.assertEqual(results, expected)
+
+        results = generate_many(mcf, schemas, workers=4)
+        self.assertEqual(results, expected)
+
+        results = generate_many(mcf, schemas, strict=True)
+        self.assertEqual(results, expected)
+
+        # writers share the values derived from the (mutable) MCF
+        schemas += ['stac-item', 'csvw', 'iso19139-2']
+        init = DerivedMCF.__init__
+        geometry = util.generate_geojson_geometry
+        counts = {'derived': 0, 'geometry': 0}
+
+        def counting_init(self, *args, **kwargs):
+            counts['derived'] += 1
+            init(self, *args, **kwargs)
+
+        def counting_geometry(*args, **kwargs):
+            counts['geometry'] += 1
+            return geometry(*args, **kwargs)
+
+        DerivedMCF.__init__ = counting_init
+        util.generate_geojson_geometry = counting_geometry
+        try:
+            generate_many(mcf, schemas)
+        finally:
+            DerivedMCF.__init__ = init
+            util.generate_geojson_geometry = geometry
+
+        self.assertEqual(counts, {'derived': 1, 'geometry': 1},
+                         'Expected values derived once')
+
+        results = generate_many(mcf, ['oarec-record', 'dcat'], compact=True)
+        self.assertNotIn('\n', results['oarec-record'])
+        self.assertEqual(json.loads(results['oarec-record']),
+                         json.loads(expected['oarec-record']))
+
+    def test_generate_batch(self):
+        """test generating metadata of many MCFs"""
+
+        self.assertEqual(get_mcf_files([get_abspath('sample-child.mcf.yml'),
+                                        get_abspath('sample-c*.mcf.yml')]),
+                         [get_abspath('sample-child.mcf.yml')])
+        self.assertIn(get_abspath('sample-child.mcf.yml'),
+                      get_mcf_files([THISDIR]))
+
+        with tempfile.TemporaryDirectory() as directory:
+            for filename in ['b.yml', 'a.yaml', 'c.txt']:
+                with open(os.path.join(directory, filename), 'w'):
+                    pass
+            self.assertEqual(get_mcf_files([directory]),
+                             [os.path.join(directory, 'a.yaml'),
+                              os.path.join(directory, 'b.yml')],
+                             'Expected *.yml and *.yaml files of directory')
+
+        with open(get_abspath('../sample.mcf.yml')) as fh:
+            sample = fh.read()
+
+        mcf = read_mcf(sample)
+        expected = load_schema('oarec-record').write(mcf)
+
+        for workers in [1, 2]:
+            with tempfile.TemporaryDirectory() as directory:
+                for i in range(3):
+                    filename = os.path.join(directory, f'{i}.mcf.yml')
+                    with open(filename, 'w') as fh:
+                        fh.write(sample.replace(
+                            mcf['metadata']['identifier'], f'id:{i}'))
+
+                mcfs = get_mcf_files([directory]) + ['missing.yml']
+                self.assertEqual(len(mcfs), 4)
+
+                output_dir = os.path.join(directory, 'out')
+                errors = generate_batch(mcfs, ['oarec-record', 'iso19139'],
+                                        output_dir, workers=workers)
+                self.assertEqual(list(errors), mcfs)
+                self.assertEqual(list(errors.values())[:3], [None] * 3)
+                self.assertIsNotNone(errors['missing.yml'])
+                self.assertEqual(sorted(os.listdir(output_dir)), [
+                    '0.iso19139.xml', '0.oarec-record.json',
+                    '1.iso19139.xml', '1.oarec-record.json',
+                    '2.iso19139.xml', '2.oarec-record.json'])
+
+                with open(os.path.join(output_dir,
+                                       '0.oarec-record.json')) as fh:
+                    self.assertEqual(fh.read(), expected.replace(
+                        mcf['metadata']['identifier'], 'id:0'))
+
+                errors = generate_batch(mcfs[:1], ['oarec-record'],
+                                        output_dir, workers=workers,
+                                        name_by='identifier')
+                self.assertEqual(errors, {mcfs[0]: None})
+                self.assertTrue(os.path.exists(os.path.join(
+                    output_dir, 'id_0.oarec-record.json')))
+
+                # outputs of the same name fail rather than overwrite
+                for subdir in ['a', 'b']:
+                    os.makedirs(os.path.join(directory, subdir))
+                    with open(os.path.join(directory, subdir, 'foo.yml'),
+                              'w') as fh:
+                        fh.write(sample)
+                duplicates = get_mcf_files([os.path.join(directory, '*',
+                                                         'foo.yml')])
+                self.assertEqual(len(duplicates), 2)
+
+                for name_by in ['source', 'identifier']:
+                    output_dir = os.path.join(directory, f'out-{name_by}')
+                    errors = generate_batch(duplicates + mcfs[:1],
+                                            ['oarec-record'], output_dir,
+                                            workers=workers, name_by=name_by)
+                    self.assertIsNone(errors[mcfs[0]])
+                    for duplicate in duplicates:
+                        self.assertIn('is also used by', errors[duplicate])
+                    self.assertEqual(len(os.listdir(output_dir)), 1)
+
+    def test_generate_batch_incremental(self):
+        """test regenerating only outputs whose inputs changed"""
+
+        with open(get_abspath('sample-child.mcf.yml')) as fh:
+            child = fh.read().replace('base_mcf: base-metadata.mcf.yml',
+                                      'base_mcf: base/base.yml')
+        with open(get_abspath('base-metadata.mcf.yml')) as fh:
+            base = fh.read()
+
+        schemas = ['oarec-record', 'iso19139']
+
+        with tempfile.TemporaryDirectory() as directory:
+            base_mcf = os.path.join(directory, 'base', 'base.yml')
+            os.makedirs(os.path.dirname(base_mcf))
+            with open(base_mcf, 'w') as fh:
+                fh.write(base)
+            for i in range(2):
+                with open(os.path.join(directory, f'{i}.yml'), 'w') as fh:
+                    if i == 0:
+                        fh.write(child.replace(
+                            'title in English',
+                            'title ${PYGEOMETA_TEST_TITLE}'))
+                    else:
+                        fh.write(child)
+
+            mcfs = get_mcf_files([directory])
+            output_dir = os.path.join(directory, 'out')
+
+            files, env_vars = get_mcf_dependencies(mcfs[0])
+            self.assertEqual([os.path.basename(f) for f in files],
+                             ['0.yml', 'base.yml'])
+            self.assertEqual(env_vars, ['PYGEOMETA_TEST_TITLE'])
+
+            def outdate_outputs():
+                for filename in os.listdir(output_dir):
+                    if filename != MANIFEST_FILE:
+                        with open(os.path.join(output_dir, filename),
+                                  'w') as fh:
+                            fh.write('stale')
+
+            def regenerated():
+                return sorted(f for f in os.listdir(output_dir)
+                              if f != MANIFEST_FILE and
+                              os.path.getsize(os.path.join(
+                                  output_dir, f)) > len('stale'))
+
+            os.environ['PYGEOMETA_TEST_TITLE'] = 'in English'
+            try:
+                errors = generate_batch(mcfs, schemas, output_dir,
+                                        incremental=True)
+                self.assertEqual(errors, dict.fromkeys(mcfs))
+
+                manifest = Manifest(output_dir, {'compact': False,
+                                                 'name_by': 'source',
+                                                 'json_encoder': 'json'})
+                self.assertEqual(len(manifest.outputs), 4)
+                dependencies = manifest.outputs['0.iso19139.xml'][
+                    'dependencies']
+                self.assertIn('env:PYGEOMETA_TEST_TITLE', dependencies)
+                self.assertIn(str(SCHEMAS / 'iso19139' / 'main.j2'),
+                              dependencies)
+                self.assertTrue(manifest.is_current(mcfs[0], schemas))
+                self.assertFalse(manifest.is_current(mcfs[0], ['csvw']))
+
+                outdate_outputs()
+                errors = generate_batch(mcfs, schemas, output_dir,
+                                        incremental=True)
+                self.assertEqual(errors, dict.fromkeys(mcfs))
+                self.assertEqual(regenerated(), [])
+
+                os.environ['PYGEOMETA_TEST_TITLE'] = 'in french'
+                generate_batch(mcfs, schemas, output_dir, incremental=True)
+                self.assertEqual(regenerated(), ['0.iso19139.xml',
+                                                 '0.oarec-record.json'])
+
+                outdate_outputs()
+                os.remove(os.path.join(output_dir, '1.iso19139.xml'))
+                generate_batch(mcfs, schemas, output_dir, incremental=True)
+                self.assertEqual(regenerated(), ['1.iso19139.xml',
+                                                 '1.oarec-record.json'])
+
+                outdate_outputs()
+                with open(base_mcf, 'a') as fh:
+                    fh.write('\n# changed\n')
+                generate_batch(mcfs, schemas, output_dir, incremental=True)
+                self.assertEqual(len(regenerated()), 4)
+
+                # outputs generated with other options are out of date
+                outdate_outputs()
+                generate_batch(mcfs, schemas, output_dir, compact=True,
+                               incremental=True)
+                self.assertEqual(regenerated(), ['0.iso19139.xml',
+                                                 '0.oarec-record.json',
+                                                 '1.iso19139.xml',
+                                                 '1.oarec-record.json'])
+                with open(os.path.join(output_dir,
+                                       '0.oarec-record.json')) as fh:
+                    self.assertNotIn('\n', fh.read())
+
+                errors = generate_batch(mcfs[:1], schemas, output_dir,
+                                        compact=True, name_by='identifier',
+                                        incremental=True)
+                self.assertEqual(errors, {mcfs[0]: None})
+                self.assertIn('s1234.oarec-record.json',
+                              os.listdir(output_dir))
+
+                # MCFs of the same identifier as an up to date one fail
+                errors = generate_batch(mcfs, schemas, output_dir,
+                                        compact=True, name_by='identifier',
+                                        incremental=True)
+                self.assertIsNone(errors[mcfs[0]])
+                self.assertIn('is also used by', errors[mcfs[1]])
+            finally:
+                os.environ.pop('PYGEOMETA_TEST_TITLE')
+
+    def test_watch(self):
+        """test regenerating outputs affected by changes"""
+
+        with open(get_abspath('sample-child.mcf.yml')) as fh:
+            child = fh.read().replace('base_mcf: base-metadata.mcf.yml',
+                                      'base_mcf: base/base.yml')
+        with open(get_abspath('base-metadata.mcf.yml')) as fh:
+            base = fh.read()
+
+        def edit(filename, content, mode='w'):
+            # let modification times move past those of outputs
+            time.sleep(0.05)
+            with open(filename, mode) as fh:
+                fh.write(content)
+
+        with tempfile.TemporaryDirectory() as directory:
+            base_mcf = os.path.join(directory, 'base', 'base.yml')
+            template_dir = os.path.join(directory, 'local')
+            os.makedirs(os.path.dirname(base_mcf))
+            os.makedirs(template_dir)
+            edit(base_mcf, base)
+            edit(os.path.join(template_dir, 'main.j2'),
+                 "<title>{{ record['identification']['title']['en'] }}"
+                 "</title>")
+            mcfs = [os.path.join(directory, f'{i}.yml') for i in range(3)]
+            for mcf in mcfs[:2]:
+                edit(mcf, child)
+
+            output_dir = os.path.join(directory, 'out')
+            watcher = Watcher([directory], output_dir, ['oarec-record'],
+                              template_dir)
+
+            self.assertEqual(watcher.poll(), dict.fromkeys(mcfs[:2]))
+            self.assertEqual(sorted(os.listdir(output_dir)), [
+                '0.local.xml', '0.oarec-record.json',
+                '1.local.xml', '1.oarec-record.json'])
+            self.assertEqual(watcher.cache.hits, 1,
+                             'Expected base_mcf to be parsed once')
+            self.assertEqual(watcher.poll(), {})
+
+            edit(mcfs[1], '\n', 'a')
+            self.assertEqual(watcher.poll(), {mcfs[1]: None})
+
+            edit(base_mcf, '\n', 'a')
+            self.assertEqual(watcher.poll(), dict.fromkeys(mcfs[:2]))
+
+            output = os.path.join(output_dir, '0.oarec-record.json')
+            mtime = os.stat(output).st_mtime_ns
+            edit(os.path.join(template_dir, 'main.j2'),
+                 "<name>{{ record['identification']['title']['en'] }}"
+                 "</name>")
+            self.assertEqual(watcher.poll(), dict.fromkeys(mcfs[:2]))
+            self.assertEqual(os.stat(output).st_mtime_ns, mtime,
+                             'Expected only outputs of template to change')
+            with open(os.path.join(output_dir, '0.local.xml')) as fh:
+                self.assertIn('<name>title in English</name>', fh.read())
+
+            edit(os.path.join(template_dir, 'include.j2'), '')
+            self.assertEqual(watcher.poll(), dict.fromkeys(mcfs[:2]),
+                             'Expected new template to be watched')
+
+            edit(mcfs[2], 'metadata: [')
+            results = watcher.poll()
+            self.assertEqual(list(results), [mcfs[2]])
+            self.assertIsNotNone(results[mcfs[2]])
+            self.assertEqual(watcher.poll(), {},
+                             'Expected failed MCF to wait for changes')
+
+            edit(mcfs[2], child)
+            self.assertEqual(watcher.poll(), {mcfs[2]: None})
+
+    def test_derived_mcf(self):
+        """test values derived from an MCF, shared by writers"""
+
+        mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+
+        derived = get_derived(mcf)
+        self.assertIsInstance(derived, DerivedMCF)
+        self.assertIsNot(get_derived(mcf), derived,
+                         'Expected no caching on a mutable MCF')
+
+        self.assertEqual(derived.lang1, 'en')
+        self.assertEqual(derived.lang2, 'fr')
+        self.assertEqual(derived.charstring('identification', 'title'),
+                         get_charstring(mcf['identification']['title'],
+                                        'en', 'fr'))
+        self.assertEqual(derived.keywords['default'][0],
+                         ['kw1 in English', 'kw2 in English',
+                          'kw3 in English'])
+        self.assertEqual(derived.date('creation'), '2014-11-11T00:00:00Z')
+        self.assertEqual(derived.geometry, generate_geojson_geometry(
+            mcf['identification']['extents']['spatial']))
+        self.assertEqual(len(derived.contacts), 1)
+        self.assertEqual(derived.contacts[0]['roles'],
+                         ['pointOfContact', 'distributor'])
+
+        with self.assertRaises(KeyError):
+            derived.date('foo')
+
+        with share_derived(mcf) as shared:
+            self.assertIs(get_derived(mcf), shared,
+                          'Expected derived values shared while generating')
+            self.assertIsNot(get_derived(copy.deepcopy(mcf)), shared)
+        self.assertIsNot(get_derived(mcf), shared,
+                         'Expected sharing to end with the block')
+
+        frozen = freeze(mcf)
+        self.assertIs(get_derived(frozen), get_derived(frozen),
+                      'Expected derived values cached on a read-only MCF')
+
+        shared = get_derived(frozen)
+        self.assertEqual(shared.contacts, derived.contacts)
+        with self.assertRaises(TypeError):
+            shared.contacts[0]['roles'].append('foo')
+        with self.assertRaises(TypeError):
+            shared.charstring('identification', 'title')[0] = 'foo'
+        with self.assertRaises(TypeError):
+            shared.geometry['type'] = 'foo'
+        with self.assertRaises(TypeError):
+            shared.keywords.pop('default')
+
+        # base templates derive values themselves if not given them
+        template = get_template_environment().get_template(
+            'iso19139/main.j2')
+        self.assertEqual(
+            template.render(record=mcf, schema_path='iso19139/'),
+            template.render(record=mcf, schema_path='iso19139/',
+                            derived=derived))
+
+        for schema in ['oarec-record', 'stac-item', 'schema-org', 'csvw',
+                       'iso19139']:
+            self.assertEqual(load_schema(schema).write(frozen),
+                             load_schema(schema).write(mcf))
+
+    def test_json_dumps(self):
+        """test JSON serialization and encoders"""
+
+        obj = {'a': [1, 2], 'b': datetime.date(2000, 1, 1), 'c': 'é'}
+
+        self.assertEqual(json_dumps(obj, compact=True),
+                         '{"a":[1,2],"b":"2000-01-01","c":"é"}')
+        self.assertEqual(json.loads(json_dumps(obj)),
+                         json.loads(json_dumps(obj, compact=True)))
+        self.assertIn('\n    "a"', json_dumps(obj))
+
+        calls = []
+
+        def encoder(obj, compact):
+            calls.append(compact)
+            return 'encoded'
+
+        try:
+            set_json_encoder(encoder)
+            mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+            record = load_schema('oarec-record').write(mcf, compact=True)
+            self.assertEqual(record, 'encoded')
+            self.assertEqual(calls, [True])
+        finally:
+            set_json_encoder()
+
+        self.assertEqual(json_dumps(obj, compact=True),
+                         '{"a":[1,2],"b":"2000-01-01","c":"é"}')
+
+        with self.assertRaises(ValueError):
+            set_json_encoder('404')
+
     def test_output_schema(self):
         """test output schema"""
 
@@ -455,6 +1318,68 @@ class PygeometaTest(unittest.TestCase):
                 'WIS/GTS bulletin SMJP01 RJTD in FM12 SYNOP',
                 'Expected specific title')
 
+    def test_iso19139_import_parity(self):
+        """test ISO 19139 XPath import against OWSLib import"""
+
+        iso = ISO19139OutputSchema()
+
+        documents = {}
+        for filename in os.listdir(THISDIR):
+            if filename.endswith('.xml'):
+                with open(get_abspath(filename), 'rb') as fh:
+                    documents[filename] = fh.read()
+        for filename in ['../sample.mcf.yml', 'sample-child.mcf.yml',
+                         'unilingual.mcf.yml']:
+            documents[filename] = iso.write(read_mcf(get_abspath(filename)))
+
+        for filename, metadata in documents.items():
+            expected = iso.import_(metadata, owslib=True)
+            mcf = iso.import_(metadata)
+
+            self.assertEqual(json.dumps(mcf, default=str),
+                             json.dumps(expected, default=str),
+                             f'Expected identical import of {filename}')
+
+        mcf = iso.import_(documents['md-SMJP01RJTD-gmd.xml'])
+        self.assertEqual(mcf['identification']['extents']['spatial'][0]['bbox'],  # noqa
+                         [124.167, 24.333, 145.583, 45.4])
+
+    def test_iso19139_import_records(self):
+        """test streaming ISO 19139 import of multi-record documents"""
+
+        iso = ISO19139OutputSchema()
+
+        expected = []
+        records = []
+        for filename in sorted(os.listdir(THISDIR)):
+            if filename.endswith('.xml'):
+                with open(get_abspath(filename), 'rb') as fh:
+                    metadata = fh.read()
+                expected.append(iso.import_(metadata))
+                record = metadata.split(b'?>', 1)[-1]
+                records.append(b'<record><header/><metadata>' + record +
+                               b'</metadata></record>')
+
+        # OAI-PMH style response, including a record which fails to import
+        records.append(b'<record><metadata><gmd:MD_Metadata xmlns:gmd='
+                       b'"http://www.isotc211.org/2005/gmd"/></metadata>'
+                       b'</record>')
+        document = (b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                    b'<OAI-PMH><ListRecords>' + b''.join(records * 2) +
+                    b'</ListRecords></OAI-PMH>')
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'records.xml')
+            with open(filename, 'wb') as fh:
+                fh.write(document)
+
+            mcfs = list(iso.import_records(filename))
+            self.assertEqual(mcfs, expected * 2)
+
+            with open(filename, 'rb') as fh:
+                mcfs = iso.import_records(fh, owslib=True)
+                self.assertEqual(next(mcfs), expected[0])
+
     def test_openaire(self):
         """test metadata import openaire"""
 
@@ -482,6 +1407,208 @@ class PygeometaTest(unittest.TestCase):
                 'title in English',
                 'Expected specific title')
 
+    def test_autodetect(self):
+        """test metadata import autodetection"""
+
+        gmd = '{http://www.isotc211.org/2005/gmd}'
+
+        with open(get_abspath('md-SMJP01RJTD-gmd.xml')) as fh:
+            content_format, signature = sniff_content(fh.read())
+            self.assertEqual(content_format, 'xml')
+            self.assertEqual(signature, {gmd, f'{gmd}MD_Metadata'},
+                             'Expected root element and namespace')
+            self.assertEqual(rank_schemas(signature)[0], 'iso19139')
+
+        content_format, signature = sniff_content(
+            '<?xml version="1.0"?>\n<!-- <foo> -->\n'
+            f'<MD_Metadata xmlns="{gmd[1:-1]}"><fileIdentifier/>')
+        self.assertEqual(signature, {gmd, f'{gmd}MD_Metadata'},
+                         'Expected root element in default namespace')
+
+        content_format, signature = sniff_content('{"mmd:mmd": {}}')
+        self.assertEqual(content_format, 'json')
+        self.assertEqual(signature, {'mmd:mmd'})
+
+        content_format, signature = sniff_content('a,b\n1,2\n3,4\n')
+        self.assertEqual(content_format, 'text')
+        self.assertEqual(rank_schemas(signature), ['csvw', 'cwl', 'iso19139',
+                                                   'mmd', 'openaire',
+                                                   'schema-org'],
+                         'Expected all readable schemas when none match')
+
+        with open(get_abspath('mmd.json')) as fh:
+            mcf = import_metadata('autodetect', fh.read())
+            self.assertEqual(mcf['identification']['title'],
+                             'Arctic sea ice concentration',
+                             'Expected specific title')
+
+        with open(get_abspath('cwl.yml')) as fh:
+            mcf = import_metadata('autodetect', fh.read())
+            self.assertEqual(mcf['identification']['title'],
+                             'Water bodies detection',
+                             'Expected specific title')
+
+        mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+        schema_org = load_schema('schema-org').write(mcf)
+        self.assertEqual(rank_schemas(sniff_content(schema_org)[1])[0],
+                         'schema-org')
+        mcf = import_metadata('autodetect', schema_org)
+        self.assertEqual(mcf['metadata']['identifier'],
+                         '3f342f64-9348-11df-ba6a-0014c2c00eab',
+                         'Expected specific identifier')
+
+    def test_metadata_input(self):
+        """test parse-once metadata input"""
+
+        metadata = MetadataInput('{"mmd:mmd": {"mmd:title": "foo"}}')
+        self.assertEqual(str(metadata), metadata.text)
+        self.assertIs(metadata.json, metadata.json,
+                      'Expected JSON to be parsed once')
+        self.assertEqual(metadata.yaml, metadata.json,
+                         'Expected JSON as YAML')
+
+        with self.assertRaises(Exception):
+            metadata.xml
+        with self.assertRaises(Exception):  # parsing error is remembered
+            metadata.xml
+
+        with open(get_abspath('md-SMJP01RJTD-gmd.xml'), 'rb') as fh:
+            metadata = MetadataInput(fh.read())
+
+        self.assertIsInstance(metadata.bytes, bytes)
+        self.assertIs(metadata.xml, metadata.xml,
+                      'Expected XML to be parsed once')
+        self.assertIsNone(metadata._text, 'Expected bytes not to be decoded')
+
+        mcf = import_metadata('autodetect', metadata)
+        self.assertEqual(mcf['identification']['title'],
+                         'WIS/GTS bulletin SMJP01 RJTD in FM12 SYNOP',
+                         'Expected specific title')
+
+        mcf = load_schema('iso19139').import_(metadata)
+        self.assertEqual(mcf['metadata']['identifier'],
+                         'urn:x-wmo:md:int.wmo.wis::SMJP01RJTD',
+                         'Expected specific identifier')
+
+        m = json.loads(transform_metadata('autodetect', 'oarec-record',
+                                          metadata))
+        self.assertEqual(m['id'], 'urn:x-wmo:md:int.wmo.wis::SMJP01RJTD',
+                         'Expected specific identifier')
+        self.assertIsNone(metadata._text, 'Expected bytes not to be decoded')
+
+        metadata2 = pickle.loads(pickle.dumps(metadata))
+        self.assertEqual(metadata2.bytes, metadata.bytes)
+
+    def test_read_metadata_file(self):
+        """test reading (memory mapped) metadata files"""
+
+        filename = get_abspath('md-SMJP01RJTD-gmd.xml')
+
+        with open(filename, 'rb') as fh:
+            metadata = read_metadata_file(fh)
+            self.assertIsInstance(metadata.bytes, bytes,
+                                  'Expected small file to be read')
+            expected = import_metadata('autodetect', metadata)
+
+        with open(filename, 'rb') as fh:
+            mapped = MetadataInput(
+                mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+
+        self.assertEqual(mapped.head(100), metadata.head(100))
+        self.assertEqual(import_metadata('autodetect', mapped), expected)
+        self.assertIsNone(mapped._text, 'Expected mapping not to be decoded')
+        self.assertEqual(get_cache_key(mapped.bytes),
+                         get_cache_key(metadata.bytes))
+
+        mapped2 = pickle.loads(pickle.dumps(mapped))
+        self.assertEqual(mapped2.bytes, metadata.bytes)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'large.xml')
+            with open(filename, 'wb') as fh:
+                fh.write(metadata.bytes)
+                fh.write(b' ' * MMAP_THRESHOLD)
+
+            with open(filename, 'rb') as fh, \
+                    read_metadata_file(fh) as metadata:
+                self.assertIsInstance(metadata.bytes, mmap.mmap,
+                                      'Expected large file to be mapped')
+                self.assertEqual(import_metadata('iso19139', metadata),
+                                 expected)
+
+            self.assertTrue(metadata.bytes.closed,
+                            'Expected mapping to be closed')
+
+    def test_cache(self):
+        """test import and transform result caches"""
+
+        self.assertNotEqual(get_cache_key('ab', 'c'), get_cache_key('a', 'bc'),
+                            'Expected unambiguous cache key')
+
+        cache = MemoryCache(maxsize=2)
+        cache.set('a', {'foo': 'bar'})
+        cache.set('b', 1)
+        self.assertEqual(cache.get('a'), {'foo': 'bar'})
+        cache.get('a')['foo'] = 'baz'
+        self.assertEqual(cache.get('a'), {'foo': 'bar'},
+                         'Expected copy of cached value')
+        cache.set('c', 2)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'), 'Expected LRU value evicted')
+        self.assertEqual(cache.get('a'), {'foo': 'bar'})
+
+        with open(get_abspath('md-SMJP01RJTD-gmd.xml')) as fh:
+            metadata = fh.read()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for cache in [MemoryCache(), FileCache(tmp_dir)]:
+                mcf = import_metadata('autodetect', metadata, cache=cache)
+                mcf2 = import_metadata('autodetect', metadata, cache=cache)
+                self.assertEqual(mcf, mcf2)
+                self.assertIsNot(mcf, mcf2)
+                self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+                m = transform_metadata('autodetect', 'oarec-record', metadata,
+                                       cache=cache)
+                m2 = transform_metadata('autodetect', 'oarec-record',
+                                        metadata, cache=cache)
+                self.assertEqual(m, m2)
+                # transform miss (import hit), then transform hit
+                self.assertEqual((cache.hits, cache.misses), (3, 2))
+
+                m3 = transform_metadata('autodetect', 'iso19139',
+                                        metadata, cache=cache)
+                self.assertNotEqual(m3, m, 'Expected output schema in key')
+
+                def encode(obj, compact):
+                    return json.dumps(obj, indent=1)
+
+                set_json_encoder(encode)
+                try:
+                    m4 = transform_metadata('autodetect', 'oarec-record',
+                                            metadata, cache=cache)
+                finally:
+                    set_json_encoder()
+                self.assertNotEqual(m4, m, 'Expected JSON encoder in key')
+
+            self.assertTrue(len(list(cache.cache_dir.glob('*/*.pickle'))),
+                            'Expected cache files')
+            cache.clear()
+            self.assertIsNone(cache.get(get_cache_key('foo')))
+            self.assertEqual(list(cache.cache_dir.glob('*/*.pickle')), [])
+
+            # cache directories are private, and unused if they are not
+            cache = FileCache(os.path.join(tmp_dir, 'private'))
+            cache.set('a', 1)
+            self.assertEqual(cache.cache_dir.stat().st_mode & 0o777, 0o700)
+            self.assertEqual(cache.get('a'), 1)
+
+            cache.cache_dir.chmod(0o777)
+            cache = FileCache(cache.cache_dir)
+            with self.assertLogs(level='WARNING'):
+                self.assertIsNone(cache.get('a'),
+                                  'Expected shared cache directory unused')
+
     def test_empty_extents(self):
         # do not fail on empty elements
         schema = ISO19139OutputSchema()
@@ -533,6 +1660,109 @@ class PygeometaTest(unittest.TestCase):
                 'WIS/GTS bulletin SMJP01 RJTD in FM12 SYNOP',
                 'Expected specific title')
 
+    def test_transform_batch(self):
+        """test transforming many metadata records"""
+
+        filenames = ['md-SMJP01RJTD-gmd.xml',
+                     'x-wmo-md-int.wmo.wis.ISMD01EDZW.xml']
+        records = {}
+        for filename in filenames:
+            with open(get_abspath(filename), 'rb') as fh:
+                records[filename] = fh.read()
+        records['sub/bad.xml'] = b'<bad'
+
+        expected = {
+            name: json.loads(transform_metadata('iso19139', 'oarec-record',
+                                                record))
+            for name, record in records.items() if name != 'sub/bad.xml'
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            input_dir = os.path.join(directory, 'records')
+            for name, record in records.items():
+                filepath = os.path.join(input_dir, name)
+                os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                with open(filepath, 'wb') as fh:
+                    fh.write(record)
+
+            tarball = os.path.join(directory, 'records.tar.gz')
+            with tarfile.open(tarball, 'w:gz') as tar:
+                tar.add(input_dir, arcname='records')
+
+            self.assertEqual(list(iter_metadata_records(input_dir)),
+                             sorted(records.items()))
+            self.assertEqual(
+                list(iter_metadata_records(tarball)),
+                [(f'records/{name}', record)
+                 for name, record in sorted(records.items())])
+
+            for workers in [1, 2]:
+                results = list(transform_batch(
+                    iter_metadata_records(input_dir), 'autodetect',
+                    'oarec-record', workers, compact=True))
+                self.assertEqual([r[0] for r in results], sorted(records))
+                for name, content, error in results:
+                    if name == 'sub/bad.xml':
+                        self.assertIsNone(content)
+                        self.assertIsNotNone(error)
+                    else:
+                        self.assertIsNone(error)
+                        self.assertEqual(json.loads(content), expected[name])
+
+            output = io.StringIO()
+            failed = write_transform_results(results, 'oarec-record',
+                                             fh=output)
+            self.assertEqual(list(failed), ['sub/bad.xml'])
+            lines = [json.loads(line) for line in
+                     output.getvalue().splitlines()]
+            self.assertEqual(lines, [
+                {'source': filenames[0], 'record': expected[filenames[0]]},
+                {'source': 'sub/bad.xml', 'error': failed['sub/bad.xml']},
+                {'source': filenames[1], 'record': expected[filenames[1]]}])
+
+            output_dir = os.path.join(directory, 'out')
+            failed = write_transform_results(
+                transform_batch(iter_metadata_records(tarball), 'iso19139',
+                                'oarec-record'),
+                'oarec-record', output_dir=output_dir)
+            self.assertEqual(list(failed), ['records/sub/bad.xml'])
+            with open(os.path.join(output_dir, 'records',
+                                   'md-SMJP01RJTD-gmd.json')) as fh:
+                self.assertEqual(json.load(fh),
+                                 expected['md-SMJP01RJTD-gmd.xml'])
+
+        # concatenated records, with or without XML declarations
+        stream = io.BytesIO(b'\n'.join(
+            records[name].replace(b'<?xml version="1.0" encoding="UTF-8"?>',
+                                  b'') if i == 0 else records[name]
+            for i, name in enumerate(filenames)))
+        results = list(transform_batch(iter_metadata_records(stream, 4096),
+                                       'autodetect', 'oarec-record'))
+        self.assertEqual([r[0] for r in results], ['0', '1'])
+        self.assertEqual([json.loads(r[1]) for r in results],
+                         [expected[name] for name in filenames])
+
+        # records of multi-record documents, documents with comments
+        declaration = b'<?xml version="1.0" encoding="UTF-8"?>'
+        csw = (b'<csw:GetRecordsResponse xmlns:csw='
+               b'"http://www.opengis.net/cat/csw/2.0.2"><csw:SearchResults>' +
+               b''.join(records[name].replace(declaration, b'')
+                        for name in filenames) +
+               b'</csw:SearchResults></csw:GetRecordsResponse>')
+        commented = records[filenames[0]].replace(
+            declaration, declaration + b'<!-- <gmd:MD_Metadata> -->')
+        stream = io.BytesIO(declaration + csw + b'\n' + commented)
+        results = list(transform_batch(iter_metadata_records(stream, 4096),
+                                       'autodetect', 'oarec-record'))
+        self.assertEqual([r[0] for r in results], ['0#0', '0#1', '1'])
+        self.assertEqual([json.loads(r[1]) for r in results],
+                         [expected[name] for name in
+                          filenames + filenames[:1]])
+
+        stream = io.BytesIO(b'{"a": 1}\n\n{"b": 2}\n')
+        self.assertEqual(list(iter_metadata_records(stream)),
+                         [('0', b'{"a": 1}'), ('1', b'{"b": 2}')])
+
     def test_schema_org_coords(self):
         """Test helper method schema-org parse geometry"""
         geo1 = {
@@ -608,6 +1838,86 @@ class PygeometaTest(unittest.TestCase):
             self.assertEqual(geometry['type'], spatial['type'],
                              f"Expected geometry type {spatial['type']}")
 
+        # identical bboxes are deduplicated
+        spatial = spatials[0]['def'] * 3
+        geometry = generate_geojson_geometry(spatial)
+        self.assertEqual(len(geometry['coordinates']), 2)
+        self.assertEqual(geometry, generate_geojson_geometry(spatials[0]['def']))  # noqa
+
+        # envelope of all bboxes
+        self.assertEqual(get_envelope(get_bboxes(spatial)),
+                         [-180, -53.8, 180, -27.8])
+        geometry = generate_geojson_geometry(spatial, envelope=True)
+        self.assertEqual(geometry['type'], 'Polygon')
+        self.assertEqual(geometry['coordinates'][0][:3],
+                         [[-180, -53.8], [-180, -27.8], [180, -27.8]])
+
+        # multiple CRS: first bbox only
+        self.assertEqual(get_bboxes(spatials[1]['def']),
+                         [(-152, 42, -52, 84)])
+
+        # empty and invalid extents
+        self.assertIsNone(generate_geojson_geometry([]))
+        self.assertIsNone(get_envelope([]))
+        spatial = [{'bbox': [], 'crs': 4326}, {'bbox': None, 'crs': 4326},
+                   {'crs': 4326}, {'bbox': [0, 0, 1, 1], 'crs': 4326}]
+        self.assertEqual(get_bboxes(spatial), [(0, 0, 1, 1)])
+        self.assertIsNone(generate_geojson_geometry(spatial[:2], True))
+
+        # STAC bbox and OARec profiles
+        mcf = read_mcf(get_abspath('../sample.mcf.yml'))
+        mcf['identification']['extents']['spatial'] = [
+            {'bbox': [i, i, i + 1, i + 1], 'crs': 4326} for i in range(100)]
+
+        stac_item = load_schema('stac-item').write(mcf, stringify=False)
+        self.assertEqual(stac_item['bbox'], [0, 0, 100, 100])
+        self.assertEqual(len(stac_item['geometry']['coordinates']), 100)
+
+        class EnvelopeRecordOutputSchema(OGCAPIRecordOutputSchema):
+            transforms = ['set_envelope_geometry']
+
+        record = EnvelopeRecordOutputSchema().write(mcf, stringify=False)
+        self.assertEqual(record['geometry'], generate_geojson_geometry(
+            mcf['identification']['extents']['spatial'], envelope=True))
+
+    def test_cli_import_time(self):
+        """Test CLI startup does not import heavy dependencies"""
+
+        code = (
+            'import json, sys\n'
+            'import pygeometa.core\n'
+            'from pygeometa import cli\n'
+            "cli(['metadata', 'generate', '--help'], standalone_mode=False)\n"
+            'print(json.dumps(sorted(sys.modules)))\n'
+        )
+
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                                 code], capture_output=True, text=True)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('--schema', result.stdout)
+
+        modules = {name.split('.')[0]
+                   for name in json.loads(result.stdout.splitlines()[-1])}
+        self.assertIn('pygeometa', modules)
+
+        for module in ['jinja2', 'jsonschema', 'lxml', 'owslib', 'yaml']:
+            self.assertNotIn(module, modules,
+                             f'Expected {module} to be imported lazily')
+
+        # cumulative import times (microseconds)
+        import_times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, cumulative, name = line.split('|')
+            if cumulative.strip().isdigit():
+                import_times[name.strip()] = int(cumulative)
+
+        self.assertLess(import_times['pygeometa'], IMPORT_TIME_BUDGET,
+                        'Expected pygeometa import within time budget '
+                        '(PYGEOMETA_IMPORT_TIME_BUDGET)')
+
 
 def get_abspath(filepath):
     """helper function absolute file access"""